@@ -0,0 +1,90 @@
+"""
+Alembic migration environment
+
+Migrations run against DATABASE_URL with the application's models as the
+autogenerate target. Run them as a deploy step (``alembic upgrade head``);
+application startup only checks that the database is at the head revision.
+"""
+
+import asyncio
+from logging.config import fileConfig
+
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import async_engine_from_config
+
+from alembic import context
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import user, question, test_session, answer, user_stats, score_distribution  # noqa: F401 (register models)
+
+config = context.config
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+
+# Configure logging
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# Database objects created by migrations but deliberately left off the models
+UNMAPPED_OBJECTS = {"search_vector", "ix_questions_search_vector"}
+
+
+def run_migrations_offline() -> None:
+    """Emit migration SQL as a script without connecting"""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    def include_object(object, name, type_, reflected, compare_to) -> bool:
+        if reflected and name in UNMAPPED_OBJECTS:
+            return False
+        # Autogenerate ignores ddl_if(); skip objects created only on other dialects
+        ddl_if = getattr(object, "_ddl_if", None)
+        return ddl_if is None or ddl_if.dialect in (None, connection.dialect.name)
+
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # SQLite needs table rebuilds for most ALTERs
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    """Run migrations on a connection from the async engine"""
+    connectable = async_engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against the database"""
+    asyncio.run(run_async_migrations())
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,138 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 13:36:07.134956
+
+The schema as it stood when the app still built its tables with
+create_all on startup. Databases created that way match this revision, so
+mark them with ``alembic stamp 0001`` and then run ``alembic upgrade head``
+to apply the later revisions.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('questions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content', sa.JSON(), nullable=False),
+    sa.Column('question_type', sa.Enum('MULTIPLE_CHOICE', 'GRID_IN', 'ESSAY', 'READING_COMPREHENSION', name='questiontype'), nullable=False),
+    sa.Column('difficulty_level', sa.Enum('EASY', 'MEDIUM', 'HARD', name='difficultylevel'), nullable=False),
+    sa.Column('subject', sa.Enum('READING', 'WRITING', 'MATH', name='subject'), nullable=False),
+    sa.Column('topic', sa.String(length=100), nullable=False),
+    sa.Column('tags', sa.JSON(), nullable=True),
+    sa.Column('estimated_time', sa.Integer(), nullable=True),
+    sa.Column('created_by', sa.Integer(), nullable=True),
+    sa.Column('is_active', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_questions_id', 'questions', ['id'], unique=False)
+    op.create_index('ix_questions_topic', 'questions', ['topic'], unique=False)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('first_name', sa.String(length=100), nullable=True),
+    sa.Column('last_name', sa.String(length=100), nullable=True),
+    sa.Column('role', sa.Enum('STUDENT', 'ADMIN', 'INSTRUCTOR', name='userrole'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('is_verified', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('last_login', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+
+    op.create_table('test_sessions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('session_type', sa.Enum('PRACTICE', 'FULL_TEST', 'ADAPTIVE_TEST', 'TOPIC_PRACTICE', name='sessiontype'), nullable=False),
+    sa.Column('status', sa.Enum('ACTIVE', 'PAUSED', 'COMPLETED', 'ABANDONED', name='sessionstatus'), nullable=False),
+    sa.Column('configuration', sa.JSON(), nullable=True),
+    sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('paused_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('time_limit', sa.Integer(), nullable=True),
+    sa.Column('time_spent', sa.Integer(), nullable=False),
+    sa.Column('total_questions', sa.Integer(), nullable=False),
+    sa.Column('answered_questions', sa.Integer(), nullable=False),
+    sa.Column('correct_answers', sa.Integer(), nullable=False),
+    sa.Column('total_score', sa.Integer(), nullable=True),
+    sa.Column('section_scores', sa.JSON(), nullable=True),
+    sa.Column('current_question_index', sa.Integer(), nullable=False),
+    sa.Column('question_order', sa.JSON(), nullable=True),
+    sa.Column('estimated_ability', sa.JSON(), nullable=True),
+    sa.Column('difficulty_progression', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_test_sessions_id', 'test_sessions', ['id'], unique=False)
+    op.create_index('ix_test_sessions_user_id', 'test_sessions', ['user_id'], unique=False)
+
+    op.create_table('answers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('test_session_id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('user_answer', sa.JSON(), nullable=False),
+    sa.Column('is_correct', sa.Boolean(), nullable=False),
+    sa.Column('time_spent', sa.Integer(), nullable=False),
+    sa.Column('attempt_number', sa.Integer(), nullable=False),
+    sa.Column('confidence_level', sa.Integer(), nullable=True),
+    sa.Column('flagged_for_review', sa.Boolean(), nullable=False),
+    sa.Column('skipped', sa.Boolean(), nullable=False),
+    sa.Column('points_earned', sa.Integer(), nullable=False),
+    sa.Column('difficulty_at_time', sa.String(length=20), nullable=True),
+    sa.Column('answered_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ),
+    sa.ForeignKeyConstraint(['test_session_id'], ['test_sessions.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_answers_id', 'answers', ['id'], unique=False)
+    op.create_index('ix_answers_question_id', 'answers', ['question_id'], unique=False)
+    op.create_index('ix_answers_test_session_id', 'answers', ['test_session_id'], unique=False)
+    op.create_index('ix_answers_user_id', 'answers', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_answers_user_id', table_name='answers')
+    op.drop_index('ix_answers_test_session_id', table_name='answers')
+    op.drop_index('ix_answers_question_id', table_name='answers')
+    op.drop_index('ix_answers_id', table_name='answers')
+    op.drop_table('answers')
+
+    op.drop_index('ix_test_sessions_user_id', table_name='test_sessions')
+    op.drop_index('ix_test_sessions_id', table_name='test_sessions')
+    op.drop_table('test_sessions')
+
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
+
+    op.drop_index('ix_questions_topic', table_name='questions')
+    op.drop_index('ix_questions_id', table_name='questions')
+    op.drop_table('questions')
+
+    # PostgreSQL keeps enum types after their tables are dropped
+    for name in ('sessionstatus', 'sessiontype', 'userrole', 'subject', 'difficultylevel', 'questiontype'):
+        sa.Enum(name=name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,62 @@
+"""question import ids, irt parameters, user listing index and user stats
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 19:08:33.471926
+
+Schema added on top of the create_all baseline: ``questions.external_id``
+(the upsert key for question bank imports), the 3PL item parameters, the
+keyset pagination index on users and the ``user_stats`` rollup table.
+Existing rows get no stats until ``python -m scripts.backfill_user_stats``
+is run.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Batch mode so SQLite can add the unique constraint (plain ALTER elsewhere)
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.add_column(sa.Column('external_id', sa.String(length=100), nullable=True))
+        batch_op.add_column(sa.Column('irt_discrimination', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('irt_difficulty', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('irt_guessing', sa.Float(), nullable=True))
+        batch_op.create_unique_constraint('questions_external_id_key', ['external_id'])
+
+    op.create_index('ix_users_is_active_created_at_id', 'users', ['is_active', 'created_at', 'id'], unique=False)
+
+    op.create_table('user_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('total_sessions', sa.Integer(), nullable=False),
+    sa.Column('completed_sessions', sa.Integer(), nullable=False),
+    sa.Column('total_answers', sa.Integer(), nullable=False),
+    sa.Column('correct_answers', sa.Integer(), nullable=False),
+    sa.Column('total_time_spent', sa.Integer(), nullable=False),
+    sa.Column('best_score', sa.Integer(), nullable=True),
+    sa.Column('recent_scores', sa.JSON(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_stats')
+
+    op.drop_index('ix_users_is_active_created_at_id', table_name='users')
+
+    with op.batch_alter_table('questions') as batch_op:
+        batch_op.drop_constraint('questions_external_id_key', type_='unique')
+        batch_op.drop_column('irt_guessing')
+        batch_op.drop_column('irt_difficulty')
+        batch_op.drop_column('irt_discrimination')
+        batch_op.drop_column('external_id')
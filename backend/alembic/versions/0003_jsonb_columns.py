@@ -0,0 +1,59 @@
+"""jsonb columns and tags gin index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 16:02:41.518203
+
+PostgreSQL only: other databases keep the generic JSON type and have no
+tags index, so this revision does nothing there.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, nullable) of the JSON columns stored as JSONB
+JSONB_COLUMNS = (
+    ('questions', 'content', False),
+    ('questions', 'tags', True),
+    ('test_sessions', 'configuration', True),
+    ('answers', 'user_answer', False),
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    for table, column, nullable in JSONB_COLUMNS:
+        op.alter_column(
+            table, column,
+            existing_type=sa.JSON(),
+            type_=postgresql.JSONB(),
+            existing_nullable=nullable,
+            postgresql_using=f'{column}::jsonb',
+        )
+    op.create_index('ix_questions_tags', 'questions', ['tags'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_questions_tags', table_name='questions', postgresql_using='gin')
+    for table, column, nullable in JSONB_COLUMNS:
+        op.alter_column(
+            table, column,
+            existing_type=postgresql.JSONB(),
+            type_=sa.JSON(),
+            existing_nullable=nullable,
+            postgresql_using=f'{column}::json',
+        )
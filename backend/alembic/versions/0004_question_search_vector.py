@@ -0,0 +1,50 @@
+"""question full-text search vector
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 17:21:09.604117
+
+PostgreSQL only: adds a generated tsvector over the question text (weight A)
+and explanation (weight B) with a GIN index. The column isn't mapped on the
+Question model; QuestionRepository.search_full_text queries it by name. Other
+databases search with the in-process index instead, so this revision does
+nothing there.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(content ->> 'question_text', '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(content ->> 'explanation', '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.add_column(
+        'questions',
+        sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(SEARCH_VECTOR, persisted=True), nullable=True),
+    )
+    op.create_index(
+        'ix_questions_search_vector', 'questions', ['search_vector'], unique=False, postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_questions_search_vector', table_name='questions', postgresql_using='gin')
+    op.drop_column('questions', 'search_vector')
@@ -0,0 +1,44 @@
+"""score distributions
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 17:52:14.206381
+
+Fill the new table with ``python -m scripts.backfill_score_distributions``.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The sessiontype enum already exists on PostgreSQL (test_sessions)
+    session_type = sa.Enum(
+        'PRACTICE', 'FULL_TEST', 'ADAPTIVE_TEST', 'TOPIC_PRACTICE', name='sessiontype'
+    ).with_variant(
+        postgresql.ENUM(
+            'PRACTICE', 'FULL_TEST', 'ADAPTIVE_TEST', 'TOPIC_PRACTICE', name='sessiontype', create_type=False
+        ),
+        'postgresql'
+    )
+    op.create_table('score_distributions',
+    sa.Column('session_type', session_type, nullable=False),
+    sa.Column('section', sa.String(length=50), nullable=False),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('session_type', 'section', 'score')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('score_distributions')
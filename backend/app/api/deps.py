@@ -0,0 +1,120 @@
+"""
+Shared API dependencies
+"""
+
+from typing import AsyncIterator, Optional
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db, read_session, replica_router
+from app.core.etag import apply_etag, version_stamps
+from app.core.security import get_user_id_from_token
+from app.models.user import User
+from app.repositories.user_repository import UserRepository
+
+security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+# Methods that never start a read-your-writes window
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+async def get_current_user_id(
+    request: Request,
+    token: HTTPAuthorizationCredentials = Depends(security)
+) -> int:
+    """Resolve the authenticated user ID from the bearer token without loading the user
+
+    Write requests start the user's read-your-writes window, so their next
+    reads skip the replica.
+    """
+    user_id = get_user_id_from_token(token.credentials)
+    if request.method not in SAFE_METHODS:
+        await replica_router.record_write(user_id)
+
+    return user_id
+
+async def get_current_user(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Resolve the authenticated user from the bearer token
+
+    Served from the user snapshot cache when warm, so authenticated
+    requests don't query the users table.
+    """
+    user_repo = UserRepository(db)
+    user = await user_repo.get_by_id_cached(user_id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
+    return user
+
+async def get_current_user_if_modified(
+    request: Request,
+    response: Response,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """Resolve the authenticated user for a conditional GET of their profile
+
+    A request whose If-None-Match matches the user's cached version stamp
+    gets a 304 before the user is loaded. Otherwise the user's ETag is set
+    on the response.
+    """
+    etag = await version_stamps.get("user", user_id)
+    if etag:
+        apply_etag(request, response, etag)
+        return await get_current_user(user_id, db)
+
+    user = await get_current_user(user_id, db)
+    etag = await version_stamps.stamp("user", user.id, user.updated_at.isoformat())
+    apply_etag(request, response, etag)
+
+    return user
+
+async def get_read_db(
+    token: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> AsyncIterator[AsyncSession]:
+    """Database session for read-only endpoints
+
+    Served by the read replica when one is configured, except inside the
+    caller's read-your-writes window or while the replica is unavailable.
+    """
+    user_id = None
+    if token:
+        try:
+            user_id = get_user_id_from_token(token.credentials)
+        except HTTPException:
+            # Authentication itself is left to get_current_user
+            pass
+
+    async with read_session(user_id) as session:
+        yield session
+
+async def get_current_admin_user(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    """Require the authenticated user to be an admin"""
+    if not current_user.is_admin():
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+
+    return current_user
+
+async def get_current_instructor_user(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    """Require the authenticated user to be an instructor or admin"""
+    if not (current_user.is_instructor() or current_user.is_admin()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Instructor access required"
+        )
+    
+    return current_user
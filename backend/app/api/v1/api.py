@@ -4,13 +4,16 @@ Main API router for v1 endpoints
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, users
+from app.api.v1.endpoints import auth, users, questions, test_sessions, exports
 
 api_router = APIRouter()
 
 # Include all endpoint routers
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["Users"])
+api_router.include_router(questions.router, prefix="/questions", tags=["Questions"])
+api_router.include_router(test_sessions.router, prefix="/test-sessions", tags=["Test Sessions"])
+api_router.include_router(exports.router, prefix="/exports", tags=["Exports"])
 
 # Health check for API v1
 @api_router.get("/health")
@@ -3,27 +3,27 @@ Authentication endpoints
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
+from app.api import deps
 from app.core.database import get_db
 from app.core.security import (
-    verify_password, 
-    get_password_hash, 
+    verify_password_async,
+    get_password_hash_async,
     create_access_token, 
     create_refresh_token,
-    verify_token,
-    get_user_id_from_token
+    verify_token
 )
 from app.core.config import settings
 from app.schemas.auth import Token, RefreshToken, PasswordReset
+from app.models.user import User
 from app.schemas.user import UserCreate, UserLogin, UserResponse
+from app.services.last_login_writer import last_login_writer
 from app.services.user_service import UserService
 from app.repositories.user_repository import UserRepository
 
 router = APIRouter()
-security = HTTPBearer()
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
@@ -44,7 +44,7 @@ async def register(
         )
     
     # Hash password
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     
     # Create user
     user = await user_service.create_user(user_data, hashed_password)
@@ -69,7 +69,7 @@ async def login(
         )
     
     # Verify password
-    if not verify_password(user_credentials.password, user.hashed_password):
+    if not await verify_password_async(user_credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -92,8 +92,8 @@ async def login(
         data={"sub": str(user.id), "email": user.email}
     )
     
-    # Update last login
-    await user_repo.update_last_login(user.id)
+    # Update last login (written in the background)
+    last_login_writer.record(user.id)
     
     return Token(
         access_token=access_token,
@@ -152,22 +152,8 @@ async def logout():
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user(
-    token: str = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(deps.get_current_user_if_modified)
 ) -> UserResponse:
-    """Get current authenticated user"""
-    
-    # Extract token from Bearer scheme
-    access_token = token.credentials
-    user_id = get_user_id_from_token(access_token)
+    """Get current authenticated user (304 when If-None-Match is current)"""
     
-    # Get user
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    return UserResponse.model_validate(user)
+    return UserResponse.model_validate(current_user)
@@ -0,0 +1,71 @@
+"""
+Data export endpoints for instructors
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import List, Optional
+
+from app.api.deps import get_current_instructor_user
+from app.models.test_session import SessionType
+from app.models.user import User
+from app.services.export_service import ExportService, ExportFormat, MEDIA_TYPES
+
+router = APIRouter()
+
+def _check_window(since: Optional[datetime], until: Optional[datetime]) -> None:
+    """Reject an empty or inverted time window"""
+    if since and until and since >= until:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'since' must be earlier than 'until'"
+        )
+
+def _streaming_response(chunks, export_format: ExportFormat, name: str) -> StreamingResponse:
+    """Wrap an export stream as a downloadable response"""
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format.value}"'}
+    )
+
+@router.get("/answers")
+async def export_answers(
+    format: ExportFormat = ExportFormat.CSV,
+    user_id: Optional[List[int]] = Query(None),
+    session_type: Optional[SessionType] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: User = Depends(get_current_instructor_user)
+) -> StreamingResponse:
+    """Stream answers as CSV or NDJSON, filtered by users, session type and answered_at window"""
+    
+    _check_window(since, until)
+    
+    export_service = ExportService()
+    chunks = export_service.export_answers(
+        format, user_ids=user_id, session_type=session_type, since=since, until=until
+    )
+    
+    return _streaming_response(chunks, format, "answers")
+
+@router.get("/sessions")
+async def export_sessions(
+    format: ExportFormat = ExportFormat.CSV,
+    user_id: Optional[List[int]] = Query(None),
+    session_type: Optional[SessionType] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: User = Depends(get_current_instructor_user)
+) -> StreamingResponse:
+    """Stream test session results as CSV or NDJSON, filtered by users, session type and started_at window"""
+    
+    _check_window(since, until)
+    
+    export_service = ExportService()
+    chunks = export_service.export_sessions(
+        format, user_ids=user_id, session_type=session_type, since=since, until=until
+    )
+    
+    return _streaming_response(chunks, format, "test_sessions")
@@ -0,0 +1,152 @@
+"""
+Question bank endpoints
+"""
+
+from fastapi import APIRouter, Depends, File, HTTPException, Path, Query, UploadFile, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+import io
+import os
+import uuid
+
+from app.api.deps import get_current_admin_user, get_current_instructor_user, get_read_db
+from app.core.config import settings
+from app.core.database import get_db
+from app.models.question import DifficultyLevel, Subject
+from app.models.user import User
+from app.repositories.question_repository import QuestionRepository
+from app.schemas.question import QuestionResponse, QuestionSearchResult
+from app.services.grading_service import GradingService
+from app.services.question_import import (
+    REJECTS_DIR,
+    ImportFormat,
+    QuestionImporter,
+    detect_format,
+    get_import_executor,
+    purge_rejects,
+    rejects_path,
+)
+from app.services.question_search import QuestionSearchService
+
+router = APIRouter()
+
+@router.get("/search", response_model=List[QuestionSearchResult])
+async def search_questions(
+    q: str = Query(..., min_length=1, max_length=200),
+    subject: Optional[Subject] = None,
+    difficulty: Optional[DifficultyLevel] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_instructor_user),
+    db: AsyncSession = Depends(get_read_db)
+) -> List[QuestionSearchResult]:
+    """Search question text and explanations, best matches first (instructors and admins)
+    
+    ``q`` takes web search syntax on PostgreSQL ("quoted phrases", ``or``,
+    ``-excluded``); every word must match. Elsewhere searches get 503 until
+    the in-process index has been built.
+    """
+    
+    search_service = QuestionSearchService(db)
+    if not search_service.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Question search index is still loading, retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    hits = await search_service.search(q, subject, difficulty, skip, limit)
+    
+    return [
+        QuestionSearchResult(**QuestionResponse.model_validate(question).model_dump(), rank=rank)
+        for question, rank in hits
+    ]
+
+@router.post("/import")
+async def import_questions(
+    file: UploadFile = File(...),
+    format: Optional[ImportFormat] = None,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    """Import a question bank file (JSON array, JSONL or CSV), upserting on external_id (admin only)
+    
+    Rejected records are kept as JSON lines for
+    QUESTION_IMPORT_REJECTS_RETENTION_DAYS; fetch them with the report's
+    ``rejects_id`` from ``GET /questions/import/{rejects_id}/rejects``.
+    """
+    
+    try:
+        import_format = format or detect_format(file.filename)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    purge_rejects(settings.QUESTION_IMPORT_REJECTS_RETENTION_DAYS * 86400)
+    os.makedirs(REJECTS_DIR, exist_ok=True)
+    rejects_id = uuid.uuid4().hex
+    path = rejects_path(rejects_id)
+    
+    fp = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        with open(path, "w", encoding="utf-8") as rejects:
+            importer = QuestionImporter(
+                db, created_by=current_user.id, executor=get_import_executor(), rejects_file=rejects
+            )
+            report = await importer.run(fp, import_format)
+    except (ValueError, UnicodeDecodeError) as e:
+        os.remove(path)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not parse question bank: {e}"
+        )
+    finally:
+        fp.detach()
+    
+    if report["rejected"]:
+        report["rejects_id"] = rejects_id
+    else:
+        os.remove(path)
+    
+    return report
+
+@router.get("/import/{rejects_id}/rejects")
+async def get_import_rejects(
+    rejects_id: str = Path(..., pattern="^[0-9a-f]{32}$"),
+    current_user: User = Depends(get_current_admin_user)
+) -> FileResponse:
+    """Download the rejected records of an import as JSON lines (admin only)"""
+    
+    path = rejects_path(rejects_id)
+    if not os.path.isfile(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import rejects not found"
+        )
+    
+    return FileResponse(
+        path,
+        media_type="application/x-ndjson",
+        filename=os.path.basename(path)
+    )
+
+@router.post("/{question_id}/regrade")
+async def regrade_question(
+    question_id: int,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+) -> dict:
+    """Re-grade all answers to a question against its current key (admin only)"""
+    
+    question = await QuestionRepository(db).get_by_id(question_id)
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found"
+        )
+    
+    grading_service = GradingService(db)
+    return await grading_service.regrade_question(question_id)
@@ -0,0 +1,289 @@
+"""
+Test session endpoints
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.api.deps import get_current_user, get_read_db
+from app.core.database import get_db
+from app.core.etag import apply_etag, make_etag
+from app.core.session_state import PROGRESS_FIELDS, SessionStateUnavailable
+from app.models.question import Subject
+from app.models.test_session import SessionType, SessionStatus, TestSession
+from app.models.user import User
+from app.schemas.answer import AnswerBatchCreate, AnswerBatchResponse
+from app.repositories.score_distribution_repository import session_scores
+from app.schemas.test_session import (
+    AdaptiveNextQuestion,
+    ScorePercentile,
+    TestSessionCreate,
+    TestSessionPercentiles,
+    TestSessionResponse,
+    TestSessionReview,
+)
+from app.services.adaptive_service import AdaptiveTestService
+from app.services.answer_service import AnswerService
+from app.services.score_distribution import score_distributions
+from app.services.test_session_service import TestSessionService
+from app.repositories.test_session_repository import TestSessionRepository
+
+router = APIRouter()
+
+async def _get_own_session(session_id: int, current_user: User, db: AsyncSession) -> TestSession:
+    """Load a test session owned by the current user or raise 404"""
+    session = await TestSessionRepository(db).get_by_id(session_id)
+    if not session or session.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Test session not found"
+        )
+    return session
+
+def _session_etag(kind: str, session: TestSession) -> str:
+    """ETag of a test session, covering live progress that skips updated_at"""
+    return make_etag(
+        kind,
+        session.id,
+        session.updated_at.isoformat(),
+        session.status.value,
+        *(getattr(session, field) for field in PROGRESS_FIELDS)
+    )
+
+@router.post("/", response_model=TestSessionResponse, status_code=status.HTTP_201_CREATED)
+async def create_test_session(
+    session_data: TestSessionCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> TestSessionResponse:
+    """Start a new test session"""
+    
+    session_service = TestSessionService(db)
+    session = await session_service.create_session(current_user.id, session_data)
+    
+    return TestSessionResponse.model_validate(session)
+
+@router.get("/{session_id}", response_model=TestSessionResponse)
+async def get_test_session(
+    session_id: int,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+) -> TestSessionResponse:
+    """Get a test session with its live progress"""
+    
+    session_service = TestSessionService(db)
+    session = await session_service.get_session(session_id)
+    if not session or session.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Test session not found"
+        )
+    
+    apply_etag(request, response, _session_etag("test_session", session))
+    return TestSessionResponse.model_validate(session)
+
+@router.get("/{session_id}/review", response_model=TestSessionReview)
+async def review_test_session(
+    session_id: int,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+) -> TestSessionReview:
+    """Get a finished test session with every answer and its question"""
+    
+    session = await TestSessionRepository(db).get_by_id(session_id, with_answers=True)
+    if not session or session.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Test session not found"
+        )
+    if session.can_resume():
+        # Questions carry their correct answers
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Test session is not finished"
+        )
+    
+    apply_etag(request, response, _session_etag("test_session_review", session))
+    return TestSessionReview.model_validate(session)
+
+@router.get("/{session_id}/percentiles", response_model=TestSessionPercentiles)
+async def get_test_session_percentiles(
+    session_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+) -> TestSessionPercentiles:
+    """Rank a completed test session's scores against all completed sessions of its type"""
+    
+    session = await TestSessionRepository(db).get_by_id(session_id)
+    if not session or session.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Test session not found"
+        )
+    if session.status != SessionStatus.COMPLETED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Test session is not completed"
+        )
+    
+    # Served from the in-memory histograms
+    sections = {
+        section: ScorePercentile(
+            score=score,
+            percentile=score_distributions.percentile(session.session_type, section, score),
+            sample_size=score_distributions.sample_size(session.session_type, section)
+        )
+        for section, score in session_scores(session.total_score, session.section_scores).items()
+    }
+    
+    return TestSessionPercentiles(
+        test_session_id=session.id,
+        session_type=session.session_type,
+        sections=sections
+    )
+
+@router.post("/{session_id}/pause", response_model=TestSessionResponse)
+async def pause_test_session(
+    session_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> TestSessionResponse:
+    """Pause an active test session"""
+    
+    session = await _get_own_session(session_id, current_user, db)
+    if not session.is_active():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Test session is not active"
+        )
+    
+    session_service = TestSessionService(db)
+    session = await session_service.pause_session(session)
+    
+    return TestSessionResponse.model_validate(session)
+
+@router.post("/{session_id}/resume", response_model=TestSessionResponse)
+async def resume_test_session(
+    session_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> TestSessionResponse:
+    """Resume a paused test session"""
+    
+    session = await _get_own_session(session_id, current_user, db)
+    if session.status != SessionStatus.PAUSED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Test session is not paused"
+        )
+    
+    session_service = TestSessionService(db)
+    session = await session_service.resume_session(session)
+    
+    return TestSessionResponse.model_validate(session)
+
+@router.post("/{session_id}/complete", response_model=TestSessionResponse)
+async def complete_test_session(
+    session_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> TestSessionResponse:
+    """Complete an active or paused test session"""
+    
+    session = await _get_own_session(session_id, current_user, db)
+    if not session.can_resume():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Test session is already finished"
+        )
+    
+    session_service = TestSessionService(db)
+    session = await session_service.complete_session(session)
+    if session is None:
+        # Completed by a concurrent request since it was loaded
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Test session is already finished"
+        )
+    
+    return TestSessionResponse.model_validate(session)
+
+@router.post("/{session_id}/answers/batch", response_model=AnswerBatchResponse)
+async def submit_answers(
+    session_id: int,
+    batch: AnswerBatchCreate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> AnswerBatchResponse:
+    """Grade and record several answers for one test session in a single transaction"""
+    
+    answer_service = AnswerService(db)
+    
+    try:
+        result = await answer_service.submit_batch(current_user.id, session_id, batch.answers)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except SessionStateUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Session progress store is unavailable, retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    if result is None:
+        # Distinguish a missing session from one that can't take answers
+        session = await TestSessionRepository(db).get_by_id(session_id)
+        if not session or session.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Test session not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Test session is not active"
+        )
+    
+    return AnswerBatchResponse(**result)
+
+@router.post("/{session_id}/next-question", response_model=AdaptiveNextQuestion)
+async def next_adaptive_question(
+    session_id: int,
+    subject: Optional[Subject] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+) -> AdaptiveNextQuestion:
+    """Estimate ability for an adaptive session and pick its next question"""
+    
+    session = await TestSessionRepository(db).get_by_id(session_id)
+    if not session or session.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Test session not found"
+        )
+    if session.session_type != SessionType.ADAPTIVE_TEST:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Test session is not adaptive"
+        )
+    if not session.is_active():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Test session is not active"
+        )
+    
+    adaptive_service = AdaptiveTestService(db)
+    question_id = await adaptive_service.next_question(session, subject=subject)
+    
+    return AdaptiveNextQuestion(
+        test_session_id=session.id,
+        question_id=question_id,
+        estimated_ability=session.estimated_ability
+    )
@@ -2,54 +2,38 @@
 User management endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
+from app.api.deps import get_current_user, get_current_user_if_modified, get_current_admin_user, get_read_db
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import get_user_id_from_token
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.serialization import get_row_serializer
+from app.models.user import User
 from app.schemas.user import UserResponse, UserUpdate, UserStats
 from app.services.user_service import UserService
 from app.repositories.user_repository import UserRepository
 
 router = APIRouter()
-security = HTTPBearer()
 
 @router.get("/me", response_model=UserResponse)
 async def get_my_profile(
-    token: str = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user_if_modified)
 ) -> UserResponse:
-    """Get current user's profile"""
-    
-    # Extract token and get user ID
-    access_token = token.credentials
-    user_id = get_user_id_from_token(access_token)
+    """Get current user's profile (304 when If-None-Match is current)"""
     
-    # Get user
-    user_repo = UserRepository(db)
-    user = await user_repo.get_by_id(user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    
-    return UserResponse.model_validate(user)
+    return UserResponse.model_validate(current_user)
 
 @router.put("/me", response_model=UserResponse)
 async def update_my_profile(
     user_update: UserUpdate,
-    token: str = Depends(security),
+    current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ) -> UserResponse:
     """Update current user's profile"""
     
-    # Extract token and get user ID
-    access_token = token.credentials
-    user_id = get_user_id_from_token(access_token)
-    
     # Update user
     user_repo = UserRepository(db)
     user_service = UserService(user_repo)
@@ -63,7 +47,7 @@ async def update_my_profile(
             detail="No valid fields to update"
         )
     
-    updated_user = await user_service.update_user_profile(user_id, **update_data)
+    updated_user = await user_service.update_user_profile(current_user.id, **update_data)
     if not updated_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -74,72 +58,68 @@ async def update_my_profile(
 
 @router.get("/me/stats", response_model=UserStats)
 async def get_my_stats(
-    token: str = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
 ) -> UserStats:
     """Get current user's statistics"""
     
-    # Extract token and get user ID
-    access_token = token.credentials
-    user_id = get_user_id_from_token(access_token)
-    
     # Get user statistics
     user_repo = UserRepository(db)
     user_service = UserService(user_repo)
     
-    stats = await user_service.get_user_statistics(user_id)
+    stats = await user_service.get_user_statistics(current_user.id)
     return UserStats(**stats)
 
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     active_only: bool = True,
-    token: str = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_read_db)
 ) -> List[UserResponse]:
-    """Get list of users (admin only)"""
+    """Get list of users (admin only)
     
-    # Extract token and get user ID
-    access_token = token.credentials
-    user_id = get_user_id_from_token(access_token)
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` to fetch
+    the next page; ``skip`` is still accepted for compatibility.
+    """
     
-    # Check if user is admin
+    # Get users
     user_repo = UserRepository(db)
-    current_user = await user_repo.get_by_id(user_id)
-    if not current_user or not current_user.is_admin():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
+    user_service = UserService(user_repo)
+    after = decode_cursor(cursor) if cursor else None
+    
+    if settings.FAST_JSON_RESPONSES:
+        # Serialize rows straight to JSON without ORM objects or models
+        serializer = get_row_serializer(UserResponse)
+        rows = await user_service.get_user_rows(
+            serializer.columns(User), skip, limit, active_only, after=after
         )
+        fast_response = serializer.response(rows)
+        if rows and len(rows) == limit:
+            last = rows[-1]._mapping
+            fast_response.headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["id"])
+        return fast_response
     
-    # Get users
-    user_service = UserService(user_repo)
-    users = await user_service.get_users_with_pagination(skip, limit, active_only)
+    users = await user_service.get_users_with_pagination(skip, limit, active_only, after=after)
+    
+    # Advertise the next page when this one is full
+    if users and len(users) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(users[-1].created_at, users[-1].id)
     
     return [UserResponse.model_validate(user) for user in users]
 
 @router.get("/counts")
 async def get_user_counts(
-    token: str = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_read_db)
 ) -> dict:
     """Get user count statistics (admin only)"""
     
-    # Extract token and get user ID
-    access_token = token.credentials
-    user_id = get_user_id_from_token(access_token)
-    
-    # Check if user is admin
-    user_repo = UserRepository(db)
-    current_user = await user_repo.get_by_id(user_id)
-    if not current_user or not current_user.is_admin():
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
-    
     # Get user counts
+    user_repo = UserRepository(db)
     user_service = UserService(user_repo)
     counts = await user_service.get_user_counts()
     
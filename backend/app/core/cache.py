@@ -0,0 +1,178 @@
+"""
+In-process caching utilities
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.core.config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries expire after a per-entry TTL"""
+
+    def __init__(self, max_size: int = 10000, default_ttl: float = 300.0):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, or default if it is missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value for ttl seconds (defaults to the cache's TTL)"""
+        ttl = self.default_ttl if ttl is None else min(ttl, self.default_ttl)
+        if ttl <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a value if present"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all values"""
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Get cache metrics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+class CacheBackend(ABC):
+    """Async key/value cache interface shared by the in-memory and Redis backends"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Process-local cache backend (single worker deployments and tests)"""
+
+    def __init__(self, max_size: int = 10000):
+        # Callers always pass an explicit TTL, so don't cap it here
+        self.cache = TTLCache(max_size=max_size, default_ttl=float("inf"))
+
+    async def get(self, key: str) -> Optional[str]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        self.cache.set(key, value, ttl=ttl)
+
+    async def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+    def stats(self) -> dict:
+        """Get cache metrics"""
+        return {"backend": "memory", **self.cache.stats()}
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis cache backend shared by all workers
+
+    Redis errors are logged and treated as cache misses so an unavailable
+    cache degrades to database reads instead of failing requests.
+    """
+
+    def __init__(self, url: str, prefix: str = "tutorlms"):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            value = await self.client.get(self._key(key))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis cache get failed: {e}")
+            return None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        try:
+            await self.client.set(self._key(key), value, px=max(1, int(ttl * 1000)))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis cache set failed: {e}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.client.delete(self._key(key))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis cache delete failed: {e}")
+
+    def stats(self) -> dict:
+        """Get cache metrics"""
+        return {"backend": "redis", "hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+def create_cache_backend(prefix: str) -> CacheBackend:
+    """Create the cache backend selected by CACHE_BACKEND"""
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.REDIS_URL, prefix=f"tutorlms:{prefix}")
+    return MemoryCacheBackend(max_size=settings.CACHE_MAX_SIZE)
@@ -2,19 +2,32 @@
 Database configuration and session management
 """
 
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Optional
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 import logging
+import time
 
+from app.core.cache import create_cache_backend
 from app.core.config import settings
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Alembic configuration of the backend
+ALEMBIC_CONFIG = Path(__file__).resolve().parents[2] / "alembic.ini"
+
 class Base(DeclarativeBase):
     """Base class for all database models"""
     pass
 
+# JSON column type stored as JSONB on PostgreSQL: parsed once on write and indexable
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
@@ -30,12 +43,86 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Create read replica engine (reads stay on the primary when none is configured)
+replica_engine = create_async_engine(
+    settings.DATABASE_REPLICA_URL,
+    echo=settings.DEBUG,
+    pool_pre_ping=True,
+    pool_recycle=300,
+) if settings.DATABASE_REPLICA_URL else None
+
+ReadSessionLocal = async_sessionmaker(
+    replica_engine or engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+class ReplicaRouter:
+    """Decides whether a read-only session may use the replica
+    
+    Users who sent a write request within the read-your-writes window read
+    from the primary, so they always see their own changes despite
+    replication lag. The window is kept in the shared cache backend, so it
+    holds across workers with CACHE_BACKEND=redis. After the replica fails,
+    reads go to the primary for retry_seconds before it is tried again.
+    """
+    
+    def __init__(self, enabled: bool, window_seconds: float, retry_seconds: float):
+        self.enabled = enabled
+        self.window_seconds = window_seconds
+        self.retry_seconds = retry_seconds
+        self.recent_writes = create_cache_backend("recent_write")
+        self.unavailable_until = 0.0
+        
+        # Metrics
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.fallbacks = 0
+    
+    async def record_write(self, user_id: int) -> None:
+        """Start a user's read-your-writes window"""
+        if self.enabled and self.window_seconds > 0:
+            await self.recent_writes.set(str(user_id), "1", self.window_seconds)
+    
+    async def use_replica(self, user_id: Optional[int] = None) -> bool:
+        """Check whether a read for the user may go to the replica"""
+        if not self.enabled or time.monotonic() < self.unavailable_until:
+            return False
+        if user_id is not None and await self.recent_writes.get(str(user_id)):
+            return False
+        return True
+    
+    def mark_unavailable(self, error: Exception) -> None:
+        """Send reads to the primary for a while after a replica failure"""
+        self.fallbacks += 1
+        self.unavailable_until = time.monotonic() + self.retry_seconds
+        logger.warning(f"Read replica unavailable, using the primary for {self.retry_seconds}s: {error}")
+    
+    def stats(self) -> dict:
+        """Get routing metrics"""
+        return {
+            "enabled": self.enabled,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "fallbacks": self.fallbacks,
+        }
+
+# Create global replica router instance
+replica_router = ReplicaRouter(
+    enabled=replica_engine is not None,
+    window_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    retry_seconds=settings.REPLICA_RETRY_SECONDS,
+)
+
 async def init_db() -> None:
-    """Initialize database tables"""
+    """Create all tables directly from the models (tests, benchmarks and local tooling)
+    
+    The application doesn't call this; its schema is managed by Alembic.
+    """
     try:
         async with engine.begin() as conn:
             # Import all models to ensure they are registered with Base.metadata
-            from app.models import user, question, test_session, answer
+            from app.models import user, question, test_session, answer, user_stats, score_distribution
             
             # Create all tables
             await conn.run_sync(Base.metadata.create_all)
@@ -44,6 +131,29 @@ async def init_db() -> None:
         logger.error(f"Error initializing database: {e}")
         raise
 
+async def check_db_schema() -> None:
+    """Check that the database is at the Alembic head revision
+    
+    Only reads the alembic_version table, so every worker can run it on
+    startup; migrations are applied once per deploy with ``alembic upgrade head``.
+    """
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+    
+    heads = set(ScriptDirectory.from_config(Config(str(ALEMBIC_CONFIG))).get_heads())
+    async with engine.connect() as conn:
+        current = set(await conn.run_sync(
+            lambda sync_conn: MigrationContext.configure(sync_conn).get_current_heads()
+        ))
+    
+    if current != heads:
+        raise RuntimeError(
+            f"Database schema is at revision {', '.join(sorted(current)) or 'none'}, "
+            f"expected {', '.join(sorted(heads))}; run `alembic upgrade head`"
+        )
+    logger.info(f"Database schema is at revision {', '.join(sorted(heads))}")
+
 async def get_db() -> AsyncSession:
     """
     Dependency that provides database session
@@ -54,7 +164,42 @@ async def get_db() -> AsyncSession:
         finally:
             await session.close()
 
+@asynccontextmanager
+async def read_session(user_id: Optional[int] = None) -> AsyncIterator[AsyncSession]:
+    """Open a session for read-only work, on the replica when possible
+    
+    Connects up front so an unreachable replica falls back to the primary
+    before any query runs.
+    """
+    session = None
+    if await replica_router.use_replica(user_id):
+        session = ReadSessionLocal()
+        try:
+            await session.connection()
+            replica_router.replica_reads += 1
+        except Exception as e:
+            await session.close()
+            replica_router.mark_unavailable(e)
+            session = None
+    
+    if session is None:
+        replica_router.primary_reads += 1
+        session = AsyncSessionLocal()
+    
+    async with session:
+        yield session
+
+def dialect_insert(db: AsyncSession):
+    """Get the dialect-specific insert() that supports ON CONFLICT upserts"""
+    if db.bind.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert
+
 async def close_db() -> None:
     """Close database connections"""
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
     logger.info("Database connections closed")
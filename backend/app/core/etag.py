@@ -0,0 +1,108 @@
+"""
+Entity tags and conditional GET support
+
+ETags are derived from a resource's version data: its kind, ID and
+``updated_at`` plus any fields that change without touching ``updated_at``.
+They are weak tags since they identify the resource version, not the exact
+response bytes. A request whose ``If-None-Match`` matches gets a 304 with no
+body.
+
+Version stamps cache the current ETag of a resource so a matching request can
+be answered without loading the row. Writers must invalidate the stamp
+whenever the resource changes (see UserRepository.invalidate_cache).
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+from app.core.cache import create_cache_backend
+from app.core.config import settings
+
+# Clients may keep the body but must revalidate before reusing it
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(kind: str, resource_id: Any, *version: Any) -> str:
+    """Build a weak ETag from a resource's kind, ID and version data"""
+    raw = "|".join(str(part) for part in (kind, resource_id, *version))
+    return f'W/"{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> HTTPException:
+    """304 response for a matching ETag, raised from endpoints or dependencies"""
+    return HTTPException(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+
+def apply_etag(request: Request, response: Response, etag: str) -> None:
+    """Raise a 304 if the request already has this version, else tag the response"""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+class VersionStamps:
+    """Cache of current ETags keyed by resource kind and ID
+
+    With the memory backend each worker keeps its own stamps and only sees
+    invalidations made in that worker, so the TTL is capped at
+    USER_CACHE_TTL_SECONDS: a stale ETag then lives no longer than the
+    cached user snapshot it describes.
+    """
+
+    def __init__(self, ttl: float = settings.VERSION_STAMP_TTL_SECONDS):
+        self.cache = create_cache_backend("version")
+        if settings.CACHE_BACKEND != "redis":
+            ttl = min(ttl, settings.USER_CACHE_TTL_SECONDS)
+        self.ttl = ttl
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, kind: str, resource_id: Any) -> Optional[str]:
+        """Get the cached ETag of a resource, or None if unknown"""
+        etag = await self.cache.get(f"{kind}:{resource_id}")
+        if etag is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return etag
+
+    async def stamp(self, kind: str, resource_id: Any, *version: Any) -> str:
+        """Compute a resource's ETag from its version data and cache it"""
+        etag = make_etag(kind, resource_id, *version)
+        await self.cache.set(f"{kind}:{resource_id}", etag, ttl=self.ttl)
+        return etag
+
+    async def invalidate(self, kind: str, resource_id: Any) -> None:
+        """Forget the cached ETag of a changed resource"""
+        await self.cache.delete(f"{kind}:{resource_id}")
+
+    def stats(self) -> dict:
+        """Get version stamp metrics"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+# Create global version stamps instance
+version_stamps = VersionStamps()
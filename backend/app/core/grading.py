@@ -0,0 +1,119 @@
+"""
+Answer key compilation and grading
+
+Answer keys are normalized once into an AnswerKey (upper-cased choices for
+multiple choice, exact rationals for grid-ins) and cached, so grading a
+response is a set lookup instead of re-parsing ``content["correct_answer"]``.
+"""
+
+import re
+from fractions import Fraction
+from functools import lru_cache
+from typing import Any, Optional
+
+# Grid-in decimals with at least this many digits after the point are
+# accepted when they equal the key truncated or rounded to that precision
+# (e.g. .666 or .667 for 2/3)
+MIN_APPROXIMATE_DIGITS = 3
+
+# Grid-in answers fit in a few characters; anything longer, or in another
+# notation (exponents, "inf", underscores), is not a grid-in number
+MAX_GRID_IN_LENGTH = 8
+_GRID_IN_NUMBER = re.compile(r"-?(\d+(\.\d*)?|\.\d+)(/\d+)?")
+
+
+def normalize_choice(answer: Any) -> str:
+    """Normalize a multiple choice answer for comparison"""
+    return str(answer).strip().upper()
+
+
+@lru_cache(maxsize=4096)
+def parse_number(text: str) -> Optional[Fraction]:
+    """Parse a grid-in answer ("3/4", ".75", "-2") as an exact rational"""
+    text = text.strip().replace(" ", "")
+    if len(text) > MAX_GRID_IN_LENGTH or not _GRID_IN_NUMBER.fullmatch(text):
+        return None
+    try:
+        return Fraction(text)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _decimal_digits(text: str) -> int:
+    """Count digits after the decimal point of a grid-in answer"""
+    text = text.strip()
+    if "/" in text or "." not in text:
+        return 0
+    return len(text.split(".", 1)[1])
+
+
+def _approximations(value: Fraction, digits: int) -> tuple[Fraction, Fraction]:
+    """Get value truncated and rounded (half away from zero) to a number of decimal digits"""
+    scale = 10 ** digits
+    scaled = abs(value) * scale
+    sign = -1 if value < 0 else 1
+    truncated = Fraction(sign * int(scaled), scale)
+    rounded = Fraction(sign * int(scaled + Fraction(1, 2)), scale)
+    return truncated, rounded
+
+
+class AnswerKey:
+    """Precompiled, normalized answer key for one question"""
+
+    __slots__ = ("question_type", "choices", "values", "texts")
+
+    def __init__(self, question_type: str, choices: frozenset, values: frozenset, texts: frozenset):
+        self.question_type = question_type
+        self.choices = choices
+        self.values = values
+        self.texts = texts
+
+    def grade(self, user_answer: Any) -> bool:
+        """Check a user's answer against the key"""
+        if user_answer is None:
+            return False
+
+        if self.question_type == "multiple_choice":
+            return normalize_choice(user_answer) in self.choices
+
+        if self.question_type == "grid_in":
+            text = str(user_answer)
+            value = parse_number(text)
+            if value is None:
+                return text.strip() in self.texts
+            if value in self.values:
+                return True
+
+            digits = _decimal_digits(text)
+            if digits >= MIN_APPROXIMATE_DIGITS:
+                return any(value in _approximations(key, digits) for key in self.values)
+            return False
+
+        # Essay and other free-response questions require manual grading
+        return False
+
+
+@lru_cache(maxsize=65536)
+def _compile(question_type: str, correct_answers: tuple) -> AnswerKey:
+    choices = frozenset(normalize_choice(answer) for answer in correct_answers)
+    texts = frozenset(str(answer).strip() for answer in correct_answers)
+    values = frozenset(
+        value for value in (parse_number(str(answer)) for answer in correct_answers)
+        if value is not None
+    )
+    return AnswerKey(question_type, choices, values, texts)
+
+
+def compile_answer_key(question_type: Any, correct_answer: Any) -> AnswerKey:
+    """Compile (or fetch the cached) answer key for a question
+
+    ``correct_answer`` may be a single value or a list of accepted answers.
+    """
+    question_type = getattr(question_type, "value", question_type)
+    if isinstance(correct_answer, (list, tuple)):
+        correct_answers = tuple(str(answer) for answer in correct_answer)
+    elif correct_answer is None:
+        correct_answers = ()
+    else:
+        correct_answers = (str(correct_answer),)
+    return _compile(question_type, correct_answers)
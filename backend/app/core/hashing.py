@@ -0,0 +1,119 @@
+"""
+Bounded worker pool for password hashing
+
+bcrypt is deliberately slow (hundreds of milliseconds per call), so running it
+inline in an async handler blocks the event loop for every other request on
+the worker. This module runs hashing and verification in a thread or process
+pool, caps how many calls may be in flight and keeps queue-depth metrics.
+"""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class HashingPool:
+    """Runs CPU-bound hashing calls off the event loop with a concurrency cap"""
+
+    def __init__(self, executor_type: str = "thread", max_workers: int = 4, max_concurrency: Optional[int] = None):
+        if executor_type not in ("thread", "process"):
+            raise ValueError(f"Unsupported executor type: {executor_type}")
+
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Metrics
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queue_depth = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        """Create the executor lazily so importing this module stays cheap"""
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hash",
+                )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore that caps concurrent hashing calls"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a hashing function in the pool and return its result"""
+        semaphore = self._get_semaphore()
+        enqueued_at = time.perf_counter()
+
+        self.queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queued)
+        try:
+            await semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        started_at = time.perf_counter()
+        self.total_wait_seconds += started_at - enqueued_at
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+            self.completed += 1
+            return result
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.total_run_seconds += time.perf_counter() - started_at
+            semaphore.release()
+
+    def stats(self) -> dict:
+        """Get pool metrics"""
+        finished = self.completed + self.failed
+        return {
+            "executor_type": self.executor_type,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queued,
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_wait_ms": (self.total_wait_seconds / finished * 1000) if finished else 0.0,
+            "avg_run_ms": (self.total_run_seconds / finished * 1000) if finished else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        """Shut down the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            logger.info("Password hashing pool shut down")
+
+
+# Create global hashing pool instance
+hashing_pool = HashingPool(
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+)
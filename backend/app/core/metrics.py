@@ -0,0 +1,268 @@
+"""
+Request, SQL and connection pool metrics in Prometheus text format
+
+MetricsMiddleware times every HTTP request per route template. SQLAlchemy
+cursor events on the engine count queries and database time, both globally
+and for the request that issued them (tracked through a context variable,
+which SQLAlchemy's async greenlets inherit). Pool checkouts are timed and
+pool utilization is sampled when /metrics is scraped. With
+SERVER_TIMING_ENABLED each response also carries a ``Server-Timing`` header.
+"""
+
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+# Bucket upper bounds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    def __init__(self, name: str, documentation: str, labels: tuple = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.values: dict[tuple, float] = {}
+
+    def inc(self, *label_values, amount: float = 1.0) -> None:
+        self.values[label_values] = self.values.get(label_values, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Histogram:
+    """Histogram with fixed buckets and labels
+
+    Counts are kept per bucket and made cumulative when rendered, so an
+    observation is one bisect and an increment.
+    """
+
+    def __init__(self, name: str, documentation: str, labels: tuple = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        # Label values -> [per-bucket counts (+Inf last), sum, count]
+        self.series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *label_values) -> None:
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total, count) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels + ("le",), label_values + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class RequestStats:
+    """Database work done on behalf of one request"""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Get the database stats of the request being handled, if any"""
+    return _request_stats.get()
+
+
+class MetricsRegistry:
+    """Application metrics"""
+
+    def __init__(self):
+        route = ("method", "route")
+        self.requests = Counter("http_requests_total", "HTTP requests", route + ("status",))
+        self.request_duration = Histogram(
+            "http_request_duration_seconds", "HTTP request latency", route
+        )
+        self.request_queries = Histogram(
+            "http_request_db_queries", "SQL queries per HTTP request", route, QUERY_COUNT_BUCKETS
+        )
+        self.request_db_duration = Histogram(
+            "http_request_db_duration_seconds", "Time spent in SQL per HTTP request", route
+        )
+        self.query_duration = Histogram("db_query_duration_seconds", "SQL query latency")
+        self.pool_checkout_wait = Histogram(
+            "db_pool_checkout_wait_seconds", "Time waiting to check out a pooled connection"
+        )
+        self.engine: Optional[AsyncEngine] = None
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format"""
+        lines = []
+        for metric in (
+            self.requests,
+            self.request_duration,
+            self.request_queries,
+            self.request_db_duration,
+            self.query_duration,
+            self.pool_checkout_wait,
+        ):
+            lines.extend(metric.render())
+        lines.extend(self._render_pool())
+        return "\n".join(lines) + "\n"
+
+    def _render_pool(self) -> list[str]:
+        """Sample connection pool gauges"""
+        pool = self.engine.sync_engine.pool if self.engine else None
+        if not isinstance(pool, QueuePool):
+            return []
+
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        gauges = {
+            "db_pool_size": ("Configured pool size", pool.size()),
+            "db_pool_checked_out": ("Connections currently checked out", pool.checkedout()),
+            "db_pool_overflow": ("Connections open beyond the pool size", max(pool.overflow(), 0)),
+            "db_pool_utilization": (
+                "Checked out connections as a fraction of pool size plus max overflow",
+                pool.checkedout() / capacity if capacity else 0.0,
+            ),
+        }
+        lines = []
+        for name, (documentation, value) in gauges.items():
+            lines += [f"# HELP {name} {documentation}", f"# TYPE {name} gauge", f"{name} {value}"]
+        return lines
+
+    def instrument_engine(self, engine: AsyncEngine) -> None:
+        """Count and time SQL statements and pool checkouts on an engine
+
+        Statements on every instrumented engine feed the same histograms; the
+        pool gauges sample the first engine instrumented (the primary).
+        """
+        if self.engine is None:
+            self.engine = engine
+        sync_engine = engine.sync_engine
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+        @event.listens_for(sync_engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+            self.query_duration.observe(elapsed)
+            stats = _request_stats.get()
+            if stats is not None:
+                stats.queries += 1
+                stats.db_seconds += elapsed
+
+        @event.listens_for(sync_engine, "handle_error")
+        def handle_error(exception_context):
+            conn = exception_context.connection
+            if conn is not None and conn.info.get("query_started_at"):
+                conn.info["query_started_at"].pop()
+
+        # Pool.connect() is what the engine calls to check out a connection;
+        # time it, including any wait for a free connection
+        pool = sync_engine.pool
+        connect = pool.connect
+
+        def timed_connect():
+            started = time.perf_counter()
+            try:
+                return connect()
+            finally:
+                self.pool_checkout_wait.observe(time.perf_counter() - started)
+
+        pool.connect = timed_connect
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and SQL usage"""
+
+    def __init__(self, app, registry: "MetricsRegistry", server_timing: bool = False):
+        self.app = app
+        self.registry = registry
+        self.server_timing = server_timing
+        self._routes: Optional[dict] = None
+
+    def _route_name(self, scope) -> str:
+        """Get the route template for a request (bounded label cardinality)"""
+        if self._routes is None:
+            self._routes = {
+                route.endpoint: route.path
+                for route in scope["app"].routes if hasattr(route, "endpoint")
+            }
+        return self._routes.get(scope.get("endpoint"), "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+                    value = (
+                        f"app;dur={elapsed_ms:.2f}, "
+                        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.queries} queries"'
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", value.encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            elapsed = time.perf_counter() - started
+            labels = (scope["method"], self._route_name(scope))
+            registry = self.registry
+            registry.requests.inc(*labels, status_code)
+            registry.request_duration.observe(elapsed, *labels)
+            registry.request_queries.observe(stats.queries, *labels)
+            registry.request_db_duration.observe(stats.db_seconds, *labels)
+
+
+# Create global metrics registry instance
+metrics = MetricsRegistry()
@@ -0,0 +1,259 @@
+"""
+Token bucket rate limiting for the API
+
+Each request takes a token from a bucket keyed by rule and identity: the
+user ID from a valid bearer token, otherwise the client IP. Buckets hold up
+to ``limit`` tokens and refill at ``limit`` per minute. Routes listed in the
+rules (login, registration, token refresh) get their own, stricter buckets;
+every other API route shares the default bucket. Rejected requests get a 429
+with ``Retry-After``.
+
+The memory backend suits a single worker. The Redis backend shares buckets
+between workers and updates them atomically in a Lua script using the
+Redis server clock. Redis errors let requests through rather than fail them.
+"""
+
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.security import get_user_id_from_token
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class RateLimitRule(NamedTuple):
+    """A bucket family: name used in keys and requests allowed per minute"""
+    name: str
+    per_minute: int
+
+
+class RateLimitDecision(NamedTuple):
+    """Outcome of taking a token from a bucket"""
+    allowed: bool
+    remaining: int
+    retry_after: float  # Seconds until a token is available (0 when allowed)
+
+
+class RateLimitBackend(ABC):
+    """Interface shared by the in-memory and Redis rate limit backends"""
+
+    @abstractmethod
+    async def acquire(self, key: str, per_minute: int) -> RateLimitDecision:
+        """Take one token from the bucket at key"""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Process-local buckets split across shards
+
+    A bucket is a [tokens, updated_at] pair. A bucket that has had time to
+    refill completely is the same as a missing one, so when a shard grows
+    past its share of max_keys its full buckets are dropped; sharding keeps
+    that sweep to a fraction of all keys.
+    """
+
+    def __init__(self, shards: int = 16, max_keys: int = 100000):
+        self.shards: list[dict[str, list]] = [{} for _ in range(shards)]
+        self.max_shard_keys = max(1, max_keys // shards)
+
+    def _sweep(self, shard: dict, now: float) -> None:
+        """Drop buckets idle long enough to be full again"""
+        # An empty bucket refills completely in one minute whatever its limit
+        for key in [key for key, (_, updated_at) in shard.items() if now - updated_at >= 60.0]:
+            del shard[key]
+        if len(shard) >= self.max_shard_keys:
+            # Still full of active clients: forget the oldest half
+            for key in sorted(shard, key=lambda key: shard[key][1])[:len(shard) // 2]:
+                del shard[key]
+
+    async def acquire(self, key: str, per_minute: int) -> RateLimitDecision:
+        now = time.monotonic()
+        rate = per_minute / 60.0
+        shard = self.shards[hash(key) % len(self.shards)]
+
+        bucket = shard.get(key)
+        if bucket is None:
+            if len(shard) >= self.max_shard_keys:
+                self._sweep(shard, now)
+            bucket = shard[key] = [float(per_minute), now]
+        else:
+            bucket[0] = min(float(per_minute), bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return RateLimitDecision(True, int(bucket[0]), 0.0)
+        return RateLimitDecision(False, 0, (1.0 - bucket[0]) / rate)
+
+
+# Take a token from a bucket hash; returns {allowed, remaining, retry_after_ms}
+ACQUIRE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = capacity / 60000
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or capacity
+local updated_at = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.ceil((1 - tokens) / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('PEXPIRE', KEYS[1], 60000)
+return {allowed, math.floor(tokens), retry_after}
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Buckets in Redis shared by all workers"""
+
+    def __init__(self, url: str, prefix: str = "tutorlms:ratelimit"):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self._acquire = self.client.register_script(ACQUIRE_SCRIPT)
+
+        # Metrics
+        self.errors = 0
+
+    async def acquire(self, key: str, per_minute: int) -> RateLimitDecision:
+        try:
+            allowed, remaining, retry_after_ms = await self._acquire(
+                keys=[f"{self.prefix}:{key}"], args=[per_minute]
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Redis rate limit check failed, allowing request: {e}")
+            return RateLimitDecision(True, per_minute, 0.0)
+        return RateLimitDecision(bool(allowed), int(remaining), retry_after_ms / 1000)
+
+
+def default_rules() -> dict[str, RateLimitRule]:
+    """Per-route rules keyed by path; other API routes use the default rule"""
+    auth = f"{settings.API_V1_STR}/auth"
+    login = RateLimitRule("login", settings.RATE_LIMIT_LOGIN_PER_MINUTE)
+    return {
+        f"{auth}/login": login,
+        f"{auth}/register": login,
+        f"{auth}/refresh": login,
+    }
+
+
+class RateLimiter:
+    """Applies rate limit rules to requests"""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        per_minute: int = settings.RATE_LIMIT_PER_MINUTE,
+        rules: Optional[dict[str, RateLimitRule]] = None,
+        prefix: str = settings.API_V1_STR
+    ):
+        self.backend = backend
+        self.default_rule = RateLimitRule("default", per_minute)
+        self.rules = default_rules() if rules is None else rules
+        self.prefix = prefix
+
+        # Metrics
+        self.allowed = 0
+        self.limited = 0
+
+    @staticmethod
+    def identity(scope) -> str:
+        """Identify the caller: user ID from a valid bearer token, else client IP"""
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    try:
+                        return f"user:{get_user_id_from_token(token)}"
+                    except HTTPException:
+                        pass
+                break
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    def rule_for(self, path: str) -> Optional[RateLimitRule]:
+        """Get the rule for a path, or None if it isn't rate limited"""
+        if not path.startswith(self.prefix):
+            return None
+        return self.rules.get(path.rstrip("/"), self.default_rule)
+
+    async def check(self, scope) -> Optional[tuple[RateLimitRule, RateLimitDecision]]:
+        """Take a token for a request; None if the path isn't rate limited"""
+        rule = self.rule_for(scope["path"])
+        if rule is None:
+            return None
+
+        decision = await self.backend.acquire(f"{rule.name}:{self.identity(scope)}", rule.per_minute)
+        if decision.allowed:
+            self.allowed += 1
+        else:
+            self.limited += 1
+        return rule, decision
+
+    def stats(self) -> dict:
+        """Get limiter metrics"""
+        return {"allowed": self.allowed, "limited": self.limited}
+
+
+class RateLimitMiddleware:
+    """ASGI middleware rejecting requests over their rate limit with 429"""
+
+    def __init__(self, app, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        result = await self.limiter.check(scope)
+        if result is None or result[1].allowed:
+            await self.app(scope, receive, send)
+            return
+
+        rule, decision = result
+        body = b'{"detail":"Rate limit exceeded"}'
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(decision.retry_after))).encode()),
+                (b"x-ratelimit-limit", str(rule.per_minute).encode()),
+                (b"x-ratelimit-remaining", b"0"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def create_rate_limiter() -> Optional[RateLimiter]:
+    """Create the limiter selected by RATE_LIMIT_BACKEND (None when disabled)"""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RateLimiter(RedisRateLimitBackend(settings.REDIS_URL))
+    if settings.RATE_LIMIT_BACKEND == "memory":
+        return RateLimiter(MemoryRateLimitBackend())
+    return None
+
+
+# Create global rate limiter instance
+rate_limiter = create_rate_limiter()
@@ -3,16 +3,26 @@ Security utilities for authentication and authorization
 """
 
 from datetime import datetime, timedelta
+import hashlib
+import time
 from typing import Optional, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.hashing import hashing_pool
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Decoded JWT payloads keyed by token digest
+token_cache = TTLCache(
+    max_size=settings.TOKEN_CACHE_SIZE,
+    default_ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash"""
     return pwd_context.verify(plain_password, hashed_password)
@@ -21,6 +31,14 @@ def get_password_hash(password: str) -> str:
     """Generate password hash"""
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a plain password against its hash without blocking the event loop"""
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash without blocking the event loop"""
+    return await hashing_pool.run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
@@ -42,10 +60,29 @@ def create_refresh_token(data: dict) -> str:
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def _decode_token(token: str) -> dict:
+    """Decode JWT token, reusing a cached payload when available"""
+    cache_key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(cache_key)
+    if payload is not None:
+        # Never serve a cached payload past the token's own expiry
+        if payload.get("exp") and payload["exp"] <= time.time():
+            token_cache.delete(cache_key)
+            raise JWTError("Signature has expired.")
+        return payload
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+    ttl = None
+    if payload.get("exp"):
+        ttl = payload["exp"] - time.time()
+    token_cache.set(cache_key, payload, ttl=ttl)
+    return payload
+
 def verify_token(token: str, token_type: str = "access") -> dict:
     """Verify and decode JWT token"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = _decode_token(token)
         
         # Check token type
         if payload.get("type") != token_type:
@@ -61,7 +98,7 @@ def verify_token(token: str, token_type: str = "access") -> dict:
                 detail="Token expired"
             )
         
-        return payload
+        return dict(payload)
         
     except JWTError:
         raise HTTPException(
@@ -0,0 +1,89 @@
+"""
+Fast JSON serialization for list and detail responses
+
+Opt-in alternative to FastAPI's default response path (response model
+validation, ``jsonable_encoder`` and ``json.dumps``): rows selected as plain
+column tuples are zipped with the schema's field names and encoded in one
+call by orjson, falling back to the standard library when it isn't
+installed. Serializers, including their Pydantic validators, are built once
+per schema and cached.
+"""
+
+import json
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Iterable, List
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode values the standard library json module doesn't handle"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as JSON bytes with the fastest available backend"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RowSerializer:
+    """Serializes SQLAlchemy rows shaped like a response schema
+
+    Select ``columns(Model)`` so each row lines up with the schema's fields;
+    rows are then encoded without building ORM objects or model instances.
+    """
+
+    def __init__(self, schema: type[BaseModel]):
+        self.schema = schema
+        self.fields = tuple(schema.model_fields)
+        self.adapter = TypeAdapter(List[schema])
+
+    def columns(self, model) -> list:
+        """Get the model columns matching the schema fields, in order"""
+        return [getattr(model, field) for field in self.fields]
+
+    def to_dicts(self, rows: Iterable[tuple]) -> list[dict]:
+        """Zip rows with the schema field names"""
+        fields = self.fields
+        return [dict(zip(fields, row)) for row in rows]
+
+    def dumps(self, rows: Iterable[tuple], validate: bool = False) -> bytes:
+        """Encode rows as a JSON array
+
+        With ``validate`` the rows go through the schema's cached validator
+        and serializer first, for data that doesn't come straight from
+        trusted columns.
+        """
+        if validate:
+            return self.adapter.dump_json(self.adapter.validate_python(self.to_dicts(rows)))
+        return dumps(self.to_dicts(rows))
+
+    def response(self, rows: Iterable[tuple], **kwargs) -> Response:
+        """Build a JSON array response from rows"""
+        return Response(content=self.dumps(rows), media_type="application/json", **kwargs)
+
+
+@lru_cache(maxsize=None)
+def get_row_serializer(schema: type[BaseModel]) -> RowSerializer:
+    """Get the cached row serializer for a response schema"""
+    return RowSerializer(schema)
@@ -0,0 +1,321 @@
+"""
+Hot state store for active test session progress
+
+Answer submissions advance a session's counters here instead of updating the
+test_sessions row every time. Changed sessions are tracked in a dirty set and
+written back to the database in coalesced batches (see
+TestSessionService.flush_dirty). Sessions being flushed are parked in an
+in-flight set until the database write commits, so after a crash they are
+requeued and written again; the writes are idempotent absolute values.
+
+Pausing or completing a session first closes its state, which atomically
+stops further answers from being applied, then copies the final counters
+onto the row.
+
+States idle for SESSION_STATE_TTL_SECONDS are dropped once written back, so
+abandoned sessions don't accumulate; they are reloaded from the database if
+they receive answers again.
+"""
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from app.core.config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+PROGRESS_FIELDS = ("answered_questions", "correct_answers", "current_question_index", "time_spent")
+STATE_FIELDS = ("user_id",) + PROGRESS_FIELDS
+
+# 1 once a status change has taken the session's final counters
+CLOSED_FIELD = "closed"
+
+
+class SessionStateUnavailable(Exception):
+    """Raised when progress can't be recorded because the store is unreachable"""
+
+
+class SessionStateStore(ABC):
+    """Interface shared by the in-memory and Redis session state stores"""
+
+    @abstractmethod
+    async def get(self, session_id: int) -> Optional[dict]:
+        """Get a session's hot state, or None if it isn't loaded"""
+
+    @abstractmethod
+    async def get_many(self, session_ids: list[int]) -> dict[int, dict]:
+        """Get the hot states of the loaded sessions among session_ids"""
+
+    @abstractmethod
+    async def seed(self, session_id: int, state: dict) -> dict:
+        """Load a session's state unless already present; returns the current state"""
+
+    @abstractmethod
+    async def apply(self, session_id: int, answered: int, correct: int, time_spent: int) -> Optional[dict]:
+        """Advance a loaded session's counters and mark it dirty; None if not loaded or closed"""
+
+    @abstractmethod
+    async def close(self, session_id: int) -> Optional[dict]:
+        """Stop a session's counters from changing; returns its final state, or None if not loaded"""
+
+    @abstractmethod
+    async def reopen(self, session_id: int) -> None:
+        """Let a closed session's counters change again after its status change failed"""
+
+    @abstractmethod
+    async def drain(self, limit: int) -> list[tuple[int, dict]]:
+        """Move up to limit dirty sessions in flight and return their states"""
+
+    @abstractmethod
+    async def ack(self, session_ids: list[int]) -> None:
+        """Mark in-flight sessions as durably written"""
+
+    @abstractmethod
+    async def requeue_in_flight(self) -> None:
+        """Mark sessions left in flight by a crashed flush as dirty again"""
+
+    @abstractmethod
+    async def remove(self, session_id: int) -> None:
+        """Drop a session's hot state"""
+
+
+class MemorySessionStateStore(SessionStateStore):
+    """Process-local store for tests and single worker deployments
+
+    State does not survive a process restart. Flushed states untouched for
+    ttl_seconds are evicted when the store is drained.
+    """
+
+    def __init__(self, ttl_seconds: float = settings.SESSION_STATE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.states: dict[int, dict] = {}
+        self.touched: dict[int, float] = {}
+        self.dirty: set[int] = set()
+        self.in_flight: set[int] = set()
+
+    async def get(self, session_id: int) -> Optional[dict]:
+        state = self.states.get(session_id)
+        return dict(state) if state else None
+
+    async def get_many(self, session_ids: list[int]) -> dict[int, dict]:
+        return {
+            session_id: dict(self.states[session_id]) for session_id in session_ids if session_id in self.states
+        }
+
+    async def seed(self, session_id: int, state: dict) -> dict:
+        current = self.states.setdefault(
+            session_id, {**{field: state[field] for field in STATE_FIELDS}, CLOSED_FIELD: 0}
+        )
+        self.touched[session_id] = time.monotonic()
+        return dict(current)
+
+    async def apply(self, session_id: int, answered: int, correct: int, time_spent: int) -> Optional[dict]:
+        state = self.states.get(session_id)
+        if state is None or state[CLOSED_FIELD]:
+            return None
+
+        state["answered_questions"] += answered
+        state["correct_answers"] += correct
+        state["current_question_index"] += answered
+        state["time_spent"] += time_spent
+        self.dirty.add(session_id)
+        self.touched[session_id] = time.monotonic()
+        return dict(state)
+
+    async def close(self, session_id: int) -> Optional[dict]:
+        state = self.states.get(session_id)
+        if state is None:
+            return None
+
+        state[CLOSED_FIELD] = 1
+        return dict(state)
+
+    async def reopen(self, session_id: int) -> None:
+        state = self.states.get(session_id)
+        if state is not None:
+            state[CLOSED_FIELD] = 0
+
+    async def drain(self, limit: int) -> list[tuple[int, dict]]:
+        drained = []
+        while self.dirty and len(drained) < limit:
+            session_id = self.dirty.pop()
+            state = self.states.get(session_id)
+            if state is not None:
+                self.in_flight.add(session_id)
+                drained.append((session_id, dict(state)))
+        if not drained:
+            self._evict_idle()
+        return drained
+
+    def _evict_idle(self) -> None:
+        """Drop written-back states untouched for longer than the TTL"""
+        cutoff = time.monotonic() - self.ttl_seconds
+        idle = [
+            session_id for session_id, touched in self.touched.items()
+            if touched < cutoff and session_id not in self.dirty and session_id not in self.in_flight
+        ]
+        for session_id in idle:
+            self.states.pop(session_id, None)
+            self.touched.pop(session_id, None)
+
+    async def ack(self, session_ids: list[int]) -> None:
+        self.in_flight.difference_update(session_ids)
+
+    async def requeue_in_flight(self) -> None:
+        self.dirty |= self.in_flight
+        self.in_flight.clear()
+
+    async def remove(self, session_id: int) -> None:
+        self.states.pop(session_id, None)
+        self.touched.pop(session_id, None)
+        self.dirty.discard(session_id)
+        self.in_flight.discard(session_id)
+
+
+# Seed a session hash unless it exists; returns the stored fields
+SEED_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+end
+redis.call('PEXPIRE', KEYS[1], ARGV[1])
+return redis.call('HMGET', KEYS[1], 'user_id', 'answered_questions', 'correct_answers', 'current_question_index', 'time_spent', 'closed')
+"""
+
+# Advance counters of an existing, open session hash and mark it dirty
+APPLY_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 or redis.call('HGET', KEYS[1], 'closed') == '1' then
+    return nil
+end
+redis.call('HINCRBY', KEYS[1], 'answered_questions', ARGV[2])
+redis.call('HINCRBY', KEYS[1], 'correct_answers', ARGV[3])
+redis.call('HINCRBY', KEYS[1], 'current_question_index', ARGV[2])
+redis.call('HINCRBY', KEYS[1], 'time_spent', ARGV[4])
+redis.call('PEXPIRE', KEYS[1], ARGV[5])
+redis.call('SADD', KEYS[2], ARGV[1])
+return redis.call('HMGET', KEYS[1], 'user_id', 'answered_questions', 'correct_answers', 'current_question_index', 'time_spent', 'closed')
+"""
+
+# Set the closed flag of an existing session hash; returns the stored fields
+CLOSE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+redis.call('HSET', KEYS[1], 'closed', ARGV[1])
+return redis.call('HMGET', KEYS[1], 'user_id', 'answered_questions', 'correct_answers', 'current_question_index', 'time_spent', 'closed')
+"""
+
+# Pop dirty session ids into the in-flight set and return their states;
+# ids whose hash has expired are dropped. Builds session keys inside the
+# script, so it assumes a single Redis node.
+DRAIN_SCRIPT = """
+local ids = redis.call('SPOP', KEYS[1], ARGV[1])
+local result = {}
+for _, id in ipairs(ids) do
+    local state = redis.call('HMGET', ARGV[2] .. id, 'user_id', 'answered_questions', 'correct_answers', 'current_question_index', 'time_spent', 'closed')
+    if state[1] then
+        redis.call('SADD', KEYS[2], id)
+        table.insert(result, {id, state[1], state[2], state[3], state[4], state[5], state[6]})
+    end
+end
+return result
+"""
+
+
+def _to_state(values) -> Optional[dict]:
+    if not values or values[0] is None:
+        return None
+    # Hashes seeded before the closed flag existed have no value for it
+    return {field: int(value or 0) for field, value in zip(STATE_FIELDS + (CLOSED_FIELD,), values)}
+
+
+class RedisSessionStateStore(SessionStateStore):
+    """Redis store shared by all workers; durable as far as Redis persistence is configured"""
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "tutorlms:session",
+        ttl_seconds: int = settings.SESSION_STATE_TTL_SECONDS
+    ):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.ttl_ms = ttl_seconds * 1000
+        self.dirty_key = f"{prefix}:dirty"
+        self.in_flight_key = f"{prefix}:in_flight"
+        self._seed = self.client.register_script(SEED_SCRIPT)
+        self._apply = self.client.register_script(APPLY_SCRIPT)
+        self._drain = self.client.register_script(DRAIN_SCRIPT)
+        self._close = self.client.register_script(CLOSE_SCRIPT)
+
+    def _key(self, session_id: int) -> str:
+        return f"{self.prefix}:state:{session_id}"
+
+    async def get(self, session_id: int) -> Optional[dict]:
+        return _to_state(await self.client.hmget(self._key(session_id), *STATE_FIELDS, CLOSED_FIELD))
+
+    async def get_many(self, session_ids: list[int]) -> dict[int, dict]:
+        async with self.client.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.hmget(self._key(session_id), *STATE_FIELDS, CLOSED_FIELD)
+            results = await pipe.execute()
+        states = {session_id: _to_state(values) for session_id, values in zip(session_ids, results)}
+        return {session_id: state for session_id, state in states.items() if state is not None}
+
+    async def seed(self, session_id: int, state: dict) -> dict:
+        fields = [item for field in STATE_FIELDS for item in (field, int(state[field]))] + [CLOSED_FIELD, 0]
+        return _to_state(await self._seed(keys=[self._key(session_id)], args=[self.ttl_ms, *fields]))
+
+    async def apply(self, session_id: int, answered: int, correct: int, time_spent: int) -> Optional[dict]:
+        values = await self._apply(
+            keys=[self._key(session_id), self.dirty_key],
+            args=[session_id, answered, correct, time_spent, self.ttl_ms]
+        )
+        return _to_state(values)
+
+    async def close(self, session_id: int) -> Optional[dict]:
+        return _to_state(await self._close(keys=[self._key(session_id)], args=[1]))
+
+    async def reopen(self, session_id: int) -> None:
+        await self._close(keys=[self._key(session_id)], args=[0])
+
+    async def drain(self, limit: int) -> list[tuple[int, dict]]:
+        rows = await self._drain(
+            keys=[self.dirty_key, self.in_flight_key],
+            args=[limit, f"{self.prefix}:state:"]
+        )
+        return [(int(row[0]), _to_state(row[1:])) for row in rows]
+
+    async def ack(self, session_ids: list[int]) -> None:
+        if session_ids:
+            await self.client.srem(self.in_flight_key, *session_ids)
+
+    async def requeue_in_flight(self) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.sunionstore(self.dirty_key, [self.dirty_key, self.in_flight_key])
+            pipe.delete(self.in_flight_key)
+            await pipe.execute()
+
+    async def remove(self, session_id: int) -> None:
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.delete(self._key(session_id))
+            pipe.srem(self.dirty_key, session_id)
+            pipe.srem(self.in_flight_key, session_id)
+            await pipe.execute()
+
+
+def create_session_state_store() -> Optional[SessionStateStore]:
+    """Create the store selected by SESSION_STATE_BACKEND (None when disabled)"""
+    if settings.SESSION_STATE_BACKEND == "redis":
+        return RedisSessionStateStore(settings.REDIS_URL)
+    if settings.SESSION_STATE_BACKEND == "memory":
+        return MemorySessionStateStore()
+    return None
+
+
+# Create global session state store instance
+session_state_store = create_session_state_store()
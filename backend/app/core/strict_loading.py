@@ -0,0 +1,76 @@
+"""
+Strict ORM loading mode and N+1 query detection
+
+In strict mode every ORM query gets ``raiseload("*")``, so touching a
+relationship that the repository did not load explicitly (selectinload or
+joinedload) raises at once instead of emitting one query per row, or failing
+under AsyncSession with MissingGreenlet far from the cause. StatementAuditMiddleware
+counts the SQL statements each request runs and logs any statement repeated
+N_PLUS_ONE_THRESHOLD times or more as a suspected N+1.
+"""
+
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session, raiseload
+
+from app.core.config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Characters of a repeated statement included in the warning
+STATEMENT_PREVIEW_LENGTH = 300
+
+_statement_counts: ContextVar[Optional[Counter]] = ContextVar("statement_counts", default=None)
+
+
+def _raise_on_implicit_load(orm_execute_state) -> None:
+    """Make relationships not loaded by the statement's own options raise"""
+    # Relationship loads are the selectinload/lazy queries themselves
+    if orm_execute_state.is_select and not orm_execute_state.is_relationship_load:
+        orm_execute_state.statement = orm_execute_state.statement.options(raiseload("*"))
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    counts = _statement_counts.get()
+    if counts is not None:
+        counts[statement] += 1
+
+
+def enable_strict_loading(engine: AsyncEngine) -> None:
+    """Raise on implicit relationship loads and count statements per request"""
+    if not event.contains(Session, "do_orm_execute", _raise_on_implicit_load):
+        event.listen(Session, "do_orm_execute", _raise_on_implicit_load)
+    if not event.contains(engine.sync_engine, "before_cursor_execute", _count_statement):
+        event.listen(engine.sync_engine, "before_cursor_execute", _count_statement)
+
+
+class StatementAuditMiddleware:
+    """ASGI middleware logging statements a request runs repeatedly"""
+
+    def __init__(self, app, threshold: int = settings.N_PLUS_ONE_THRESHOLD):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        counts = Counter()
+        token = _statement_counts.set(counts)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _statement_counts.reset(token)
+            for statement, count in counts.items():
+                if count >= self.threshold:
+                    logger.warning(
+                        f"Suspected N+1 in {scope['method']} {scope['path']}: statement ran {count} times: "
+                        f"{' '.join(statement.split())[:STATEMENT_PREVIEW_LENGTH]}"
+                    )
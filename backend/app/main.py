@@ -4,11 +4,35 @@ TutorLMS FastAPI Application Entry Point
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from fastapi.responses import PlainTextResponse
+from contextlib import asynccontextmanager, contextmanager
+import asyncio
 import logging
+import time
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import (
+    check_db_schema,
+    close_db,
+    AsyncSessionLocal,
+    engine,
+    read_session,
+    replica_engine,
+)
+from app.core.hashing import hashing_pool
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.rate_limit import RateLimitMiddleware, rate_limiter
+from app.core.strict_loading import StatementAuditMiddleware, enable_strict_loading
+from app.services.last_login_writer import last_login_writer
+from app.services.question_catalog import question_catalog
+from app.services.question_import import shutdown_import_executor
+from app.services.question_search import question_search_index
+from app.services.score_distribution import score_distributions
+from app.services.test_session_service import (
+    flush_session_states,
+    replay_session_states,
+    run_session_state_flush_loop,
+)
 from app.api.v1.api import api_router
 
 # Configure logging
@@ -16,18 +40,83 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@contextmanager
+def _timed(timings: dict, step: str):
+    """Record how long a startup step takes, in milliseconds"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[step] = round((time.perf_counter() - started) * 1000, 1)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan management"""
     # Startup
     logger.info("Starting TutorLMS application...")
-    await init_db()
-    logger.info("Database initialized")
+    started = time.perf_counter()
+    timings = {}
+    if settings.DB_SCHEMA_CHECK:
+        with _timed(timings, "schema_check"):
+            await check_db_schema()
+    with _timed(timings, "session_state_replay"):
+        await replay_session_states(AsyncSessionLocal)
+    with _timed(timings, "background_tasks"):
+        catalog_task = asyncio.create_task(
+            question_catalog.run_refresh_loop(read_session, settings.QUESTION_CATALOG_REFRESH_SECONDS)
+        )
+        # Read from the primary so a lagging replica can't roll back recorded scores
+        distribution_task = asyncio.create_task(
+            score_distributions.run_refresh_loop(AsyncSessionLocal, settings.SCORE_DISTRIBUTION_REFRESH_SECONDS)
+        )
+        # PostgreSQL searches its tsvector column instead of the in-process index
+        search_task = None
+        if engine.dialect.name != "postgresql":
+            search_task = asyncio.create_task(
+                question_search_index.run_refresh_loop(read_session, settings.QUESTION_SEARCH_REFRESH_SECONDS)
+            )
+        flush_task = asyncio.create_task(
+            run_session_state_flush_loop(AsyncSessionLocal, settings.SESSION_STATE_FLUSH_SECONDS)
+        )
+        login_task = asyncio.create_task(
+            last_login_writer.run_flush_loop(AsyncSessionLocal, settings.LAST_LOGIN_FLUSH_SECONDS)
+        )
+    
+    # Startup report
+    app.state.startup_report = {
+        "total_ms": round((time.perf_counter() - started) * 1000, 1),
+        "steps_ms": timings,
+    }
+    logger.info(
+        f"Started in {app.state.startup_report['total_ms']} ms "
+        f"({', '.join(f'{step}={ms} ms' for step, ms in timings.items())})"
+    )
     
     yield
     
     # Shutdown
     logger.info("Shutting down TutorLMS application...")
+    background_tasks = [
+        task for task in (catalog_task, distribution_task, search_task, flush_task, login_task) if task is not None
+    ]
+    for task in background_tasks:
+        task.cancel()
+    # Let cancelled writers requeue what they were flushing before the final
+    # flush, and refresh loops release their sessions before close_db()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    try:
+        await last_login_writer.flush(AsyncSessionLocal)
+    except Exception as e:
+        logger.error(f"Final last login flush failed: {e}")
+    try:
+        await flush_session_states(AsyncSessionLocal)
+    except Exception as e:
+        # Progress stays in the store and is replayed on the next start
+        logger.error(f"Final session state flush failed: {e}")
+    hashing_pool.shutdown()
+    shutdown_import_executor()
+    await close_db()
 
 
 def create_application() -> FastAPI:
@@ -42,6 +131,10 @@ def create_application() -> FastAPI:
         lifespan=lifespan,
     )
 
+    # Rate limit API requests (inside CORS so 429 responses carry CORS headers)
+    if rate_limiter is not None:
+        app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
     # Configure CORS
     app.add_middleware(
         CORSMiddleware,
@@ -51,6 +144,20 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Raise on implicit relationship loads and log suspected N+1 queries
+    if settings.ORM_STRICT_LOADING:
+        enable_strict_loading(engine)
+        if replica_engine is not None:
+            enable_strict_loading(replica_engine)
+        app.add_middleware(StatementAuditMiddleware, threshold=settings.N_PLUS_ONE_THRESHOLD)
+
+    # Record per-route latency and SQL usage
+    if settings.METRICS_ENABLED or settings.SERVER_TIMING_ENABLED:
+        metrics.instrument_engine(engine)
+        if replica_engine is not None:
+            metrics.instrument_engine(replica_engine)
+        app.add_middleware(MetricsMiddleware, registry=metrics, server_timing=settings.SERVER_TIMING_ENABLED)
+
     # Include API routes
     app.include_router(api_router, prefix="/api/v1")
 
@@ -60,6 +167,13 @@ def create_application() -> FastAPI:
         """Health check endpoint"""
         return {"status": "healthy", "service": "TutorLMS API"}
 
+    if settings.METRICS_ENABLED:
+        # Prometheus scrape endpoint
+        @app.get("/metrics", include_in_schema=False)
+        async def metrics_endpoint():
+            """Metrics in Prometheus text exposition format"""
+            return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
     return app
 
 
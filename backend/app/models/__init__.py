@@ -4,5 +4,7 @@ from app.models.user import User
 from app.models.question import Question
 from app.models.test_session import TestSession
 from app.models.answer import Answer
+from app.models.user_stats import UserStatistics
+from app.models.score_distribution import ScoreDistribution
 
-__all__ = ["User", "Question", "TestSession", "Answer"]
+__all__ = ["User", "Question", "TestSession", "Answer", "UserStatistics", "ScoreDistribution"]
@@ -2,11 +2,11 @@
 Answer model for storing user responses to questions
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
-from app.core.database import Base
+from app.core.database import Base, JSONDocument
 
 class Answer(Base):
     """Answer model for storing user responses to questions"""
@@ -19,7 +19,7 @@ class Answer(Base):
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False, index=True)
     
     # Answer content
-    user_answer = Column(JSON, nullable=False)  # Store answer as JSON for flexibility
+    user_answer = Column(JSONDocument, nullable=False)  # Store answer as JSON for flexibility
     is_correct = Column(Boolean, nullable=False)
     
     # Timing and metadata
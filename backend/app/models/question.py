@@ -2,12 +2,13 @@
 Question model for storing SAT questions and content
 """
 
-from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, JSONDocument
+from app.core.grading import AnswerKey, compile_answer_key
 
 class QuestionType(str, enum.Enum):
     """Question types enumeration"""
@@ -32,11 +33,16 @@ class Question(Base):
     """Question model for storing SAT questions"""
     
     __tablename__ = "questions"
+    __table_args__ = (
+        # Serves tag containment queries (tags @> '["..."]'); JSONB only
+        Index("ix_questions_tags", "tags", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
+    external_id = Column(String(100), unique=True, nullable=True)  # Stable ID from the source question bank
     
     # Content stored as JSON for flexibility
-    content = Column(JSON, nullable=False)
+    content = Column(JSONDocument, nullable=False)
     
     # Question metadata
     question_type = Column(Enum(QuestionType), nullable=False)
@@ -45,9 +51,14 @@ class Question(Base):
     topic = Column(String(100), nullable=False, index=True)
     
     # Additional metadata
-    tags = Column(JSON, nullable=True)  # Array of skill tags
+    tags = Column(JSONDocument, nullable=True)  # Array of skill tags
     estimated_time = Column(Integer, nullable=True)  # In seconds
     
+    # Item response theory (3PL) parameters; derived from difficulty_level when unset
+    irt_discrimination = Column(Float, nullable=True)  # a
+    irt_difficulty = Column(Float, nullable=True)  # b
+    irt_guessing = Column(Float, nullable=True)  # c
+    
     # Admin fields
     created_by = Column(Integer, nullable=True)  # User ID of creator
     is_active = Column(Integer, default=True, nullable=False)
@@ -84,14 +95,9 @@ class Question(Base):
     
     def is_correct_answer(self, user_answer: str) -> bool:
         """Check if user's answer is correct"""
-        if self.question_type == QuestionType.MULTIPLE_CHOICE:
-            return user_answer.strip().upper() == self.correct_answer.strip().upper()
-        elif self.question_type == QuestionType.GRID_IN:
-            # For grid-in questions, compare numeric values
-            try:
-                return float(user_answer) == float(self.correct_answer)
-            except (ValueError, TypeError):
-                return user_answer.strip() == self.correct_answer.strip()
-        else:
-            # For essay questions, manual grading is required
-            return False
+        return self.answer_key.grade(user_answer)
+    
+    @property
+    def answer_key(self) -> AnswerKey:
+        """Get the precompiled answer key for this question"""
+        return compile_answer_key(self.question_type, self.content.get("correct_answer"))
@@ -0,0 +1,28 @@
+"""
+Score distribution model for percentile ranking
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Enum
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+from app.models.test_session import SessionType
+
+# Section name of a session's total score
+TOTAL_SECTION = "total"
+
+class ScoreDistribution(Base):
+    """Histogram bucket: how many completed sessions of a type scored a given score in a section"""
+    
+    __tablename__ = "score_distributions"
+    
+    session_type = Column(Enum(SessionType), primary_key=True)
+    section = Column(String(50), primary_key=True)  # TOTAL_SECTION or a section_scores key
+    score = Column(Integer, primary_key=True)
+    count = Column(Integer, default=0, nullable=False)
+    
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<ScoreDistribution(type='{self.session_type}', section='{self.section}', score={self.score}, count={self.count})>"
@@ -7,7 +7,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, JSONDocument
 
 class SessionType(str, enum.Enum):
     """Test session types enumeration"""
@@ -36,7 +36,7 @@ class TestSession(Base):
     status = Column(Enum(SessionStatus), default=SessionStatus.ACTIVE, nullable=False)
     
     # Session metadata
-    configuration = Column(JSON, nullable=True)  # Test configuration and settings
+    configuration = Column(JSONDocument, nullable=True)  # Test configuration and settings
     
     # Timing
     started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -66,7 +66,7 @@ class TestSession(Base):
     
     # Relationships
     user = relationship("User", back_populates="test_sessions")
-    answers = relationship("Answer", back_populates="test_session", cascade="all, delete-orphan")
+    answers = relationship("Answer", back_populates="test_session", cascade="all, delete-orphan", order_by="Answer.id")
     
     def __repr__(self) -> str:
         return f"<TestSession(id={self.id}, user_id={self.user_id}, type='{self.session_type}', status='{self.status}')>"
@@ -2,7 +2,7 @@
 User model for authentication and user management
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -19,6 +19,10 @@ class User(Base):
     """User model for storing user information"""
     
     __tablename__ = "users"
+    __table_args__ = (
+        # Supports keyset pagination of (active) user listings
+        Index("ix_users_is_active_created_at_id", "is_active", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
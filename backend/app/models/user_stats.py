@@ -0,0 +1,60 @@
+"""
+User statistics rollup model
+"""
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+class UserStatistics(Base):
+    """Per-user statistics maintained incrementally as answers and sessions are recorded"""
+    
+    __tablename__ = "user_stats"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Session counters
+    total_sessions = Column(Integer, default=0, nullable=False)
+    completed_sessions = Column(Integer, default=0, nullable=False)
+    
+    # Answer counters
+    total_answers = Column(Integer, default=0, nullable=False)
+    correct_answers = Column(Integer, default=0, nullable=False)
+    total_time_spent = Column(Integer, default=0, nullable=False)  # In seconds
+    
+    # Scoring
+    best_score = Column(Integer, nullable=True)
+    recent_scores = Column(JSON, nullable=True)  # Most recent completed session scores, oldest first
+    
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    def __repr__(self) -> str:
+        return f"<UserStatistics(user_id={self.user_id}, sessions={self.total_sessions}, answers={self.total_answers})>"
+    
+    @property
+    def average_accuracy(self) -> float:
+        """Calculate accuracy percentage across all answers"""
+        if self.total_answers == 0:
+            return 0.0
+        return (self.correct_answers / self.total_answers) * 100
+    
+    @property
+    def improvement_trend(self) -> str:
+        """Compare the newer and older halves of the recent score window"""
+        scores = self.recent_scores or []
+        if len(scores) < 2:
+            return "stable"
+        
+        half = len(scores) // 2
+        older = sum(scores[:half]) / half
+        newer = sum(scores[-half:]) / half
+        
+        # Ignore differences under 2% of the older average
+        threshold = max(abs(older) * 0.02, 1)
+        if newer - older > threshold:
+            return "improving"
+        if older - newer > threshold:
+            return "declining"
+        return "stable"
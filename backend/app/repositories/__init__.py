@@ -1,5 +1,12 @@
 """Repository layer for data access"""
 
 from app.repositories.user_repository import UserRepository
+from app.repositories.user_stats_repository import UserStatsRepository
+from app.repositories.test_session_repository import TestSessionRepository
+from app.repositories.answer_repository import AnswerRepository
+from app.repositories.question_repository import QuestionRepository
 
-__all__ = ["UserRepository"]
+__all__ = [
+    "UserRepository", "UserStatsRepository", "TestSessionRepository",
+    "AnswerRepository", "QuestionRepository"
+]
@@ -0,0 +1,84 @@
+"""
+Answer repository for database operations
+"""
+
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, select
+
+from app.models.answer import Answer
+from app.models.test_session import TestSession, SessionType
+
+# Rows per multi-row INSERT; keeps bind parameters well under driver limits
+INSERT_CHUNK_SIZE = 1000
+
+# Rows fetched per round trip from the server-side cursor when exporting
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    Answer.id,
+    Answer.user_id,
+    Answer.test_session_id,
+    TestSession.session_type,
+    Answer.question_id,
+    Answer.user_answer,
+    Answer.is_correct,
+    Answer.time_spent,
+    Answer.attempt_number,
+    Answer.confidence_level,
+    Answer.flagged_for_review,
+    Answer.skipped,
+    Answer.points_earned,
+    Answer.difficulty_at_time,
+    Answer.answered_at,
+]
+
+class AnswerRepository:
+    """Repository for Answer model database operations"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def bulk_create(self, rows: list[dict]) -> None:
+        """Insert answers with multi-row INSERT statements (does not commit)"""
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            chunk = rows[start:start + INSERT_CHUNK_SIZE]
+            await self.db.execute(insert(Answer).values(chunk))
+    
+    async def get_session_outcomes(self, session_id: int) -> list:
+        """Get (question_id, is_correct) for a session's answers in answer order"""
+        result = await self.db.execute(
+            select(Answer.question_id, Answer.is_correct)
+            .where(Answer.test_session_id == session_id, Answer.skipped == False)
+            .order_by(Answer.answered_at, Answer.id)
+        )
+        return result.all()
+    
+    async def stream_export(
+        self,
+        user_ids: Optional[list[int]] = None,
+        session_type: Optional[SessionType] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> AsyncIterator[list]:
+        """Stream answers for export in chunks of rows from a server-side cursor
+        
+        Filters by user, session type and an answered_at window [since, until).
+        Rows carry the columns of EXPORT_COLUMNS, ordered by answer ID.
+        """
+        query = select(*EXPORT_COLUMNS).join(TestSession, Answer.test_session_id == TestSession.id)
+        if user_ids:
+            query = query.where(Answer.user_id.in_(user_ids))
+        if session_type is not None:
+            query = query.where(TestSession.session_type == session_type)
+        if since is not None:
+            query = query.where(Answer.answered_at >= since)
+        if until is not None:
+            query = query.where(Answer.answered_at < until)
+        
+        result = await self.db.stream(
+            query.order_by(Answer.id).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        async for rows in result.partitions():
+            yield rows
@@ -0,0 +1,180 @@
+"""
+Question repository for database operations
+"""
+
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Float, and_, exists, literal_column, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+from app.core.database import dialect_insert
+from app.models.question import DifficultyLevel, Question, Subject
+
+# Columns an import may set; created_by is only written on insert
+IMPORT_COLUMNS = (
+    "content",
+    "question_type",
+    "difficulty_level",
+    "subject",
+    "topic",
+    "tags",
+    "estimated_time",
+    "irt_discrimination",
+    "irt_difficulty",
+    "irt_guessing",
+    "is_active",
+)
+
+class QuestionRepository:
+    """Repository for Question model database operations"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_by_id(self, question_id: int) -> Optional[Question]:
+        """Get question by ID"""
+        result = await self.db.execute(
+            select(Question).where(Question.id == question_id)
+        )
+        return result.scalar_one_or_none()
+    
+    async def get_by_ids(self, question_ids: list[int]) -> list[Question]:
+        """Get questions by IDs"""
+        result = await self.db.execute(
+            select(Question).where(Question.id.in_(question_ids))
+        )
+        return result.scalars().all()
+    
+    def _has_tags(self, tags: list[str]):
+        """Condition matching questions tagged with every one of tags"""
+        if self.db.bind.dialect.name == "postgresql":
+            # JSONB containment, answered by the GIN index on tags
+            return type_coerce(Question.tags, JSONB).contains(tags)
+        
+        conditions = []
+        for tag in tags:
+            elements = func.json_each(Question.tags).table_valued("value")
+            conditions.append(exists(select(1).select_from(elements).where(elements.c.value == tag)))
+        return and_(True, *conditions)
+    
+    async def get_by_tags(
+        self,
+        tags: list[str],
+        subject: Optional[Subject] = None,
+        difficulty_level: Optional[DifficultyLevel] = None,
+        topic: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> list[Question]:
+        """Get active questions tagged with all of tags, optionally narrowed by subject, difficulty and topic"""
+        query = select(Question).where(Question.is_active == 1, self._has_tags(tags))
+        if subject is not None:
+            query = query.where(Question.subject == subject)
+        if difficulty_level is not None:
+            query = query.where(Question.difficulty_level == difficulty_level)
+        if topic is not None:
+            query = query.where(Question.topic == topic)
+        
+        result = await self.db.execute(query.order_by(Question.id).offset(skip).limit(limit))
+        return result.scalars().all()
+    
+    async def get_catalog_rows(self, updated_since: Optional[datetime] = None) -> list:
+        """Get the columns the question catalog indexes, optionally only rows changed since a time
+        
+        A full load only returns active questions; an incremental load also
+        returns deactivated ones so the catalog can drop them.
+        """
+        query = select(
+            Question.id,
+            Question.question_type,
+            Question.subject,
+            Question.difficulty_level,
+            Question.topic,
+            Question.tags,
+            Question.estimated_time,
+            Question.irt_discrimination,
+            Question.irt_difficulty,
+            Question.irt_guessing,
+            Question.is_active,
+            Question.updated_at,
+        )
+        if updated_since is None:
+            query = query.where(Question.is_active == 1)
+        else:
+            query = query.where(Question.updated_at >= updated_since)
+        
+        result = await self.db.execute(query.order_by(Question.updated_at, Question.id))
+        return result.all()
+    
+    async def get_search_rows(self, updated_since: Optional[datetime] = None) -> list:
+        """Get the searchable text of questions, optionally only rows changed since a time
+        
+        Like get_catalog_rows, an incremental load also returns deactivated
+        questions so the in-process search index can drop them.
+        """
+        query = select(
+            Question.id,
+            Question.subject,
+            Question.difficulty_level,
+            Question.content["question_text"].as_string().label("question_text"),
+            Question.content["explanation"].as_string().label("explanation"),
+            Question.is_active,
+            Question.updated_at,
+        )
+        if updated_since is None:
+            query = query.where(Question.is_active == 1)
+        else:
+            query = query.where(Question.updated_at >= updated_since)
+        
+        result = await self.db.execute(query.order_by(Question.updated_at, Question.id))
+        return result.all()
+    
+    async def search_full_text(
+        self,
+        text: str,
+        subject: Optional[Subject] = None,
+        difficulty_level: Optional[DifficultyLevel] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> list[tuple[Question, float]]:
+        """Rank active questions against a web-style search query (PostgreSQL only)
+        
+        Matches the ``search_vector`` generated column added by migration
+        0004 (question text weighted above explanation) through its GIN
+        index, best matches first.
+        """
+        search_vector = literal_column("questions.search_vector")
+        ts_query = func.websearch_to_tsquery("english", text)
+        rank = func.ts_rank_cd(search_vector, ts_query, type_=Float).label("rank")
+        
+        query = select(Question, rank).where(Question.is_active == 1, search_vector.bool_op("@@")(ts_query))
+        if subject is not None:
+            query = query.where(Question.subject == subject)
+        if difficulty_level is not None:
+            query = query.where(Question.difficulty_level == difficulty_level)
+        
+        result = await self.db.execute(query.order_by(rank.desc(), Question.id).offset(skip).limit(limit))
+        return [(question, rank) for question, rank in result.all()]
+    
+    async def upsert_by_external_id(self, rows: list[dict]) -> None:
+        """Insert or update a batch of questions keyed on external_id (does not commit)
+        
+        Rows need external_id, created_by and the IMPORT_COLUMNS; later rows
+        win when an external_id repeats. The batch is passed as executemany
+        parameters to one cached statement, which SQLAlchemy sends as
+        multi-row INSERT ... ON CONFLICT statements ("insertmanyvalues")
+        without compiling a fresh VALUES clause per batch.
+        """
+        rows = list({row["external_id"]: row for row in rows}.values())
+        if not rows:
+            return
+        
+        insert = dialect_insert(self.db)
+        stmt = insert(Question)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Question.external_id],
+            set_={column: stmt.excluded[column] for column in IMPORT_COLUMNS} | {"updated_at": func.now()}
+        )
+        await self.db.execute(stmt, rows)
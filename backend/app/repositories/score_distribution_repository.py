@@ -0,0 +1,99 @@
+"""
+Score distribution repository for maintaining score histograms
+"""
+
+from collections import Counter
+from typing import Any, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, text
+from sqlalchemy.sql import func
+
+from app.core.database import dialect_insert
+from app.models.score_distribution import ScoreDistribution, TOTAL_SECTION
+from app.models.test_session import TestSession, SessionStatus, SessionType
+
+def session_scores(total_score: Optional[int], section_scores: Optional[dict[str, Any]]) -> dict[str, int]:
+    """Get a session's scores by histogram section, skipping missing and non-numeric scores"""
+    scores = {
+        section: int(score)
+        for section, score in (section_scores or {}).items()
+        if isinstance(score, (int, float)) and not isinstance(score, bool)
+    }
+    if total_score is not None:
+        scores[TOTAL_SECTION] = total_score
+    return scores
+
+class ScoreDistributionRepository:
+    """Repository for ScoreDistribution histogram operations
+
+    record_scores adds to the caller's transaction and does not commit, so a
+    session is counted together with its completion.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_all(self) -> list:
+        """Get every histogram bucket as (session_type, section, score, count) rows"""
+        result = await self.db.execute(
+            select(
+                ScoreDistribution.session_type,
+                ScoreDistribution.section,
+                ScoreDistribution.score,
+                ScoreDistribution.count,
+            )
+            .where(ScoreDistribution.count > 0)
+            .order_by(ScoreDistribution.session_type, ScoreDistribution.section, ScoreDistribution.score)
+        )
+        return result.all()
+
+    async def record_scores(self, session_type: SessionType, scores: dict[str, int]) -> None:
+        """Count one completed session's scores in the histograms of its type"""
+        if not scores:
+            return
+
+        insert = dialect_insert(self.db)
+        stmt = insert(ScoreDistribution)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ScoreDistribution.session_type, ScoreDistribution.section, ScoreDistribution.score],
+            set_={"count": ScoreDistribution.count + stmt.excluded.count, "updated_at": func.now()}
+        )
+        # Sorted so concurrent completions lock buckets in the same order
+        await self.db.execute(stmt, [
+            {"session_type": session_type, "section": section, "score": score, "count": 1}
+            for section, score in sorted(scores.items())
+        ])
+
+    async def rebuild_all(self) -> int:
+        """Rebuild every histogram from completed test sessions in bulk; returns buckets written
+
+        Completions are held off for the whole rebuild, so none can commit
+        between reading the sessions and replacing the buckets and be lost.
+        On PostgreSQL the table is locked against writes (readers still see
+        the old buckets until commit); elsewhere deleting the buckets first
+        takes the database write lock.
+        """
+        if self.db.bind.dialect.name == "postgresql":
+            await self.db.execute(text(f"LOCK TABLE {ScoreDistribution.__tablename__} IN EXCLUSIVE MODE"))
+        await self.db.execute(delete(ScoreDistribution))
+
+        counts: Counter = Counter()
+        result = await self.db.stream(
+            select(TestSession.session_type, TestSession.total_score, TestSession.section_scores)
+            .where(TestSession.status == SessionStatus.COMPLETED)
+            .execution_options(yield_per=10000)
+        )
+        async for session_type, total_score, section_scores in result:
+            for section, score in session_scores(total_score, section_scores).items():
+                counts[session_type, section, score] += 1
+
+        if counts:
+            await self.db.execute(
+                ScoreDistribution.__table__.insert(),
+                [
+                    {"session_type": session_type, "section": section, "score": score, "count": count}
+                    for (session_type, section, score), count in counts.items()
+                ]
+            )
+        await self.db.commit()
+        return len(counts)
@@ -0,0 +1,181 @@
+"""
+Test session repository for database operations
+"""
+
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.sql import func
+from sqlalchemy.orm import joinedload, selectinload
+
+from app.models.answer import Answer
+from app.models.test_session import TestSession, SessionStatus, SessionType
+
+# Rows fetched per round trip from the server-side cursor when exporting
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    TestSession.id,
+    TestSession.user_id,
+    TestSession.session_type,
+    TestSession.status,
+    TestSession.started_at,
+    TestSession.completed_at,
+    TestSession.time_limit,
+    TestSession.time_spent,
+    TestSession.total_questions,
+    TestSession.answered_questions,
+    TestSession.correct_answers,
+    TestSession.total_score,
+    TestSession.section_scores,
+]
+
+class TestSessionRepository:
+    """Repository for TestSession model database operations"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get_by_id(self, session_id: int, with_answers: bool = False) -> Optional[TestSession]:
+        """Get test session by ID
+        
+        With ``with_answers`` the session's answers and their questions are
+        loaded too, in one extra query (selectinload, joining questions).
+        """
+        query = select(TestSession).where(TestSession.id == session_id)
+        if with_answers:
+            query = query.options(
+                selectinload(TestSession.answers).joinedload(Answer.question)
+            )
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+    
+    async def create(self, session: TestSession) -> TestSession:
+        """Add a new test session and flush it to get its ID (does not commit)"""
+        self.db.add(session)
+        await self.db.flush()
+        await self.db.refresh(session)
+        return session
+    
+    async def write_progress(self, states: list[dict]) -> None:
+        """Write absolute progress counters for many sessions in one executemany UPDATE
+        
+        Each state needs session_id, answered_questions, correct_answers,
+        current_question_index and time_spent. A state older than what is
+        already stored (fewer answered questions) is skipped, so out-of-order
+        flushes can't move a session backwards. Does not commit.
+        """
+        if not states:
+            return
+        
+        sessions = TestSession.__table__
+        await self.db.execute(
+            update(sessions)
+            .where(
+                sessions.c.id == bindparam("session_id"),
+                sessions.c.answered_questions <= bindparam("answered")
+            )
+            .values(
+                answered_questions=bindparam("answered"),
+                correct_answers=bindparam("correct"),
+                current_question_index=bindparam("question_index"),
+                time_spent=bindparam("spent")
+            ),
+            [
+                {
+                    "session_id": state["session_id"],
+                    "answered": state["answered_questions"],
+                    "correct": state["correct_answers"],
+                    "question_index": state["current_question_index"],
+                    "spent": state["time_spent"],
+                }
+                for state in states
+            ]
+        )
+    
+    async def apply_answer_batch(
+        self,
+        session_id: int,
+        user_id: int,
+        answered: int,
+        correct: int,
+        time_spent: int
+    ) -> Optional[dict]:
+        """Advance an active session's counters for a batch of answers in one UPDATE
+        
+        Returns the new counter values, or None if the session is not an
+        active session owned by the user. Does not commit.
+        """
+        result = await self.db.execute(
+            update(TestSession)
+            .where(
+                TestSession.id == session_id,
+                TestSession.user_id == user_id,
+                TestSession.status == SessionStatus.ACTIVE
+            )
+            .values(
+                answered_questions=TestSession.answered_questions + answered,
+                correct_answers=TestSession.correct_answers + correct,
+                current_question_index=TestSession.current_question_index + answered,
+                time_spent=TestSession.time_spent + time_spent
+            )
+            .returning(
+                TestSession.answered_questions,
+                TestSession.correct_answers,
+                TestSession.current_question_index
+            )
+            .execution_options(synchronize_session=False)
+        )
+        row = result.one_or_none()
+        return dict(row._mapping) if row else None
+    
+    async def mark_completed(self, session_id: int, total_score: Optional[int]) -> bool:
+        """Complete a session if it is still active or paused, in one conditional UPDATE
+        
+        Returns False if the session was already finished, e.g. by a
+        concurrent request; the row lock makes exactly one of them win.
+        Does not commit.
+        """
+        result = await self.db.execute(
+            update(TestSession)
+            .where(
+                TestSession.id == session_id,
+                TestSession.status.in_([SessionStatus.ACTIVE, SessionStatus.PAUSED])
+            )
+            .values(
+                status=SessionStatus.COMPLETED,
+                completed_at=func.now(),
+                total_score=total_score
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount == 1
+    
+    async def stream_export(
+        self,
+        user_ids: Optional[list[int]] = None,
+        session_type: Optional[SessionType] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> AsyncIterator[list]:
+        """Stream sessions for export in chunks of rows from a server-side cursor
+        
+        Filters by user, session type and a started_at window [since, until).
+        Rows carry the columns of EXPORT_COLUMNS, ordered by session ID.
+        """
+        query = select(*EXPORT_COLUMNS)
+        if user_ids:
+            query = query.where(TestSession.user_id.in_(user_ids))
+        if session_type is not None:
+            query = query.where(TestSession.session_type == session_type)
+        if since is not None:
+            query = query.where(TestSession.started_at >= since)
+        if until is not None:
+            query = query.where(TestSession.started_at < until)
+        
+        result = await self.db.stream(
+            query.order_by(TestSession.id).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        async for rows in result.partitions():
+            yield rows
@@ -2,13 +2,23 @@
 User repository for database operations
 """
 
-from typing import Optional
+import json
+from datetime import datetime
+from typing import Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import select, update, tuple_, values, column, bindparam, Integer, DateTime
 from sqlalchemy.sql import func
 
+from app.core.cache import create_cache_backend
+from app.core.config import settings
+from app.core.etag import version_stamps
 from app.models.user import User
-from app.schemas.user import UserCreate
+from app.schemas.user import UserCreate, UserResponse
+
+# User snapshots and counters shared by all repository instances
+user_cache = create_cache_backend("user")
+
+USER_COUNTS_CACHE_KEY = "counts"
 
 class UserRepository:
     """Repository for User model database operations"""
@@ -29,6 +39,7 @@ class UserRepository:
         self.db.add(user)
         await self.db.commit()
         await self.db.refresh(user)
+        await user_cache.delete(USER_COUNTS_CACHE_KEY)
         return user
     
     async def get_by_id(self, user_id: int) -> Optional[User]:
@@ -38,6 +49,30 @@ class UserRepository:
         )
         return result.scalar_one_or_none()
     
+    async def get_by_id_cached(self, user_id: int) -> Optional[User]:
+        """Get user by ID, served from the user snapshot cache when warm
+
+        On a cache hit the returned User is a detached snapshot without
+        ``hashed_password``; treat it as read-only.
+        """
+        snapshot = await user_cache.get(str(user_id))
+        if snapshot is not None:
+            return User(**UserResponse.model_validate_json(snapshot).model_dump())
+        
+        user = await self.get_by_id(user_id)
+        if user:
+            await user_cache.set(
+                str(user_id),
+                UserResponse.model_validate(user).model_dump_json(),
+                ttl=settings.USER_CACHE_TTL_SECONDS
+            )
+        return user
+    
+    async def invalidate_cache(self, user_id: int) -> None:
+        """Drop the cached snapshot and version stamp for a user"""
+        await user_cache.delete(str(user_id))
+        await version_stamps.invalidate("user", user_id)
+    
     async def get_by_email(self, email: str) -> Optional[User]:
         """Get user by email"""
         result = await self.db.execute(
@@ -53,6 +88,9 @@ class UserRepository:
             .values(**kwargs, updated_at=func.now())
         )
         await self.db.commit()
+        await self.invalidate_cache(user_id)
+        if "is_active" in kwargs:
+            await user_cache.delete(USER_COUNTS_CACHE_KEY)
         return await self.get_by_id(user_id)
     
     async def update_last_login(self, user_id: int) -> None:
@@ -63,6 +101,40 @@ class UserRepository:
             .values(last_login=func.now(), updated_at=func.now())
         )
         await self.db.commit()
+        await self.invalidate_cache(user_id)
+    
+    async def update_last_logins(self, logins: dict[int, datetime]) -> None:
+        """Set last login timestamps for many users in one statement (does not commit)
+        
+        Uses UPDATE ... FROM (VALUES ...) on PostgreSQL and an executemany
+        UPDATE on other databases.
+        """
+        if not logins:
+            return
+        
+        if self.db.bind.dialect.name == "postgresql":
+            logged_in = values(
+                column("user_id", Integer),
+                column("logged_in_at", DateTime(timezone=True)),
+                name="logged_in"
+            ).data(list(logins.items()))
+            await self.db.execute(
+                update(User)
+                .where(User.id == logged_in.c.user_id)
+                .values(last_login=logged_in.c.logged_in_at, updated_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        else:
+            users = User.__table__
+            await self.db.execute(
+                update(users)
+                .where(users.c.id == bindparam("user_id"))
+                .values(last_login=bindparam("logged_in_at"), updated_at=func.now()),
+                [
+                    {"user_id": user_id, "logged_in_at": logged_in_at}
+                    for user_id, logged_in_at in logins.items()
+                ]
+            )
     
     async def deactivate(self, user_id: int) -> Optional[User]:
         """Deactivate user account"""
@@ -82,7 +154,7 @@ class UserRepository:
             select(User)
             .offset(skip)
             .limit(limit)
-            .order_by(User.created_at.desc())
+            .order_by(User.created_at.desc(), User.id.desc())
         )
         return result.scalars().all()
     
@@ -93,10 +165,62 @@ class UserRepository:
             .where(User.is_active == True)
             .offset(skip)
             .limit(limit)
-            .order_by(User.created_at.desc())
+            .order_by(User.created_at.desc(), User.id.desc())
+        )
+        return result.scalars().all()
+    
+    async def get_page(
+        self,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None,
+        active_only: bool = False
+    ) -> list[User]:
+        """Get a page of users after a (created_at, id) keyset position
+        
+        Ordered by created_at, id descending, so each page is an index range
+        scan regardless of how deep it is.
+        """
+        query = select(User)
+        if active_only:
+            query = query.where(User.is_active == True)
+        if after is not None:
+            query = query.where(tuple_(User.created_at, User.id) < tuple_(*after))
+        
+        result = await self.db.execute(
+            query
+            .order_by(User.created_at.desc(), User.id.desc())
+            .limit(limit)
         )
         return result.scalars().all()
     
+    async def get_rows(
+        self,
+        columns: list,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None,
+        active_only: bool = False
+    ) -> list:
+        """Get a page of users as plain rows of the given columns
+        
+        Same ordering and paging as get_all/get_page, but skips building ORM
+        objects for callers that serialize rows directly.
+        """
+        query = select(*columns)
+        if active_only:
+            query = query.where(User.is_active == True)
+        if after is not None:
+            query = query.where(tuple_(User.created_at, User.id) < tuple_(*after))
+        elif skip:
+            query = query.offset(skip)
+        
+        result = await self.db.execute(
+            query
+            .order_by(User.created_at.desc(), User.id.desc())
+            .limit(limit)
+        )
+        return result.all()
+    
     async def count_total_users(self) -> int:
         """Count total number of users"""
         result = await self.db.execute(
@@ -110,3 +234,32 @@ class UserRepository:
             select(func.count(User.id)).where(User.is_active == True)
         )
         return result.scalar()
+    
+    async def count_users(self) -> dict:
+        """Count total and active users in a single pass"""
+        result = await self.db.execute(
+            select(
+                func.count(User.id),
+                func.count(User.id).filter(User.is_active == True)
+            )
+        )
+        total_users, active_users = result.one()
+        return {"total_users": total_users, "active_users": active_users}
+    
+    async def count_users_cached(self) -> dict:
+        """Count total and active users, served from a short-TTL cache
+        
+        The cached counts are dropped whenever a user is created, activated
+        or deactivated, so the TTL only bounds drift from other writers.
+        """
+        cached = await user_cache.get(USER_COUNTS_CACHE_KEY)
+        if cached is not None:
+            return json.loads(cached)
+        
+        counts = await self.count_users()
+        await user_cache.set(
+            USER_COUNTS_CACHE_KEY,
+            json.dumps(counts),
+            ttl=settings.USER_COUNTS_CACHE_TTL_SECONDS
+        )
+        return counts
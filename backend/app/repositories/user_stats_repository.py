@@ -0,0 +1,164 @@
+"""
+User statistics repository for maintaining the per-user rollup
+"""
+
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, case, and_
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.core.database import dialect_insert
+from app.models.answer import Answer
+from app.models.test_session import TestSession, SessionStatus
+from app.models.user_stats import UserStatistics
+
+COUNTER_COLUMNS = (
+    "total_sessions",
+    "completed_sessions",
+    "total_answers",
+    "correct_answers",
+    "total_time_spent",
+)
+
+class UserStatsRepository:
+    """Repository for UserStatistics rollup operations
+    
+    Write methods add to the caller's transaction and do not commit, so the
+    rollup changes together with the rows it summarizes.
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get(self, user_id: int) -> Optional[UserStatistics]:
+        """Get a user's statistics rollup by primary key"""
+        return await self.db.get(UserStatistics, user_id)
+    
+    async def _increment(self, user_id: int, **deltas: int) -> None:
+        """Atomically add deltas to a user's counters, creating the row if needed"""
+        insert = dialect_insert(self.db)
+        values = {column: deltas.get(column, 0) for column in COUNTER_COLUMNS}
+        stmt = insert(UserStatistics).values(user_id=user_id, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserStatistics.user_id],
+            set_={
+                column: getattr(UserStatistics, column) + delta
+                for column, delta in deltas.items()
+            } | {"updated_at": func.now()}
+        )
+        await self.db.execute(stmt)
+    
+    async def record_session_started(self, user_id: int) -> None:
+        """Count a newly created test session"""
+        await self._increment(user_id, total_sessions=1)
+    
+    async def record_answers(self, user_id: int, answered: int, correct: int, time_spent: int) -> None:
+        """Add a batch of recorded answers to the user's counters"""
+        if answered:
+            await self._increment(
+                user_id,
+                total_answers=answered,
+                correct_answers=correct,
+                total_time_spent=time_spent
+            )
+    
+    async def record_answer(self, user_id: int, is_correct: bool, time_spent: int) -> None:
+        """Add a single recorded answer to the user's counters"""
+        await self.record_answers(user_id, 1, int(is_correct), time_spent)
+    
+    async def record_regrade(self, user_id: int, correct_delta: int) -> None:
+        """Adjust correct answer count after answers were re-graded"""
+        await self._increment(user_id, correct_answers=correct_delta)
+    
+    async def record_session_completed(self, user_id: int, total_score: Optional[int]) -> None:
+        """Count a completed session and fold its score into best/recent scores"""
+        await self._increment(user_id, completed_sessions=1)
+        if total_score is None:
+            return
+        
+        result = await self.db.execute(
+            select(UserStatistics)
+            .where(UserStatistics.user_id == user_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        stats = result.scalar_one()
+        
+        window = settings.USER_STATS_TREND_WINDOW
+        stats.recent_scores = ((stats.recent_scores or []) + [total_score])[-window:]
+        if stats.best_score is None or total_score > stats.best_score:
+            stats.best_score = total_score
+        await self.db.flush()
+    
+    async def rebuild_all(self) -> int:
+        """Rebuild every user's rollup from answers and test sessions in bulk"""
+        session_counts = (
+            select(
+                TestSession.user_id.label("user_id"),
+                func.count(TestSession.id).label("total_sessions"),
+                func.count(TestSession.id).filter(
+                    TestSession.status == SessionStatus.COMPLETED
+                ).label("completed_sessions"),
+                func.max(
+                    case((TestSession.status == SessionStatus.COMPLETED, TestSession.total_score))
+                ).label("best_score"),
+            )
+            .group_by(TestSession.user_id)
+        )
+        answer_counts = (
+            select(
+                Answer.user_id.label("user_id"),
+                func.count(Answer.id).label("total_answers"),
+                func.count(Answer.id).filter(Answer.is_correct == True).label("correct_answers"),
+                func.coalesce(func.sum(Answer.time_spent), 0).label("total_time_spent"),
+            )
+            .group_by(Answer.user_id)
+        )
+        
+        rows: dict[int, dict] = {}
+        for row in (await self.db.execute(session_counts)).mappings():
+            rows[row["user_id"]] = dict(row)
+        for row in (await self.db.execute(answer_counts)).mappings():
+            rows.setdefault(row["user_id"], {"user_id": row["user_id"]}).update(row)
+        
+        # Latest completed scores per user, newest first
+        ranked = (
+            select(
+                TestSession.user_id,
+                TestSession.total_score,
+                func.row_number().over(
+                    partition_by=TestSession.user_id,
+                    order_by=(TestSession.completed_at.desc(), TestSession.id.desc())
+                ).label("rank"),
+            )
+            .where(and_(
+                TestSession.status == SessionStatus.COMPLETED,
+                TestSession.total_score.is_not(None)
+            ))
+            .subquery()
+        )
+        recent = await self.db.execute(
+            select(ranked.c.user_id, ranked.c.total_score)
+            .where(ranked.c.rank <= settings.USER_STATS_TREND_WINDOW)
+            .order_by(ranked.c.user_id, ranked.c.rank.desc())
+        )
+        for user_id, score in recent:
+            rows[user_id].setdefault("recent_scores", []).append(score)
+        
+        await self.db.execute(delete(UserStatistics))
+        if rows:
+            await self.db.execute(
+                UserStatistics.__table__.insert(),
+                [
+                    {
+                        "user_id": user_id,
+                        "best_score": row.get("best_score"),
+                        "recent_scores": row.get("recent_scores"),
+                        **{column: row.get(column) or 0 for column in COUNTER_COLUMNS},
+                    }
+                    for user_id, row in rows.items()
+                ]
+            )
+        await self.db.commit()
+        return len(rows)
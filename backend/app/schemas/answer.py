@@ -0,0 +1,80 @@
+"""
+Answer schemas for API requests and responses
+"""
+
+from collections import Counter
+from pydantic import BaseModel, Field, field_validator
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+from app.models.question import QuestionType, DifficultyLevel, Subject
+
+class AnswerCreate(BaseModel):
+    """Schema for submitting an answer"""
+    question_id: int
+    user_answer: Dict[str, Any]  # e.g. {"choice": "B"} or {"value": "3/4"}
+    time_spent: int = Field(..., ge=0, description="Time spent in seconds")
+    confidence_level: Optional[int] = Field(default=None, ge=1, le=5)
+    flagged_for_review: bool = False
+    skipped: bool = False
+
+class AnswerResponse(BaseModel):
+    """Schema for answer response"""
+    id: int
+    user_id: int
+    test_session_id: int
+    question_id: int
+    user_answer: Dict[str, Any]
+    is_correct: bool
+    time_spent: int
+    attempt_number: int
+    points_earned: int
+    answered_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class AnsweredQuestion(BaseModel):
+    """Question shown alongside an answer when reviewing a session"""
+    id: int
+    content: Dict[str, Any]
+    question_type: QuestionType
+    difficulty_level: DifficultyLevel
+    subject: Subject
+    topic: str
+    
+    class Config:
+        from_attributes = True
+
+class AnswerReview(AnswerResponse):
+    """Schema for an answer with its question"""
+    question: AnsweredQuestion
+
+class AnswerBatchCreate(BaseModel):
+    """Schema for submitting several answers to one test session"""
+    answers: List[AnswerCreate] = Field(..., min_length=1, max_length=500)
+    
+    @field_validator("answers")
+    @classmethod
+    def unique_questions(cls, answers: List[AnswerCreate]) -> List[AnswerCreate]:
+        """Reject batches that answer the same question more than once"""
+        counts = Counter(answer.question_id for answer in answers)
+        duplicates = sorted(question_id for question_id, count in counts.items() if count > 1)
+        if duplicates:
+            raise ValueError(f"Duplicate question ids: {duplicates}")
+        return answers
+
+class AnswerResult(BaseModel):
+    """Grading result for a single submitted answer"""
+    question_id: int
+    is_correct: bool
+
+class AnswerBatchResponse(BaseModel):
+    """Schema for batch answer submission response"""
+    test_session_id: int
+    submitted: int
+    correct: int
+    answered_questions: int
+    correct_answers: int
+    current_question_index: int
+    results: List[AnswerResult]
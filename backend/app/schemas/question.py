@@ -0,0 +1,56 @@
+"""
+Question schemas for API requests and responses
+"""
+
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+from app.models.question import QuestionType, DifficultyLevel, Subject
+
+class QuestionBase(BaseModel):
+    """Base question schema with common fields"""
+    external_id: Optional[str] = Field(default=None, max_length=100)
+    content: Dict[str, Any]
+    question_type: QuestionType
+    difficulty_level: DifficultyLevel
+    subject: Subject
+    topic: str = Field(..., max_length=100)
+    tags: Optional[List[str]] = None
+    estimated_time: Optional[int] = None  # In seconds
+    irt_discrimination: Optional[float] = Field(default=None, gt=0)
+    irt_difficulty: Optional[float] = None
+    irt_guessing: Optional[float] = Field(default=None, ge=0, lt=1)
+
+class QuestionCreate(QuestionBase):
+    """Schema for question creation"""
+    pass
+
+class QuestionUpdate(BaseModel):
+    """Schema for question updates"""
+    content: Optional[Dict[str, Any]] = None
+    question_type: Optional[QuestionType] = None
+    difficulty_level: Optional[DifficultyLevel] = None
+    subject: Optional[Subject] = None
+    topic: Optional[str] = Field(default=None, max_length=100)
+    tags: Optional[List[str]] = None
+    estimated_time: Optional[int] = None
+    irt_discrimination: Optional[float] = Field(default=None, gt=0)
+    irt_difficulty: Optional[float] = None
+    irt_guessing: Optional[float] = Field(default=None, ge=0, lt=1)
+    is_active: Optional[bool] = None
+
+class QuestionResponse(QuestionBase):
+    """Schema for question response"""
+    id: int
+    is_active: bool
+    created_by: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class QuestionSearchResult(QuestionResponse):
+    """Schema for a question search hit"""
+    rank: float
@@ -0,0 +1,67 @@
+"""
+Test session schemas for API requests and responses
+"""
+
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+from app.models.test_session import SessionType, SessionStatus
+from app.schemas.answer import AnswerReview
+
+class TestSessionCreate(BaseModel):
+    """Schema for test session creation"""
+    session_type: SessionType
+    configuration: Optional[Dict[str, Any]] = None
+    time_limit: Optional[int] = None  # In minutes
+    total_questions: int = 0
+    question_order: Optional[List[int]] = None
+
+class TestSessionUpdate(BaseModel):
+    """Schema for test session updates"""
+    status: Optional[SessionStatus] = None
+    time_spent: Optional[int] = None
+    current_question_index: Optional[int] = None
+
+class TestSessionResponse(BaseModel):
+    """Schema for test session response"""
+    id: int
+    user_id: int
+    session_type: SessionType
+    status: SessionStatus
+    configuration: Optional[Dict[str, Any]] = None
+    started_at: datetime
+    completed_at: Optional[datetime] = None
+    time_limit: Optional[int] = None
+    time_spent: int
+    total_questions: int
+    answered_questions: int
+    correct_answers: int
+    total_score: Optional[int] = None
+    section_scores: Optional[Dict[str, Any]] = None
+    current_question_index: int
+    
+    class Config:
+        from_attributes = True
+
+class TestSessionReview(TestSessionResponse):
+    """Schema for reviewing a finished test session answer by answer"""
+    answers: List[AnswerReview]
+
+class ScorePercentile(BaseModel):
+    """Schema for a score's percentile rank among completed sessions of the same type"""
+    score: int
+    percentile: Optional[float] = None  # None until the distribution has data
+    sample_size: int
+
+class TestSessionPercentiles(BaseModel):
+    """Schema for a completed test session's percentile ranks"""
+    test_session_id: int
+    session_type: SessionType
+    sections: Dict[str, ScorePercentile]  # "total" and any section_scores keys
+
+class AdaptiveNextQuestion(BaseModel):
+    """Schema for the next question chosen for an adaptive session"""
+    test_session_id: int
+    question_id: Optional[int] = None  # None when the pool is exhausted
+    estimated_ability: Dict[str, Any]
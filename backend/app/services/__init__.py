@@ -1,5 +1,10 @@
 """Service layer for business logic"""
 
 from app.services.user_service import UserService
+from app.services.answer_service import AnswerService
+from app.services.adaptive_service import AdaptiveTestService
+from app.services.grading_service import GradingService
+from app.services.test_session_service import TestSessionService
+from app.services.export_service import ExportService
 
-__all__ = ["UserService"]
+__all__ = ["UserService", "AnswerService", "AdaptiveTestService", "GradingService", "TestSessionService", "ExportService"]
@@ -0,0 +1,95 @@
+"""
+Adaptive test service for ability estimation and item selection
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.question import Subject
+from app.models.test_session import TestSession
+from app.repositories.answer_repository import AnswerRepository
+from app.services.adaptive_engine import AdaptiveEngine, adaptive_engine
+from app.services.question_catalog import QuestionCatalog, question_catalog
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class AdaptiveTestService:
+    """Service for adaptive test sessions, backed by the in-memory question catalog"""
+    
+    def __init__(
+        self,
+        db: AsyncSession,
+        catalog: QuestionCatalog = question_catalog,
+        engine: AdaptiveEngine = adaptive_engine
+    ):
+        self.db = db
+        self.answer_repo = AnswerRepository(db)
+        self.catalog = catalog
+        self.engine = engine
+    
+    async def update_ability(self, session: TestSession, outcomes: Optional[list] = None) -> dict:
+        """Re-estimate the session's ability from its answers and store it on the session"""
+        if outcomes is None:
+            outcomes = await self.answer_repo.get_session_outcomes(session.id)
+        correct_by_id = {question_id: is_correct for question_id, is_correct in outcomes}
+        
+        positions = self.catalog.positions_of(correct_by_id)
+        if len(positions) < len(correct_by_id):
+            logger.warning(f"Session {session.id}: {len(correct_by_id) - len(positions)} answered questions are not in the catalog")
+        responses = np.fromiter(
+            (correct_by_id[int(question_id)] for question_id in self.catalog.ids[positions]),
+            dtype=np.bool_
+        )
+        
+        estimate = self.engine.estimate_ability(
+            self.catalog.irt_a[positions],
+            self.catalog.irt_b[positions],
+            self.catalog.irt_c[positions],
+            responses
+        )
+        session.estimated_ability = estimate
+        return estimate
+    
+    async def next_question(self, session: TestSession, subject: Optional[Subject] = None) -> Optional[int]:
+        """Pick the most informative unanswered question for the session and record it
+        
+        Updates the session's ability estimate and difficulty progression and
+        commits. While the last recorded question is unanswered (and still a
+        candidate) it is returned again without recording anything, so polling
+        or retrying clients don't grow the progression. Returns None when no
+        candidate question is left.
+        """
+        outcomes = await self.answer_repo.get_session_outcomes(session.id)
+        estimate = await self.update_ability(session, outcomes)
+        
+        answered = [question_id for question_id, _ in outcomes]
+        candidates = self.catalog.filter_positions(subject=subject, exclude_ids=answered)
+        
+        progression = session.difficulty_progression or []
+        if progression:
+            pending = progression[-1]["question_id"]
+            if np.isin(self.catalog.positions_of([pending]), candidates).any():
+                return pending
+        best = self.engine.select_item(
+            estimate["theta"],
+            self.catalog.irt_a[candidates],
+            self.catalog.irt_b[candidates],
+            self.catalog.irt_c[candidates]
+        )
+        
+        question_id = None
+        if best >= 0:
+            position = candidates[best]
+            question_id = int(self.catalog.ids[position])
+            session.difficulty_progression = (session.difficulty_progression or []) + [{
+                "question_id": question_id,
+                "difficulty": round(float(self.catalog.irt_b[position]), 4),
+                "theta": estimate["theta"],
+            }]
+        
+        await self.db.commit()
+        return question_id
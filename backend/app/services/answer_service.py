@@ -0,0 +1,155 @@
+"""
+Answer service for grading and recording user answers
+"""
+
+import logging
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.session_state import SessionStateUnavailable
+from app.models.question import Question
+from app.repositories.answer_repository import AnswerRepository
+from app.repositories.test_session_repository import TestSessionRepository
+from app.repositories.user_stats_repository import UserStatsRepository
+from app.schemas.answer import AnswerCreate
+from app.services.grading_service import extract_answer
+from app.services.test_session_service import TestSessionService
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class AnswerService:
+    """Service for Answer business logic"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.answer_repo = AnswerRepository(db)
+        self.session_repo = TestSessionRepository(db)
+        self.stats_repo = UserStatsRepository(db)
+        self.session_service = TestSessionService(db)
+    
+    async def _load_questions(self, question_ids: set[int]) -> dict[int, Question]:
+        """Load the questions referenced by a batch in one query"""
+        result = await self.db.execute(
+            select(Question).where(Question.id.in_(question_ids))
+        )
+        return {question.id: question for question in result.scalars()}
+    
+    async def submit_batch(self, user_id: int, session_id: int, answers: list[AnswerCreate]) -> Optional[dict]:
+        """Grade and record a batch of answers for one test session
+        
+        Answers are inserted with multi-row INSERTs and the session counters
+        and user statistics are advanced with one statement each, all in a
+        single transaction. With a session state store configured, the session
+        counters are advanced in the store instead and written back later.
+        Returns None if the session is not an active session owned by the
+        user; raises ValueError for unknown questions.
+        """
+        questions = await self._load_questions({answer.question_id for answer in answers})
+        missing = sorted({answer.question_id for answer in answers} - questions.keys())
+        if missing:
+            raise ValueError(f"Unknown question ids: {missing}")
+        
+        rows = []
+        results = []
+        for answer in answers:
+            question = questions[answer.question_id]
+            is_correct = not answer.skipped and question.answer_key.grade(
+                extract_answer(question.question_type, answer.user_answer)
+            )
+            
+            rows.append({
+                "user_id": user_id,
+                "test_session_id": session_id,
+                "question_id": answer.question_id,
+                "user_answer": answer.user_answer,
+                "is_correct": is_correct,
+                "time_spent": answer.time_spent,
+                "attempt_number": 1,
+                "confidence_level": answer.confidence_level,
+                "flagged_for_review": answer.flagged_for_review,
+                "skipped": answer.skipped,
+                "points_earned": 1 if is_correct else 0,
+                "difficulty_at_time": question.difficulty_level.value,
+            })
+            results.append({"question_id": answer.question_id, "is_correct": is_correct})
+        
+        correct = sum(1 for row in rows if row["is_correct"])
+        time_spent = sum(row["time_spent"] for row in rows)
+        
+        if self.session_service.store:
+            counters = await self._record_write_behind(user_id, session_id, rows, correct, time_spent)
+        else:
+            counters = await self._record(user_id, session_id, rows, correct, time_spent)
+        if counters is None:
+            return None
+        
+        return {
+            "test_session_id": session_id,
+            "submitted": len(rows),
+            "correct": correct,
+            **counters,
+            "results": results,
+        }
+    
+    async def _record(self, user_id: int, session_id: int, rows: list[dict], correct: int, time_spent: int) -> Optional[dict]:
+        """Insert answers and advance session and user counters in one transaction"""
+        try:
+            counters = await self.session_repo.apply_answer_batch(
+                session_id, user_id, len(rows), correct, time_spent
+            )
+            if counters is None:
+                await self.db.rollback()
+                return None
+            
+            await self.answer_repo.bulk_create(rows)
+            await self.stats_repo.record_answers(user_id, len(rows), correct, time_spent)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        
+        return counters
+    
+    async def _record_write_behind(
+        self,
+        user_id: int,
+        session_id: int,
+        rows: list[dict],
+        correct: int,
+        time_spent: int
+    ) -> Optional[dict]:
+        """Advance the session counters in the state store, then insert answers
+        
+        The counters are rolled back in the store if the insert fails. Raises
+        SessionStateUnavailable if the store is unreachable: writing through to
+        the row would leave the stored counters behind it, and later flushes
+        of them would be dropped.
+        """
+        try:
+            state = await self.session_service.load_progress(session_id, user_id)
+            if state is not None:
+                state = await self.session_service.record_progress(
+                    session_id, user_id, len(rows), correct, time_spent
+                )
+        except Exception as e:
+            logger.warning(f"Session state store unavailable: {e}")
+            raise SessionStateUnavailable(str(e)) from e
+        if state is None:
+            return None
+        
+        try:
+            await self.answer_repo.bulk_create(rows)
+            await self.stats_repo.record_answers(user_id, len(rows), correct, time_spent)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            await self.session_service.store.apply(session_id, -len(rows), -correct, -time_spent)
+            raise
+        
+        return {
+            "answered_questions": state["answered_questions"],
+            "correct_answers": state["correct_answers"],
+            "current_question_index": state["current_question_index"],
+        }
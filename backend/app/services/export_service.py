@@ -0,0 +1,145 @@
+"""
+Export service for streaming answers and test sessions as CSV or NDJSON
+"""
+
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Optional
+
+from app.core.database import read_session
+from app.core.session_state import PROGRESS_FIELDS, SessionStateStore, session_state_store
+from app.models.test_session import SessionStatus, SessionType
+from app.repositories import answer_repository, test_session_repository
+from app.repositories.answer_repository import AnswerRepository
+from app.repositories.test_session_repository import TestSessionRepository
+
+class ExportFormat(str, enum.Enum):
+    """Export file formats"""
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.NDJSON: "application/x-ndjson",
+}
+
+ANSWER_FIELDS = [column.key for column in answer_repository.EXPORT_COLUMNS]
+SESSION_FIELDS = [column.key for column in test_session_repository.EXPORT_COLUMNS]
+
+def _plain(value: Any) -> Any:
+    """Convert enums and datetimes to JSON-friendly values"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _csv_cell(value: Any) -> Any:
+    """Convert a column value to a CSV cell; JSON columns are embedded as JSON text"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return _plain(value)
+
+def encode_csv(rows: list, header: Optional[list[str]] = None) -> str:
+    """Encode a chunk of rows (optionally preceded by a header) as CSV"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(header)
+    writer.writerows([_csv_cell(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+def encode_ndjson(rows: list, fields: list[str]) -> str:
+    """Encode a chunk of rows as newline-delimited JSON objects"""
+    return "".join(
+        json.dumps(dict(zip(fields, map(_plain, row))), separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+class ExportService:
+    """Service for streaming exports
+
+    Exports own their database session, since they outlive the request
+    handler, and read through a server-side cursor one chunk at a time,
+    so memory use does not grow with the size of the export. Sessions come
+    from the read replica when one is configured.
+
+    With a session state store configured, the progress counters of active
+    sessions are taken from the store, as on the session endpoints, since
+    the row can lag by up to SESSION_STATE_FLUSH_SECONDS.
+    """
+
+    def __init__(self, session_factory=read_session, store: Optional[SessionStateStore] = session_state_store):
+        self.session_factory = session_factory
+        self.store = store
+
+    async def _stream(
+        self,
+        repository_class,
+        fields: list[str],
+        export_format: ExportFormat,
+        filters: dict,
+        transform: Optional[Callable] = None
+    ) -> AsyncIterator[str]:
+        if export_format == ExportFormat.CSV:
+            # Send the header before the query runs so the client sees bytes at once
+            yield encode_csv([], header=fields)
+
+        async with self.session_factory() as db:
+            async for rows in repository_class(db).stream_export(**filters):
+                if transform:
+                    rows = await transform(rows)
+                if export_format == ExportFormat.CSV:
+                    yield encode_csv(rows)
+                else:
+                    yield encode_ndjson(rows, fields)
+
+    def export_answers(
+        self,
+        export_format: ExportFormat,
+        user_ids: Optional[list[int]] = None,
+        session_type: Optional[SessionType] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> AsyncIterator[str]:
+        """Stream answers matching the filters in the given format"""
+        filters = {"user_ids": user_ids, "session_type": session_type, "since": since, "until": until}
+        return self._stream(AnswerRepository, ANSWER_FIELDS, export_format, filters)
+
+    def export_sessions(
+        self,
+        export_format: ExportFormat,
+        user_ids: Optional[list[int]] = None,
+        session_type: Optional[SessionType] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> AsyncIterator[str]:
+        """Stream test sessions (with section scores) matching the filters in the given format"""
+        filters = {"user_ids": user_ids, "session_type": session_type, "since": since, "until": until}
+        return self._stream(
+            TestSessionRepository, SESSION_FIELDS, export_format, filters, transform=self._overlay_progress
+        )
+
+    async def _overlay_progress(self, rows: list) -> list:
+        """Replace the progress counters of active sessions with their live values from the store"""
+        active = [row.id for row in rows if row.status == SessionStatus.ACTIVE]
+        if not self.store or not active:
+            return rows
+
+        states = await self.store.get_many(active)
+        if not states:
+            return rows
+
+        positions = {field: SESSION_FIELDS.index(field) for field in PROGRESS_FIELDS if field in SESSION_FIELDS}
+        overlaid = []
+        for row in rows:
+            state = states.get(row.id)
+            if state:
+                row = list(row)
+                for field, position in positions.items():
+                    row[position] = state[field]
+            overlaid.append(row)
+        return overlaid
@@ -0,0 +1,133 @@
+"""
+Grading service for batch grading and re-grading answers
+"""
+
+from collections import defaultdict
+from typing import Any, Iterable
+
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.grading import AnswerKey, compile_answer_key
+from app.core.session_state import session_state_store
+from app.models.answer import Answer
+from app.models.question import Question
+from app.models.test_session import TestSession
+from app.repositories.user_stats_repository import UserStatsRepository
+
+# Answers graded per round trip when re-grading history
+REGRADE_CHUNK_SIZE = 5000
+
+def extract_answer(question_type: Any, user_answer: Any) -> Any:
+    """Pull the gradable value out of a stored answer payload"""
+    if not isinstance(user_answer, dict):
+        return user_answer
+    
+    question_type = getattr(question_type, "value", question_type)
+    if question_type == "multiple_choice":
+        return user_answer.get("choice")
+    elif question_type == "grid_in":
+        return user_answer.get("value")
+    elif question_type == "essay":
+        return user_answer.get("text")
+    return user_answer.get("answer")
+
+def grade_batch(keys: dict[int, AnswerKey], pairs: Iterable[tuple[int, Any]]) -> list[bool]:
+    """Grade (question_id, user_answer) pairs against precompiled keys in one pass
+    
+    Answers to questions without a key are graded incorrect.
+    """
+    graded = []
+    append = graded.append
+    for question_id, user_answer in pairs:
+        key = keys.get(question_id)
+        append(key is not None and key.grade(extract_answer(key.question_type, user_answer)))
+    return graded
+
+class GradingService:
+    """Service for grading answers against compiled answer keys"""
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.stats_repo = UserStatsRepository(db)
+    
+    async def load_keys(self, question_ids: Iterable[int]) -> dict[int, AnswerKey]:
+        """Load and compile answer keys for questions in one query"""
+        result = await self.db.execute(
+            select(Question.id, Question.question_type, Question.content)
+            .where(Question.id.in_(set(question_ids)))
+        )
+        return {
+            question_id: compile_answer_key(question_type, (content or {}).get("correct_answer"))
+            for question_id, question_type, content in result
+        }
+    
+    async def grade(self, pairs: list[tuple[int, Any]]) -> list[bool]:
+        """Grade (question_id, user_answer) pairs"""
+        keys = await self.load_keys(question_id for question_id, _ in pairs)
+        return grade_batch(keys, pairs)
+    
+    async def regrade_question(self, question_id: int) -> dict:
+        """Re-grade every stored answer to a question after its key changed
+        
+        Updates changed answers, the affected sessions' correct_answers and
+        the users' statistics rollups in one transaction, then adjusts any
+        of those sessions held in the session state store.
+        """
+        keys = await self.load_keys([question_id])
+        if question_id not in keys:
+            return {"question_id": question_id, "graded": 0, "changed": 0}
+        
+        stream = await self.db.stream(
+            select(Answer.id, Answer.user_id, Answer.test_session_id, Answer.user_answer, Answer.is_correct)
+            .where(Answer.question_id == question_id, Answer.skipped == False)
+            .execution_options(yield_per=REGRADE_CHUNK_SIZE)
+        )
+        
+        graded = 0
+        changes = []
+        session_deltas: dict[int, int] = defaultdict(int)
+        user_deltas: dict[int, int] = defaultdict(int)
+        async for rows in stream.partitions():
+            results = grade_batch(keys, ((question_id, row.user_answer) for row in rows))
+            graded += len(rows)
+            for row, is_correct in zip(rows, results):
+                if is_correct == row.is_correct:
+                    continue
+                delta = 1 if is_correct else -1
+                changes.append({"answer_id": row.id, "is_correct": is_correct, "points_earned": int(is_correct)})
+                session_deltas[row.test_session_id] += delta
+                user_deltas[row.user_id] += delta
+        
+        if changes:
+            answers = Answer.__table__
+            await self.db.execute(
+                update(answers)
+                .where(answers.c.id == bindparam("answer_id"))
+                .values(is_correct=bindparam("is_correct"), points_earned=bindparam("points_earned")),
+                changes
+            )
+            session_updates = [
+                {"session_id": session_id, "delta": delta}
+                for session_id, delta in session_deltas.items() if delta
+            ]
+            if session_updates:
+                sessions = TestSession.__table__
+                await self.db.execute(
+                    update(sessions)
+                    .where(sessions.c.id == bindparam("session_id"))
+                    .values(correct_answers=sessions.c.correct_answers + bindparam("delta")),
+                    session_updates
+                )
+            for user_id, delta in user_deltas.items():
+                if delta:
+                    await self.stats_repo.record_regrade(user_id, delta)
+            await self.db.commit()
+            
+            # Active sessions held in the state store would otherwise flush
+            # their old correct_answers over the update above
+            if session_state_store:
+                for update_row in session_updates:
+                    await session_state_store.apply(update_row["session_id"], 0, update_row["delta"], 0)
+        
+        return {"question_id": question_id, "graded": graded, "changed": len(changes)}
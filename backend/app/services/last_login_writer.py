@@ -0,0 +1,70 @@
+"""
+Coalescing background writer for user last login timestamps
+
+Logins record their timestamp in memory; a background task writes all
+pending timestamps in one batched UPDATE per interval, so the login request
+path does no database write. Repeated logins by the same user between
+flushes collapse into one row.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from app.repositories.user_repository import UserRepository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Users updated per statement
+FLUSH_CHUNK_SIZE = 1000
+
+
+class LastLoginWriter:
+    """Queue of pending last login timestamps keyed by user ID"""
+
+    def __init__(self):
+        self.pending: dict[int, datetime] = {}
+
+    def record(self, user_id: int) -> None:
+        """Queue a login for the next flush"""
+        self.pending[user_id] = datetime.now(timezone.utc)
+
+    async def flush(self, session_factory) -> int:
+        """Write all pending timestamps; returns the number of users updated"""
+        if not self.pending:
+            return 0
+
+        logins, self.pending = self.pending, {}
+        items = list(logins.items())
+        try:
+            async with session_factory() as db:
+                user_repo = UserRepository(db)
+                for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+                    await user_repo.update_last_logins(dict(items[start:start + FLUSH_CHUNK_SIZE]))
+                await db.commit()
+
+                for user_id in logins:
+                    await user_repo.invalidate_cache(user_id)
+        except BaseException:
+            # Requeue (also when cancelled mid-flush), keeping any newer login recorded meanwhile
+            for user_id, logged_in_at in logins.items():
+                self.pending.setdefault(user_id, logged_in_at)
+            raise
+
+        return len(logins)
+
+    async def run_flush_loop(self, session_factory, interval_seconds: float) -> None:
+        """Flush pending timestamps periodically until cancelled"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.flush(session_factory)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Last login flush failed: {e}")
+
+
+# Create global last login writer instance
+last_login_writer = LastLoginWriter()
@@ -0,0 +1,336 @@
+"""
+Process-local question catalog for fast item selection
+
+Active questions are held as compact NumPy columns so practice and test
+assembly can filter and sample candidates without touching the database.
+Subject, difficulty and topic are dictionary-encoded and matched with
+vectorized compares; tags, being multi-valued, have an inverted index of
+row positions. The catalog refreshes incrementally from
+``Question.updated_at``.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict, namedtuple
+from datetime import datetime
+from typing import Iterable, Optional, Union
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.question import QuestionType, Subject, DifficultyLevel
+from app.repositories.question_repository import QuestionRepository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+QUESTION_TYPES = list(QuestionType)
+SUBJECTS = list(Subject)
+DIFFICULTIES = list(DifficultyLevel)
+QUESTION_TYPE_CODES = {question_type: code for code, question_type in enumerate(QUESTION_TYPES)}
+SUBJECT_CODES = {subject: code for code, subject in enumerate(SUBJECTS)}
+DIFFICULTY_CODES = {difficulty: code for code, difficulty in enumerate(DIFFICULTIES)}
+
+# IRT defaults for questions without calibrated parameters
+DEFAULT_IRT_DIFFICULTY = {
+    DifficultyLevel.EASY: -1.0,
+    DifficultyLevel.MEDIUM: 0.0,
+    DifficultyLevel.HARD: 1.0,
+}
+DEFAULT_IRT_DISCRIMINATION = 1.0
+DEFAULT_IRT_GUESSING = {
+    QuestionType.MULTIPLE_CHOICE: 0.25,
+}
+
+# Shared generator for sampling; creating one per call costs more than the sample
+_rng = np.random.default_rng()
+
+# Row shape used when rebuilding the columns from memory
+_CatalogRow = namedtuple(
+    "_CatalogRow",
+    [
+        "id", "question_type", "subject", "difficulty_level", "topic", "tags", "estimated_time",
+        "irt_discrimination", "irt_difficulty", "irt_guessing", "is_active", "updated_at",
+    ]
+)
+
+# Column name -> dtype
+COLUMNS = {
+    "ids": np.int64,
+    "question_types": np.int8,
+    "subjects": np.int8,
+    "difficulties": np.int8,
+    "topics": np.int32,
+    "estimated_times": np.int32,
+    "irt_a": np.float64,
+    "irt_b": np.float64,
+    "irt_c": np.float64,
+    "alive": np.bool_,
+}
+
+
+def _as_list(value) -> Optional[list]:
+    """Normalize a single filter value or an iterable of values to a list"""
+    if value is None:
+        return None
+    if isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+        return [value]
+    return list(value)
+
+
+def _match_codes(column: np.ndarray, codes: list[int]) -> np.ndarray:
+    """Vectorized membership test of a code column against one or more codes"""
+    if len(codes) > 8:
+        return np.isin(column, codes)
+    mask = column == codes[0]
+    for code in codes[1:]:
+        mask |= column == code
+    return mask
+
+
+class QuestionCatalog:
+    """In-memory column store over active questions"""
+
+    def __init__(self):
+        self._reset()
+
+    def _reset(self) -> None:
+        # Columns, one entry per row position; rows [0, _size) are in use
+        self._size = 0
+        for name, dtype in COLUMNS.items():
+            setattr(self, name, np.zeros(0, dtype=dtype))
+        self._row_tags: list[tuple] = []
+        self._row_updated_at: list[datetime] = []
+
+        # Question ID -> live row position
+        self.positions: dict[int, int] = {}
+
+        # Topic dictionary encoding
+        self.topic_names: list[str] = []
+        self.topic_codes: dict[str, int] = {}
+
+        # Tag inverted index: tag -> row positions, with cached arrays
+        self.by_tag: dict[str, set[int]] = defaultdict(set)
+        self._tag_arrays: dict[str, np.ndarray] = {}
+
+        self.watermark: Optional[datetime] = None
+        self.refreshed_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def _ensure_capacity(self, size: int) -> None:
+        """Grow the columns geometrically so appends stay amortized O(1)"""
+        capacity = len(self.ids)
+        if size <= capacity:
+            return
+
+        new_capacity = max(1024, capacity * 2, size)
+        for name in COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=column.dtype)
+            grown[:capacity] = column
+            setattr(self, name, grown)
+
+    def _topic_code(self, topic: str) -> int:
+        code = self.topic_codes.get(topic)
+        if code is None:
+            code = len(self.topic_names)
+            self.topic_names.append(topic)
+            self.topic_codes[topic] = code
+        return code
+
+    def _remove(self, question_id: int) -> None:
+        """Tombstone a question's row and drop it from the tag index"""
+        position = self.positions.pop(question_id, None)
+        if position is None:
+            return
+
+        self.alive[position] = False
+        for tag in self._row_tags[position]:
+            self.by_tag[tag].discard(position)
+            self._tag_arrays.pop(tag, None)
+
+    def _append(self, row) -> None:
+        """Append a question row and index it"""
+        position = self._size
+        self._ensure_capacity(position + 1)
+        self._size += 1
+        tags = tuple(row.tags or ())
+
+        self.ids[position] = row.id
+        self.question_types[position] = QUESTION_TYPE_CODES[row.question_type]
+        self.subjects[position] = SUBJECT_CODES[row.subject]
+        self.difficulties[position] = DIFFICULTY_CODES[row.difficulty_level]
+        self.topics[position] = self._topic_code(row.topic)
+        self.estimated_times[position] = row.estimated_time or 0
+        self.irt_a[position] = (
+            row.irt_discrimination if row.irt_discrimination is not None else DEFAULT_IRT_DISCRIMINATION
+        )
+        self.irt_b[position] = (
+            row.irt_difficulty if row.irt_difficulty is not None else DEFAULT_IRT_DIFFICULTY[row.difficulty_level]
+        )
+        self.irt_c[position] = (
+            row.irt_guessing if row.irt_guessing is not None else DEFAULT_IRT_GUESSING.get(row.question_type, 0.0)
+        )
+        self.alive[position] = True
+        self._row_tags.append(tags)
+        self._row_updated_at.append(row.updated_at)
+
+        self.positions[row.id] = position
+        for tag in tags:
+            self.by_tag[tag].add(position)
+            self._tag_arrays.pop(tag, None)
+
+    def apply(self, row) -> None:
+        """Insert, replace or remove a question from a catalog row"""
+        position = self.positions.get(row.id)
+        if position is not None and self._row_updated_at[position] == row.updated_at:
+            return
+
+        self._remove(row.id)
+        if row.is_active:
+            self._append(row)
+
+    def _compact(self) -> None:
+        """Rebuild the columns without tombstoned rows"""
+        live = [
+            _CatalogRow(
+                int(self.ids[p]), QUESTION_TYPES[self.question_types[p]], SUBJECTS[self.subjects[p]],
+                DIFFICULTIES[self.difficulties[p]], self.topic_names[self.topics[p]], self._row_tags[p],
+                int(self.estimated_times[p]), float(self.irt_a[p]), float(self.irt_b[p]), float(self.irt_c[p]),
+                True, self._row_updated_at[p]
+            )
+            for p in sorted(self.positions.values())
+        ]
+        watermark = self.watermark
+        refreshed_at = self.refreshed_at
+
+        self._reset()
+        self._ensure_capacity(len(live))
+        for row in live:
+            self._append(row)
+
+        self.watermark = watermark
+        self.refreshed_at = refreshed_at
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """Load the catalog, or apply changes since the last refresh; returns rows applied"""
+        rows = await QuestionRepository(db).get_catalog_rows(self.watermark)
+
+        if self.watermark is None:
+            self._reset()
+            self._ensure_capacity(len(rows))
+        for row in rows:
+            self.apply(row)
+        if rows:
+            self.watermark = rows[-1].updated_at
+
+        # Reclaim space once most rows are tombstones
+        if self._size > 2 * len(self.positions) + 1024:
+            self._compact()
+
+        self.refreshed_at = datetime.utcnow()
+        return len(rows)
+
+    async def run_refresh_loop(self, session_factory, interval_seconds: float) -> None:
+        """Refresh the catalog periodically until cancelled"""
+        while True:
+            try:
+                async with session_factory() as db:
+                    await self.refresh(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Question catalog refresh failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    def _tag_positions(self, tag: str) -> np.ndarray:
+        """Get a tag's posting list as an array of row positions"""
+        positions = self._tag_arrays.get(tag)
+        if positions is None:
+            positions = np.fromiter(self.by_tag.get(tag, ()), dtype=np.int64)
+            self._tag_arrays[tag] = positions
+        return positions
+
+    def positions_of(self, question_ids: Iterable[int]) -> np.ndarray:
+        """Get row positions for question IDs, skipping ones not in the catalog"""
+        positions = self.positions
+        return np.fromiter(
+            (positions[question_id] for question_id in question_ids if question_id in positions),
+            dtype=np.int64
+        )
+
+    def filter_positions(
+        self,
+        subject: Union[Subject, Iterable[Subject], None] = None,
+        difficulty: Union[DifficultyLevel, Iterable[DifficultyLevel], None] = None,
+        topic: Union[str, Iterable[str], None] = None,
+        tags: Union[str, Iterable[str], None] = None,
+        match_all_tags: bool = False,
+        exclude_ids: Optional[Iterable[int]] = None,
+    ) -> np.ndarray:
+        """Get row positions of live questions matching every given filter"""
+        size = self._size
+        mask = self.alive[:size].copy()
+
+        subjects = _as_list(subject)
+        if subjects is not None:
+            mask &= _match_codes(self.subjects[:size], [SUBJECT_CODES[s] for s in subjects])
+
+        difficulties = _as_list(difficulty)
+        if difficulties is not None:
+            mask &= _match_codes(self.difficulties[:size], [DIFFICULTY_CODES[d] for d in difficulties])
+
+        topics = _as_list(topic)
+        if topics is not None:
+            codes = [self.topic_codes[t] for t in topics if t in self.topic_codes]
+            if not codes:
+                return np.zeros(0, dtype=np.int64)
+            mask &= _match_codes(self.topics[:size], codes)
+
+        tag_values = _as_list(tags)
+        if tag_values is not None:
+            tag_masks = []
+            for tag in tag_values:
+                tag_mask = np.zeros(size, dtype=np.bool_)
+                tag_mask[self._tag_positions(tag)] = True
+                tag_masks.append(tag_mask)
+            combine = np.logical_and if match_all_tags else np.logical_or
+            mask &= combine.reduce(tag_masks)
+
+        if exclude_ids:
+            mask &= ~np.isin(self.ids[:size], np.fromiter(exclude_ids, dtype=np.int64))
+
+        return np.flatnonzero(mask)
+
+    def filter(self, **filters) -> np.ndarray:
+        """Get IDs of questions matching every given filter
+
+        Each filter accepts a single value or several (matched as OR).
+        Tags match any of the given tags unless ``match_all_tags`` is set.
+        See filter_positions for the accepted filters.
+        """
+        return self.ids[self.filter_positions(**filters)]
+
+    def sample(self, k: int, rng: Optional[np.random.Generator] = None, **filters) -> np.ndarray:
+        """Randomly pick up to k question IDs matching the filters"""
+        candidates = self.filter(**filters)
+        if len(candidates) <= k:
+            return candidates
+        return (rng or _rng).choice(candidates, size=k, replace=False)
+
+    def stats(self) -> dict:
+        """Get catalog metrics"""
+        return {
+            "questions": len(self.positions),
+            "rows": self._size,
+            "topics": len(self.topic_names),
+            "tags": sum(1 for positions in self.by_tag.values() if positions),
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+            "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+        }
+
+
+# Create global question catalog instance
+question_catalog = QuestionCatalog()
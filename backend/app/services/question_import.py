@@ -0,0 +1,357 @@
+"""
+Question bank import pipeline
+
+Records are stream-parsed from JSON (a top-level array), JSONL or CSV in a
+worker thread, validated in batches on a shared process pool and upserted on
+``Question.external_id`` with one multi-row statement per batch. Rows that
+fail validation are written to a rejects file as JSON lines; API imports
+keep theirs under UPLOAD_DIR/imports for QUESTION_IMPORT_REJECTS_RETENTION_DAYS.
+"""
+
+import asyncio
+import csv
+import enum
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, IO, Iterator, Optional
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.grading import normalize_choice, parse_number
+from app.models.question import QuestionType
+from app.repositories.question_repository import QuestionRepository
+from app.schemas.question import QuestionCreate
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Characters read per chunk when scanning a JSON array
+JSON_READ_SIZE = 1 << 16
+
+# Flat CSV columns folded into ``content`` when there is no content column
+CONTENT_FIELDS = ("question_text", "passage", "choices", "correct_answer", "explanation")
+
+# Validation processes shared by all imports in this process
+IMPORT_WORKERS = settings.QUESTION_IMPORT_WORKERS or os.cpu_count() or 1
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+# Rejects files of API imports, named by an opaque hex ID
+REJECTS_DIR = os.path.join(settings.UPLOAD_DIR, "imports")
+REJECTS_SUFFIX = ".rejected.jsonl"
+_REJECTS_ID = re.compile(r"[0-9a-f]{32}")
+
+
+class ImportFormat(str, enum.Enum):
+    """Question bank file formats"""
+    JSON = "json"
+    JSONL = "jsonl"
+    CSV = "csv"
+
+
+def detect_format(filename: str) -> ImportFormat:
+    """Guess the file format from its extension"""
+    extension = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    if extension == "ndjson":
+        return ImportFormat.JSONL
+    try:
+        return ImportFormat(extension)
+    except ValueError:
+        raise ValueError(f"Unsupported question bank format: {filename}")
+
+
+def _iter_json_array(fp: IO[str]) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    started = False
+
+    while True:
+        # Skip whitespace and separators, refilling the buffer as needed
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            buffer = fp.read(JSON_READ_SIZE)
+            position = 0
+            eof = not buffer
+
+        if position >= len(buffer):
+            raise ValueError("Unexpected end of JSON input")
+
+        if not started:
+            if buffer[position] != "[":
+                raise ValueError("Expected a JSON array of questions")
+            started = True
+            position += 1
+            continue
+        if buffer[position] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Element spans the chunk boundary; read more and retry
+            chunk = fp.read(JSON_READ_SIZE)
+            eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        yield item
+        position = end
+
+
+def iter_records(fp: IO[str], import_format: ImportFormat) -> Iterator[Any]:
+    """Stream raw records from a question bank file"""
+    if import_format == ImportFormat.JSON:
+        yield from _iter_json_array(fp)
+    elif import_format == ImportFormat.JSONL:
+        for line in fp:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    # Leave it to validation to reject
+                    yield {"__error__": f"Invalid JSON: {e}", "__raw__": line}
+    else:
+        yield from csv.DictReader(fp)
+
+
+def _normalize(record: dict) -> dict:
+    """Coerce CSV strings (empty cells, JSON cells, tag lists) into typed fields"""
+    record = {key: (None if value == "" else value) for key, value in record.items() if key}
+
+    if isinstance(record.get("content"), str):
+        record["content"] = json.loads(record["content"])
+    elif record.get("content") is None:
+        content = {field: record.pop(field) for field in CONTENT_FIELDS if record.get(field) is not None}
+        if isinstance(content.get("choices"), str):
+            content["choices"] = json.loads(content["choices"])
+        if content:
+            record["content"] = content
+
+    tags = record.get("tags")
+    if isinstance(tags, str):
+        record["tags"] = json.loads(tags) if tags.startswith("[") else [tag.strip() for tag in tags.split("|") if tag.strip()]
+
+    for field in CONTENT_FIELDS:
+        record.pop(field, None)
+    return record
+
+
+def _content_errors(question: QuestionCreate) -> list[str]:
+    """Check that a question's content can be presented and graded"""
+    content = question.content
+    errors = []
+    if not content.get("question_text"):
+        errors.append("content.question_text is required")
+
+    if question.question_type == QuestionType.ESSAY:
+        return errors
+
+    correct_answer = content.get("correct_answer")
+    answers = correct_answer if isinstance(correct_answer, list) else [correct_answer]
+    if correct_answer is None or correct_answer == "" or not answers:
+        errors.append("content.correct_answer is required")
+        return errors
+
+    if question.question_type == QuestionType.GRID_IN:
+        if any(parse_number(str(answer)) is None for answer in answers):
+            errors.append("content.correct_answer must be numeric for grid-in questions")
+    else:
+        choices = content.get("choices")
+        if not isinstance(choices, list) or len(choices) < 2:
+            errors.append("content.choices must list at least two choices")
+        elif all(isinstance(choice, dict) and "label" in choice for choice in choices):
+            labels = {normalize_choice(choice["label"]) for choice in choices}
+            if any(normalize_choice(answer) not in labels for answer in answers):
+                errors.append("content.correct_answer must match a choice label")
+    return errors
+
+
+def validate_record(record: Any) -> tuple[Optional[dict], list[str]]:
+    """Validate one raw record; returns the row to upsert or the errors"""
+    if not isinstance(record, dict):
+        return None, ["Record must be an object"]
+    if "__error__" in record:
+        return None, [record["__error__"]]
+
+    try:
+        question = QuestionCreate.model_validate(_normalize(record))
+    except (ValueError, ValidationError) as e:
+        if isinstance(e, ValidationError):
+            return None, [
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            ]
+        return None, [str(e)]
+
+    errors = _content_errors(question)
+    if not question.external_id:
+        errors.insert(0, "external_id is required")
+    if errors:
+        return None, errors
+
+    row = question.model_dump()
+    row["is_active"] = True
+    return row, []
+
+
+def validate_batch(batch: list[tuple[int, Any]]) -> tuple[list[dict], list[dict]]:
+    """Validate numbered records; returns (rows, rejects)
+
+    Module-level so it can run in a worker process.
+    """
+    rows = []
+    rejects = []
+    for number, record in batch:
+        row, errors = validate_record(record)
+        if row is None:
+            rejects.append({"record_number": number, "errors": errors, "record": record})
+        else:
+            rows.append(row)
+    return rows, rejects
+
+
+def get_import_executor() -> Optional[ProcessPoolExecutor]:
+    """Get the shared validation pool, created on first use; None when imports validate in a thread"""
+    global _executor
+    if _executor is None and IMPORT_WORKERS > 1:
+        _executor = ProcessPoolExecutor(max_workers=IMPORT_WORKERS)
+    return _executor
+
+
+def shutdown_import_executor() -> None:
+    """Shut down the shared validation pool without waiting on running batches"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        logger.info("Question import pool shut down")
+
+
+def rejects_path(rejects_id: str) -> str:
+    """Get the rejects file of an API import, refusing IDs that aren't ours"""
+    if not _REJECTS_ID.fullmatch(rejects_id):
+        raise ValueError(f"Invalid rejects ID: {rejects_id}")
+    return os.path.join(REJECTS_DIR, rejects_id + REJECTS_SUFFIX)
+
+
+def purge_rejects(max_age_seconds: float) -> int:
+    """Delete rejects files older than max_age_seconds; returns files deleted"""
+    cutoff = time.time() - max_age_seconds
+    deleted = 0
+    try:
+        entries = list(os.scandir(REJECTS_DIR))
+    except FileNotFoundError:
+        return 0
+
+    for entry in entries:
+        if not entry.name.endswith(REJECTS_SUFFIX):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                deleted += 1
+        except FileNotFoundError:
+            pass
+    return deleted
+
+
+class QuestionImporter:
+    """Streams a question bank file through validation into batched upserts"""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        created_by: Optional[int] = None,
+        batch_size: int = settings.QUESTION_IMPORT_BATCH_SIZE,
+        executor: Optional[Executor] = None,
+        workers: int = IMPORT_WORKERS,
+        rejects_file: Optional[IO[str]] = None,
+        progress: Optional[Callable[[dict], None]] = None
+    ):
+        self.db = db
+        self.question_repo = QuestionRepository(db)
+        self.created_by = created_by
+        self.batch_size = batch_size
+        self.executor = executor
+        self.workers = max(1, workers)
+        self.rejects_file = rejects_file
+        self.progress = progress
+        self.report = {"processed": 0, "upserted": 0, "rejected": 0, "elapsed_seconds": 0.0}
+
+    def _batches(self, fp: IO[str], import_format: ImportFormat) -> Iterator[list[tuple[int, Any]]]:
+        batch = []
+        for number, record in enumerate(iter_records(fp, import_format), start=1):
+            batch.append((number, record))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def _store(self, rows: list[dict], rejects: list[dict], started: float) -> None:
+        """Upsert one validated batch, record its rejects and report progress"""
+        if rows:
+            for row in rows:
+                row["created_by"] = self.created_by
+            try:
+                await self.question_repo.upsert_by_external_id(rows)
+                await self.db.commit()
+            except Exception:
+                await self.db.rollback()
+                raise
+
+        if self.rejects_file and rejects:
+            self.rejects_file.writelines(json.dumps(reject, default=str) + "\n" for reject in rejects)
+
+        self.report["processed"] += len(rows) + len(rejects)
+        self.report["upserted"] += len(rows)
+        self.report["rejected"] += len(rejects)
+        self.report["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        if self.progress:
+            self.progress(dict(self.report))
+
+    async def run(self, fp: IO[str], import_format: ImportFormat) -> dict:
+        """Import every record in a question bank file; returns the report
+
+        The file is read and parsed in a worker thread and up to ``workers``
+        batches are validated on ``executor`` (the default thread pool when
+        None) while earlier batches are written, in file order, so the event
+        loop is never blocked. Each batch is committed on its own, so
+        re-running after a failure is safe.
+        """
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        batches = self._batches(fp, import_format)
+
+        pending: list[asyncio.Future] = []
+        try:
+            while True:
+                batch = await asyncio.to_thread(next, batches, None)
+                if batch is None:
+                    break
+                pending.append(loop.run_in_executor(self.executor, validate_batch, batch))
+                # Bound read-ahead so memory stays flat on large files
+                if len(pending) >= self.workers * 2:
+                    await self._store(*await pending.pop(0), started)
+            while pending:
+                await self._store(*await pending.pop(0), started)
+        finally:
+            for future in pending:
+                future.cancel()
+
+        return self.report
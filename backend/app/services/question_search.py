@@ -0,0 +1,343 @@
+"""
+Full-text search over the question bank
+
+On PostgreSQL questions are matched against the ``search_vector`` generated
+column and its GIN index (see QuestionRepository.search_full_text). Other
+databases (SQLite in development and tests) use a process-local inverted
+index over question text and explanations, built by a background task
+started with the application and refreshed incrementally from
+``Question.updated_at`` every QUESTION_SEARCH_REFRESH_SECONDS; searches only
+read what is loaded and are refused until the first build has finished.
+
+The fallback approximates PostgreSQL's behaviour: every query term must
+match, terms are lowercased with stop words and plural endings dropped, and
+results are ranked by BM25 with question text weighted above the
+explanation.
+"""
+
+import asyncio
+import logging
+import math
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.question import DifficultyLevel, Question, Subject
+from app.repositories.question_repository import QuestionRepository
+from app.services.question_catalog import DIFFICULTIES, DIFFICULTY_CODES, SUBJECTS, SUBJECT_CODES
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have if in into is it its of on or that the their then there "
+    "these this to was were what when which who will with".split()
+)
+
+# Field weights, mirroring setweight 'A' and 'B' of the tsvector column
+QUESTION_TEXT_WEIGHT = 1.0
+EXPLANATION_WEIGHT = 0.4
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Rows applied between yields to the event loop during a refresh
+APPLY_CHUNK_SIZE = 5000
+
+# Column name -> dtype
+COLUMNS = {
+    "ids": np.int64,
+    "lengths": np.float64,
+    "subjects": np.int8,
+    "difficulties": np.int8,
+}
+
+
+def _stem(word: str) -> str:
+    """Strip plural endings so plurals match their singular"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """Split text into normalized search terms"""
+    if not text:
+        return []
+    return [_stem(word) for word in _TOKEN.findall(text.lower()) if word not in STOP_WORDS]
+
+
+class QuestionSearchIndex:
+    """In-memory inverted index over active questions
+
+    Postings map terms to row positions, as in the question catalog, with
+    per-row columns for length and filters. Posting lists are turned into
+    sorted arrays on first use so searches intersect and score candidates
+    with vectorized NumPy operations.
+    """
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # Columns, one entry per row position; rows [0, _size) are in use
+        self._size = 0
+        for name, dtype in COLUMNS.items():
+            setattr(self, name, np.zeros(0, dtype=dtype))
+        self._row_terms: list[tuple[tuple[str, float], ...]] = []
+        self._total_length = 0.0
+
+        # Question ID -> live row position
+        self.positions: dict[int, int] = {}
+
+        # Term -> row position -> weighted term frequency, with cached arrays
+        self.postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self._posting_arrays: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+
+        self.watermark: Optional[datetime] = None
+        self.refreshed_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has been built at least once"""
+        return self.refreshed_at is not None
+
+    def _ensure_capacity(self, size: int) -> None:
+        """Grow the columns geometrically so appends stay amortized O(1)"""
+        capacity = len(self.ids)
+        if size <= capacity:
+            return
+
+        new_capacity = max(1024, capacity * 2, size)
+        for name in COLUMNS:
+            column = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=column.dtype)
+            grown[:capacity] = column
+            setattr(self, name, grown)
+
+    def _remove(self, question_id: int) -> None:
+        """Tombstone a question's row and drop its postings"""
+        position = self.positions.pop(question_id, None)
+        if position is None:
+            return
+
+        self._total_length -= self.lengths[position]
+        for term, _ in self._row_terms[position]:
+            posting = self.postings[term]
+            del posting[position]
+            if not posting:
+                del self.postings[term]
+            self._posting_arrays.pop(term, None)
+
+    def _append(self, question_id: int, subject: Subject, difficulty_level: DifficultyLevel, terms: tuple) -> None:
+        """Append a row of (term, weighted frequency) pairs and index it"""
+        position = self._size
+        self._ensure_capacity(position + 1)
+        self._size += 1
+        length = sum(frequency for _, frequency in terms)
+
+        self.ids[position] = question_id
+        self.lengths[position] = length
+        self.subjects[position] = SUBJECT_CODES[subject]
+        self.difficulties[position] = DIFFICULTY_CODES[difficulty_level]
+        self._row_terms.append(terms)
+        self._total_length += length
+
+        self.positions[question_id] = position
+        for term, frequency in terms:
+            self.postings[term][position] = frequency
+            self._posting_arrays.pop(term, None)
+
+    def apply(self, row) -> None:
+        """Insert, replace or remove a question from a search row"""
+        self._remove(row.id)
+        if not row.is_active:
+            return
+
+        frequencies: dict[str, float] = defaultdict(float)
+        for term in tokenize(row.question_text):
+            frequencies[term] += QUESTION_TEXT_WEIGHT
+        for term in tokenize(row.explanation):
+            frequencies[term] += EXPLANATION_WEIGHT
+        self._append(row.id, row.subject, row.difficulty_level, tuple(frequencies.items()))
+
+    def _compact(self) -> None:
+        """Rebuild the rows without tombstones"""
+        live = [
+            (int(self.ids[p]), SUBJECTS[self.subjects[p]], DIFFICULTIES[self.difficulties[p]], self._row_terms[p])
+            for p in sorted(self.positions.values())
+        ]
+        watermark = self.watermark
+        refreshed_at = self.refreshed_at
+
+        self._reset()
+        self._ensure_capacity(len(live))
+        for row in live:
+            self._append(*row)
+
+        self.watermark = watermark
+        self.refreshed_at = refreshed_at
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """Load the index, or apply changes since the last refresh; returns rows applied
+
+        Refreshes are serialized, and yield to the event loop between chunks
+        of rows so a full build doesn't stall requests.
+        """
+        async with self._lock:
+            # SQLite keeps server-side timestamps to the second (and compares them
+            # as text), so look back a second; reindexing those rows is harmless
+            since = self.watermark - timedelta(seconds=1) if self.watermark else None
+            rows = await QuestionRepository(db).get_search_rows(since)
+
+            if self.watermark is None:
+                self._reset()
+                self._ensure_capacity(len(rows))
+            for start in range(0, len(rows), APPLY_CHUNK_SIZE):
+                for row in rows[start:start + APPLY_CHUNK_SIZE]:
+                    self.apply(row)
+                await asyncio.sleep(0)
+            if rows:
+                self.watermark = rows[-1].updated_at
+
+            # Reclaim space once most rows are tombstones
+            if self._size > 2 * len(self.positions) + 1024:
+                self._compact()
+
+            self.refreshed_at = datetime.utcnow()
+            return len(rows)
+
+    async def run_refresh_loop(self, session_factory, interval_seconds: float) -> None:
+        """Refresh the index periodically until cancelled"""
+        while True:
+            try:
+                async with session_factory() as db:
+                    await self.refresh(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Question search index refresh failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    def _posting_array(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        """Get a term's postings as sorted row positions and their frequencies"""
+        arrays = self._posting_arrays.get(term)
+        if arrays is None:
+            posting = self.postings.get(term, {})
+            positions = np.fromiter(posting.keys(), dtype=np.int64, count=len(posting))
+            frequencies = np.fromiter(posting.values(), dtype=np.float64, count=len(posting))
+            order = np.argsort(positions)
+            arrays = self._posting_arrays[term] = (positions[order], frequencies[order])
+        return arrays
+
+    def search(
+        self,
+        text: str,
+        subject: Optional[Subject] = None,
+        difficulty_level: Optional[DifficultyLevel] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> list[tuple[int, float]]:
+        """Rank questions containing every query term; returns (question ID, score), best first"""
+        terms = list(dict.fromkeys(tokenize(text)))
+        if not terms or not self.positions or any(term not in self.postings for term in terms):
+            return []
+
+        # Intersect starting from the rarest term, gathering each term's frequencies
+        postings = sorted((self._posting_array(term) for term in terms), key=lambda arrays: len(arrays[0]))
+        positions, first_frequencies = postings[0]
+        frequencies = [first_frequencies]
+        for term_positions, term_frequencies in postings[1:]:
+            found = np.searchsorted(term_positions, positions).clip(max=len(term_positions) - 1)
+            matched = term_positions[found] == positions
+            positions = positions[matched]
+            frequencies = [column[matched] for column in frequencies] + [term_frequencies[found[matched]]]
+
+        mask = None
+        if subject is not None:
+            mask = self.subjects[positions] == SUBJECT_CODES[subject]
+        if difficulty_level is not None:
+            difficulty_mask = self.difficulties[positions] == DIFFICULTY_CODES[difficulty_level]
+            mask = difficulty_mask if mask is None else mask & difficulty_mask
+        if mask is not None:
+            positions = positions[mask]
+            frequencies = [column[mask] for column in frequencies]
+        if not len(positions):
+            return []
+
+        count = len(self.positions)
+        norm = K1 * (1 - B + B * self.lengths[positions] / (self._total_length / count))
+        scores = np.zeros(len(positions))
+        for (term_positions, _), column in zip(postings, frequencies):
+            idf = math.log(1 + (count - len(term_positions) + 0.5) / (len(term_positions) + 0.5))
+            scores += idf * column * (K1 + 1) / (column + norm)
+
+        # Best skip + limit rows, ordered by score then question ID
+        top = skip + limit
+        if len(scores) > top:
+            best = np.argpartition(-scores, top - 1)[:top]
+            positions, scores = positions[best], scores[best]
+        ids = self.ids[positions]
+        order = np.lexsort((ids, -scores))[skip:top]
+        return [(int(question_id), float(score)) for question_id, score in zip(ids[order], scores[order])]
+
+    def stats(self) -> dict:
+        """Get index metrics"""
+        return {
+            "questions": len(self.positions),
+            "rows": self._size,
+            "terms": len(self.postings),
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+            "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+        }
+
+
+class QuestionSearchService:
+    """Service for question bank search"""
+
+    def __init__(self, db: AsyncSession, index: Optional[QuestionSearchIndex] = None):
+        self.db = db
+        self.index = question_search_index if index is None else index
+        self.question_repo = QuestionRepository(db)
+
+    @property
+    def ready(self) -> bool:
+        """Whether searches can be answered yet (always on PostgreSQL)"""
+        return self.db.bind.dialect.name == "postgresql" or self.index.ready
+
+    async def search(
+        self,
+        text: str,
+        subject: Optional[Subject] = None,
+        difficulty_level: Optional[DifficultyLevel] = None,
+        skip: int = 0,
+        limit: int = 20
+    ) -> list[tuple[Question, float]]:
+        """Find active questions matching a query, best first, as (question, rank) pairs"""
+        if self.db.bind.dialect.name == "postgresql":
+            return await self.question_repo.search_full_text(text, subject, difficulty_level, skip, limit)
+
+        hits = self.index.search(text, subject, difficulty_level, skip, limit)
+        if not hits:
+            return []
+
+        questions = await self.question_repo.get_by_ids([question_id for question_id, _ in hits])
+        questions = {question.id: question for question in questions}
+        return [(questions[question_id], rank) for question_id, rank in hits if question_id in questions]
+
+
+# Create global question search index instance
+question_search_index = QuestionSearchIndex()
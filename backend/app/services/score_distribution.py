@@ -0,0 +1,146 @@
+"""
+Process-local score histograms for percentile ranking
+
+The score_distributions table holds one count per (session type, section,
+score). It is maintained as sessions complete (see
+TestSessionService.complete_session) and rebuilt in bulk by
+``python -m scripts.backfill_score_distributions``. Each process keeps the
+histograms in memory, folds in the sessions it completes itself and reloads
+the table periodically to pick up other workers' completions.
+
+A percentile lookup is a binary search over a histogram's distinct scores
+and their cumulative counts, so it costs O(log k) in the number of distinct
+scores and never touches the database.
+"""
+
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.test_session import SessionType
+from app.repositories.score_distribution_repository import ScoreDistributionRepository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ScoreHistogram:
+    """Counts of each score with cumulative counts for percentile lookups"""
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.total = 0
+
+        # Distinct scores ascending and how many sessions scored below each;
+        # rebuilt lazily after a score is added
+        self._scores: list[int] = []
+        self._below: list[int] = []
+        self._stale = False
+
+    def add(self, score: int, count: int = 1) -> None:
+        """Count a score"""
+        if score not in self.counts:
+            self.counts[score] = 0
+            insort(self._scores, score)
+        self.counts[score] += count
+        self.total += count
+        self._stale = True
+
+    def _rebuild(self) -> None:
+        below = []
+        running = 0
+        for score in self._scores:
+            below.append(running)
+            running += self.counts[score]
+        self._below = below
+        self._stale = False
+
+    def percentile(self, score: int) -> Optional[float]:
+        """Percentile rank of a score: share of sessions below it, counting ties as half
+
+        None when the histogram is empty.
+        """
+        if not self.total:
+            return None
+        if self._stale:
+            self._rebuild()
+
+        position = bisect_left(self._scores, score)
+        if position == len(self._scores):
+            return 100.0
+        ties = self.counts[score] if self._scores[position] == score else 0
+        return round((self._below[position] + ties / 2) / self.total * 100, 1)
+
+
+class ScoreDistributions:
+    """In-memory score histograms keyed by session type and section"""
+
+    def __init__(self):
+        self.histograms: dict[tuple[SessionType, str], ScoreHistogram] = {}
+        self.refreshed_at: Optional[datetime] = None
+
+    def load(self, rows) -> None:
+        """Replace all histograms with (session_type, section, score, count) rows"""
+        histograms: dict[tuple[SessionType, str], ScoreHistogram] = {}
+        for session_type, section, score, count in rows:
+            histogram = histograms.get((session_type, section))
+            if histogram is None:
+                histogram = histograms[session_type, section] = ScoreHistogram()
+            histogram.add(score, count)
+        self.histograms = histograms
+
+    def record(self, session_type: SessionType, scores: dict[str, int]) -> None:
+        """Fold a completed session's scores into the histograms of its type"""
+        for section, score in scores.items():
+            histogram = self.histograms.get((session_type, section))
+            if histogram is None:
+                histogram = self.histograms[session_type, section] = ScoreHistogram()
+            histogram.add(score)
+
+    def percentile(self, session_type: SessionType, section: str, score: int) -> Optional[float]:
+        """Percentile rank of a score among sessions of a type, or None without data"""
+        histogram = self.histograms.get((session_type, section))
+        return histogram.percentile(score) if histogram else None
+
+    def sample_size(self, session_type: SessionType, section: str) -> int:
+        """Number of sessions in a histogram"""
+        histogram = self.histograms.get((session_type, section))
+        return histogram.total if histogram else 0
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """Reload the histograms from the database; returns buckets loaded"""
+        rows = await ScoreDistributionRepository(db).get_all()
+        self.load(rows)
+        self.refreshed_at = datetime.utcnow()
+        return len(rows)
+
+    async def run_refresh_loop(self, session_factory, interval_seconds: float) -> None:
+        """Refresh the histograms periodically until cancelled"""
+        while True:
+            try:
+                async with session_factory() as db:
+                    await self.refresh(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Score distribution refresh failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    def stats(self) -> dict:
+        """Get histogram metrics"""
+        return {
+            "histograms": len(self.histograms),
+            "sessions": {
+                f"{session_type.value}:{section}": histogram.total
+                for (session_type, section), histogram in self.histograms.items()
+            },
+            "refreshed_at": self.refreshed_at.isoformat() if self.refreshed_at else None,
+        }
+
+
+# Create global score distributions instance
+score_distributions = ScoreDistributions()
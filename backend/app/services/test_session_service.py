@@ -0,0 +1,242 @@
+"""
+Test session service for session lifecycle and write-behind progress
+"""
+
+import asyncio
+import logging
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.session_state import SessionStateStore, CLOSED_FIELD, PROGRESS_FIELDS, session_state_store
+from app.models.test_session import TestSession
+from app.repositories.score_distribution_repository import ScoreDistributionRepository, session_scores
+from app.repositories.test_session_repository import TestSessionRepository
+from app.repositories.user_stats_repository import UserStatsRepository
+from app.schemas.test_session import TestSessionCreate
+from app.services.score_distribution import score_distributions
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class TestSessionService:
+    """Service for TestSession business logic
+    
+    When a session state store is configured, progress of active sessions
+    lives in the store and reaches the database through flush_session_states
+    and on pause/complete, instead of one UPDATE per answer batch.
+    """
+    
+    def __init__(self, db: AsyncSession, store: Optional[SessionStateStore] = session_state_store):
+        self.db = db
+        self.store = store
+        self.session_repo = TestSessionRepository(db)
+        self.stats_repo = UserStatsRepository(db)
+        self.distribution_repo = ScoreDistributionRepository(db)
+    
+    async def create_session(self, user_id: int, session_data: TestSessionCreate) -> TestSession:
+        """Start a new test session for a user"""
+        session = TestSession(
+            user_id=user_id,
+            session_type=session_data.session_type,
+            configuration=session_data.configuration,
+            time_limit=session_data.time_limit,
+            total_questions=session_data.total_questions,
+            question_order=session_data.question_order,
+        )
+        
+        try:
+            session = await self.session_repo.create(session)
+            await self.stats_repo.record_session_started(user_id)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        
+        return session
+    
+    async def get_session(self, session_id: int) -> Optional[TestSession]:
+        """Get a test session with its live progress overlaid"""
+        session = await self.session_repo.get_by_id(session_id)
+        if session and self.store and session.is_active():
+            state = await self.store.get(session_id)
+            if state:
+                # Expunge first so the overlay is never written back
+                self.db.expunge(session)
+                for field in PROGRESS_FIELDS:
+                    setattr(session, field, state[field])
+        return session
+    
+    async def load_progress(self, session_id: int, user_id: int) -> Optional[dict]:
+        """Get the hot state of an active session owned by the user, loading it if needed
+        
+        Returns None if the session is not an active session owned by the user,
+        or is being paused or completed.
+        """
+        state = await self.store.get(session_id)
+        if state is None:
+            session = await self.session_repo.get_by_id(session_id)
+            if not session or not session.is_active():
+                return None
+            state = await self.store.seed(
+                session_id,
+                {"user_id": session.user_id, **{field: getattr(session, field) for field in PROGRESS_FIELDS}}
+            )
+        
+        return state if state["user_id"] == user_id and not state[CLOSED_FIELD] else None
+    
+    async def record_progress(
+        self,
+        session_id: int,
+        user_id: int,
+        answered: int,
+        correct: int,
+        time_spent: int
+    ) -> Optional[dict]:
+        """Advance a session's counters in the store; returns the new counters"""
+        state = await self.store.apply(session_id, answered, correct, time_spent)
+        if state is None:
+            # Evicted since it was loaded; reload from the database and retry once
+            if await self.load_progress(session_id, user_id) is None:
+                return None
+            state = await self.store.apply(session_id, answered, correct, time_spent)
+        
+        return state
+    
+    async def _sync_progress(self, session: TestSession) -> None:
+        """Close a session's hot state and copy its final progress onto the ORM object
+        
+        Answers arriving after this are refused rather than counted in a state
+        that is about to be dropped.
+        """
+        if not self.store:
+            return
+        
+        state = await self.store.close(session.id)
+        if state:
+            for field in PROGRESS_FIELDS:
+                setattr(session, field, state[field])
+    
+    async def _commit_and_release(self, session: TestSession) -> TestSession:
+        """Commit a status change and drop the session's hot state"""
+        try:
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            if self.store:
+                # The session is still active; let answers through again
+                await self.store.reopen(session.id)
+            raise
+        
+        await self.db.refresh(session)
+        if self.store:
+            await self.store.remove(session.id)
+        return session
+    
+    async def pause_session(self, session: TestSession) -> TestSession:
+        """Flush a session's progress and pause it"""
+        await self._sync_progress(session)
+        session.pause_session()
+        return await self._commit_and_release(session)
+    
+    async def resume_session(self, session: TestSession) -> TestSession:
+        """Resume a paused session"""
+        session.resume_session()
+        try:
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+        
+        await self.db.refresh(session)
+        return session
+    
+    async def complete_session(self, session: TestSession) -> Optional[TestSession]:
+        """Flush a session's progress, complete it and fold it into user statistics and score distributions
+        
+        The status change is a conditional UPDATE, so of concurrent requests
+        only the one that completes the session counts it; the others get
+        None, as for a session that was already finished. Until scaled
+        scoring exists the total score is the raw score (correct answers).
+        """
+        await self._sync_progress(session)
+        total_score = session.correct_answers if session.total_score is None else session.total_score
+        scores = session_scores(total_score, session.section_scores)
+        try:
+            completed = await self.session_repo.mark_completed(session.id, total_score)
+            if not completed:
+                await self.db.rollback()
+                return None
+            
+            await self.stats_repo.record_session_completed(session.user_id, total_score)
+            await self.distribution_repo.record_scores(session.session_type, scores)
+        except Exception:
+            await self.db.rollback()
+            if self.store:
+                await self.store.reopen(session.id)
+            raise
+        session = await self._commit_and_release(session)
+        
+        score_distributions.record(session.session_type, scores)
+        return session
+
+
+async def flush_session_states(
+    session_factory,
+    store: Optional[SessionStateStore] = session_state_store,
+    batch_size: int = settings.SESSION_STATE_FLUSH_BATCH_SIZE
+) -> int:
+    """Write all dirty session progress to the database in coalesced batches
+    
+    Each batch is one executemany UPDATE and one commit; sessions stay in
+    flight in the store until their batch commits. Returns sessions written.
+    """
+    if not store:
+        return 0
+    
+    flushed = 0
+    while True:
+        drained = await store.drain(batch_size)
+        if not drained:
+            return flushed
+        
+        states = [{"session_id": session_id, **state} for session_id, state in drained]
+        async with session_factory() as db:
+            await TestSessionRepository(db).write_progress(states)
+            await db.commit()
+        
+        await store.ack([session_id for session_id, _ in drained])
+        flushed += len(drained)
+
+
+async def replay_session_states(session_factory, store: Optional[SessionStateStore] = session_state_store) -> int:
+    """Requeue progress left in flight by a crashed process and write it out"""
+    if not store:
+        return 0
+    
+    await store.requeue_in_flight()
+    flushed = await flush_session_states(session_factory, store)
+    if flushed:
+        logger.info(f"Replayed progress of {flushed} test sessions")
+    return flushed
+
+
+async def run_session_state_flush_loop(
+    session_factory,
+    interval_seconds: float,
+    store: Optional[SessionStateStore] = session_state_store
+) -> None:
+    """Flush dirty session progress periodically until cancelled"""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await flush_session_states(session_factory, store)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Put drained sessions back so the next flush retries them
+            logger.warning(f"Session state flush failed: {e}")
+            try:
+                await store.requeue_in_flight()
+            except Exception:
+                pass
@@ -2,16 +2,19 @@
 User service for business logic operations
 """
 
-from typing import Optional
+from datetime import datetime
+from typing import Optional, Tuple
 from app.models.user import User
 from app.schemas.user import UserCreate
 from app.repositories.user_repository import UserRepository
+from app.repositories.user_stats_repository import UserStatsRepository
 
 class UserService:
     """Service for User business logic"""
     
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, stats_repository: Optional[UserStatsRepository] = None):
         self.user_repo = user_repository
+        self.stats_repo = stats_repository or UserStatsRepository(user_repository.db)
     
     async def create_user(self, user_data: UserCreate, hashed_password: str) -> User:
         """Create a new user with business logic"""
@@ -50,35 +53,64 @@ class UserService:
         return await self.user_repo.verify_email(user_id)
     
     async def get_user_statistics(self, user_id: int) -> dict:
-        """Get comprehensive user statistics"""
-        user = await self.user_repo.get_by_id(user_id)
-        if not user:
-            return {}
+        """Get comprehensive user statistics from the maintained rollup"""
+        stats = await self.stats_repo.get(user_id)
+        if not stats:
+            return {
+                "total_sessions": 0,
+                "completed_sessions": 0,
+                "average_accuracy": 0.0,
+                "total_time_spent": 0,
+                "best_score": None,
+                "recent_sessions": 0,
+                "improvement_trend": "stable"
+            }
         
-        # TODO: Implement statistics calculation
-        # This would involve querying test sessions, answers, etc.
-        stats = {
-            "total_sessions": 0,
-            "completed_sessions": 0,
-            "average_accuracy": 0.0,
-            "total_time_spent": 0,
-            "best_score": None,
-            "improvement_trend": "stable"
+        return {
+            "total_sessions": stats.total_sessions,
+            "completed_sessions": stats.completed_sessions,
+            "average_accuracy": round(stats.average_accuracy, 2),
+            "total_time_spent": stats.total_time_spent // 60,
+            "best_score": stats.best_score,
+            "recent_sessions": len(stats.recent_scores or []),
+            "improvement_trend": stats.improvement_trend
         }
-        
-        return stats
     
-    async def get_users_with_pagination(self, skip: int = 0, limit: int = 100, active_only: bool = True) -> list[User]:
-        """Get users with pagination"""
+    async def get_users_with_pagination(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        active_only: bool = True,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> list[User]:
+        """Get users with pagination
+        
+        Uses keyset pagination when an ``after`` position is given and falls
+        back to offset pagination otherwise.
+        """
+        if after is not None:
+            return await self.user_repo.get_page(limit, after=after, active_only=active_only)
         if active_only:
             return await self.user_repo.get_active_users(skip, limit)
         else:
             return await self.user_repo.get_all(skip, limit)
     
+    async def get_user_rows(
+        self,
+        columns: list,
+        skip: int = 0,
+        limit: int = 100,
+        active_only: bool = True,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> list:
+        """Get a page of users as rows of the given columns (see get_users_with_pagination)"""
+        return await self.user_repo.get_rows(columns, skip, limit, after=after, active_only=active_only)
+    
     async def get_user_counts(self) -> dict:
         """Get user count statistics"""
-        total_users = await self.user_repo.count_total_users()
-        active_users = await self.user_repo.count_active_users()
+        counts = await self.user_repo.count_users_cached()
+        total_users = counts["total_users"]
+        active_users = counts["active_users"]
         
         return {
             "total_users": total_users,
@@ -0,0 +1,61 @@
+"""
+Adaptive engine benchmark
+
+Times ability estimation and maximum-information item selection on a
+synthetic 3PL item pool, for one session and for a whole cohort.
+
+Usage:
+    python -m benchmarks.bench_adaptive_selection --items 10000 --cohort 1000
+"""
+
+import argparse
+import timeit
+
+import numpy as np
+
+from app.services.adaptive_engine import AdaptiveEngine
+
+
+def time_us(func, number: int) -> float:
+    """Average wall time of func in microseconds"""
+    return timeit.timeit(func, number=number) / number * 1e6
+
+
+def main(items: int, answered: int, cohort: int) -> None:
+    rng = np.random.default_rng(42)
+    a = rng.lognormal(0.0, 0.3, items)
+    b = rng.normal(0.0, 1.0, items)
+    c = rng.uniform(0.0, 0.25, items)
+    engine = AdaptiveEngine()
+
+    answered_idx = rng.choice(items, answered, replace=False)
+    responses = rng.random(answered) < 0.6
+    available = np.ones(items, dtype=np.bool_)
+    available[answered_idx] = False
+
+    print({
+        "items": items,
+        "estimate_ability_us": round(time_us(
+            lambda: engine.estimate_ability(a[answered_idx], b[answered_idx], c[answered_idx], responses), 1000
+        ), 1),
+        "select_item_us": round(time_us(lambda: engine.select_item(0.3, a, b, c, available), 1000), 1),
+    })
+
+    thetas = rng.normal(0.0, 1.0, cohort)
+    cohort_available = np.ones((cohort, items), dtype=np.bool_)
+    elapsed_us = time_us(lambda: engine.select_items(thetas, a, b, c, cohort_available), 5)
+    print({
+        "cohort": cohort,
+        "select_items_ms": round(elapsed_us / 1000, 2),
+        "per_session_us": round(elapsed_us / cohort, 1),
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=10000, help="Item pool size")
+    parser.add_argument("--answered", type=int, default=40, help="Responses used for ability estimation")
+    parser.add_argument("--cohort", type=int, default=1000, help="Sessions selected for at once")
+    args = parser.parse_args()
+
+    main(args.items, args.answered, args.cohort)
@@ -0,0 +1,132 @@
+"""
+Answer submission benchmark
+
+Records the same set of answers two ways against the configured database
+(DATABASE_URL): one ORM insert and commit per answer, as the per-answer flow
+does, and one AnswerService.submit_batch call per test module.
+
+Usage:
+    DATABASE_URL=sqlite+aiosqlite:///bench.db python -m benchmarks.bench_answer_submission --answers 54
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import event
+
+from app.core.database import AsyncSessionLocal, engine, init_db, close_db
+from app.models.answer import Answer
+from app.models.question import Question, QuestionType, DifficultyLevel, Subject
+from app.models.test_session import TestSession, SessionType
+from app.models.user import User
+from app.schemas.answer import AnswerCreate
+from app.services.answer_service import AnswerService
+
+statement_count = 0
+
+
+def count_statement(*args) -> None:
+    global statement_count
+    statement_count += 1
+
+
+async def seed(answers: int) -> tuple[int, list[int]]:
+    """Create a user and a module's worth of questions"""
+    async with AsyncSessionLocal() as db:
+        user = User(email=f"bench-{time.time_ns()}@example.com", hashed_password="x")
+        questions = [
+            Question(
+                content={"question_text": f"Question {i}", "correct_answer": "B", "choices": ["A", "B", "C", "D"]},
+                question_type=QuestionType.MULTIPLE_CHOICE,
+                difficulty_level=DifficultyLevel.MEDIUM,
+                subject=Subject.MATH,
+                topic="algebra",
+            )
+            for i in range(answers)
+        ]
+        db.add(user)
+        db.add_all(questions)
+        await db.commit()
+        return user.id, [question.id for question in questions]
+
+
+async def create_session(user_id: int, total_questions: int) -> int:
+    async with AsyncSessionLocal() as db:
+        session = TestSession(user_id=user_id, session_type=SessionType.FULL_TEST, total_questions=total_questions)
+        db.add(session)
+        await db.commit()
+        return session.id
+
+
+def build_answers(question_ids: list[int]) -> list[AnswerCreate]:
+    return [
+        AnswerCreate(question_id=question_id, user_answer={"choice": "B" if i % 3 else "A"}, time_spent=45)
+        for i, question_id in enumerate(question_ids)
+    ]
+
+
+async def run_per_answer(user_id: int, session_id: int, answers: list[AnswerCreate]) -> None:
+    """Record answers one at a time with a commit each"""
+    async with AsyncSessionLocal() as db:
+        session = await db.get(TestSession, session_id)
+        for answer in answers:
+            question = await db.get(Question, answer.question_id)
+            is_correct = question.is_correct_answer(answer.user_answer["choice"])
+            db.add(Answer(
+                user_id=user_id,
+                test_session_id=session_id,
+                question_id=answer.question_id,
+                user_answer=answer.user_answer,
+                is_correct=is_correct,
+                time_spent=answer.time_spent,
+            ))
+            session.mark_question_answered(is_correct)
+            await db.commit()
+
+
+async def run_batch(user_id: int, session_id: int, answers: list[AnswerCreate]) -> None:
+    """Record answers with a single batch submission"""
+    async with AsyncSessionLocal() as db:
+        await AnswerService(db).submit_batch(user_id, session_id, answers)
+
+
+async def measure(name: str, runner, user_id: int, question_ids: list[int], rounds: int) -> dict:
+    global statement_count
+    answers = build_answers(question_ids)
+    sessions = [await create_session(user_id, len(answers)) for _ in range(rounds)]
+
+    statement_count = 0
+    started = time.perf_counter()
+    for session_id in sessions:
+        await runner(user_id, session_id, answers)
+    elapsed = time.perf_counter() - started
+
+    total = len(answers) * rounds
+    return {
+        "mode": name,
+        "answers": total,
+        "elapsed_s": round(elapsed, 3),
+        "answers_per_s": round(total / elapsed, 1),
+        "statements_per_module": round(statement_count / rounds, 1),
+    }
+
+
+async def main(answers: int, rounds: int) -> None:
+    await init_db()
+    user_id, question_ids = await seed(answers)
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    print(await measure("per_answer_commit", run_per_answer, user_id, question_ids, rounds))
+    print(await measure("batch", run_batch, user_id, question_ids, rounds))
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=54, help="Answers per module")
+    parser.add_argument("--rounds", type=int, default=20, help="Modules submitted per mode")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.answers, args.rounds))
@@ -0,0 +1,108 @@
+"""
+Login storm benchmark
+
+Fires a burst of concurrent password verifications while polling a cheap,
+unrelated endpoint, and reports the latency of that endpoint. Runs once with
+inline (blocking) bcrypt and once with the async hashing pool.
+
+Usage:
+    python -m benchmarks.bench_login_storm --logins 50 --interval-ms 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.hashing import hashing_pool
+from app.core.security import get_password_hash, verify_password, verify_password_async
+
+PASSWORD = "benchmark-password"
+
+
+def create_benchmark_app(hashed_password: str) -> FastAPI:
+    """Create a minimal app with blocking and non-blocking login routes"""
+    app = FastAPI()
+
+    @app.post("/login/blocking")
+    async def login_blocking():
+        return {"ok": verify_password(PASSWORD, hashed_password)}
+
+    @app.post("/login/pooled")
+    async def login_pooled():
+        return {"ok": await verify_password_async(PASSWORD, hashed_password)}
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    return app
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Get the given percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_storm(client: httpx.AsyncClient, login_path: str, logins: int, interval_ms: float) -> dict:
+    """Run a login storm and measure /ping latency while it is in progress"""
+    latencies: list[float] = []
+    storm_done = asyncio.Event()
+
+    async def probe() -> None:
+        # Latency is measured from the scheduled send time, so event loop
+        # stalls show up in the numbers instead of silently delaying probes
+        interval = interval_ms / 1000
+        scheduled = time.perf_counter()
+        while not storm_done.is_set():
+            scheduled += interval
+            await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+            await client.get("/ping")
+            latencies.append((time.perf_counter() - scheduled) * 1000)
+
+    async def storm() -> None:
+        try:
+            await asyncio.gather(*(client.post(login_path) for _ in range(logins)))
+        finally:
+            storm_done.set()
+
+    started = time.perf_counter()
+    await asyncio.gather(probe(), storm())
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mode": login_path.rsplit("/", 1)[-1],
+        "logins": logins,
+        "elapsed_s": round(elapsed, 3),
+        "probes": len(latencies),
+        "ping_p50_ms": round(statistics.median(latencies), 2),
+        "ping_p99_ms": round(percentile(latencies, 99), 2),
+        "ping_max_ms": round(max(latencies), 2),
+    }
+
+
+async def main(logins: int, interval_ms: float) -> None:
+    hashed_password = get_password_hash(PASSWORD)
+    app = create_benchmark_app(hashed_password)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for login_path in ("/login/blocking", "/login/pooled"):
+            print(await run_storm(client, login_path, logins, interval_ms))
+
+    print({"hashing_pool": hashing_pool.stats()})
+    hashing_pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=50, help="Concurrent login attempts")
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="Interval between requests to the unrelated endpoint")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.logins, args.interval_ms))
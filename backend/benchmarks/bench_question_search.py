@@ -0,0 +1,111 @@
+"""
+Question search benchmark
+
+Seeds a synthetic question bank into the configured database (DATABASE_URL)
+and times QuestionSearchService.search for rare, common and multi-word
+queries, with and without filters and deeper pages. On PostgreSQL this is
+the tsvector/GIN path (run ``alembic upgrade head`` first so the
+search_vector column exists); elsewhere it is the in-process index, whose
+build time is reported too.
+
+Usage:
+    DATABASE_URL=sqlite+aiosqlite:///bench.db python -m benchmarks.bench_question_search --questions 200000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.core.database import AsyncSessionLocal, engine, init_db, close_db
+from app.models.question import DifficultyLevel, QuestionType, Subject
+from app.repositories.question_repository import QuestionRepository
+from app.services.question_search import QuestionSearchIndex, QuestionSearchService
+
+EXTERNAL_PREFIX = "bench-search-"
+
+# Zipf-like vocabulary: low ranks are common words, high ranks are rare
+VOCABULARY = [f"word{i}" for i in range(20000)]
+SUBJECT_WORDS = ["equation", "slope", "function", "passage", "author", "tone", "evidence", "comma", "verb", "ratio"]
+
+QUERIES = {
+    "rare_word": {"text": "word300"},
+    "common_word": {"text": "equation"},
+    "two_words": {"text": "slope ratio"},
+    "filtered": {"text": "equation", "subject": Subject.MATH, "difficulty_level": DifficultyLevel.HARD},
+    "deep_page": {"text": "equation", "skip": 980},
+}
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    picked = [VOCABULARY[min(int(rng.paretovariate(1.1)) - 1, len(VOCABULARY) - 1)] for _ in range(words)]
+    picked += rng.sample(SUBJECT_WORDS, 2)
+    rng.shuffle(picked)
+    return " ".join(picked)
+
+
+async def seed(questions: int) -> None:
+    """Upsert the synthetic question bank (idempotent across runs)"""
+    rng = random.Random(42)
+    async with AsyncSessionLocal() as db:
+        repo = QuestionRepository(db)
+        for start in range(0, questions, 1000):
+            await repo.upsert_by_external_id([
+                {
+                    "external_id": f"{EXTERNAL_PREFIX}{i}",
+                    "created_by": None,
+                    "content": {
+                        "question_text": sentence(rng, 25),
+                        "explanation": sentence(rng, 15),
+                        "correct_answer": "B",
+                        "choices": ["A", "B", "C", "D"],
+                    },
+                    "question_type": QuestionType.MULTIPLE_CHOICE,
+                    "difficulty_level": rng.choice(list(DifficultyLevel)),
+                    "subject": rng.choice(list(Subject)),
+                    "topic": "bench",
+                    "tags": None,
+                    "estimated_time": 60,
+                    "irt_discrimination": None,
+                    "irt_difficulty": None,
+                    "irt_guessing": None,
+                    "is_active": True,
+                }
+                for i in range(start, min(start + 1000, questions))
+            ])
+        await db.commit()
+
+
+async def main(questions: int, repeat: int) -> None:
+    await init_db()
+    await seed(questions)
+
+    index = QuestionSearchIndex()
+    results = {"dialect": engine.dialect.name, "questions": questions}
+    async with AsyncSessionLocal() as db:
+        service = QuestionSearchService(db, index=index)
+        if engine.dialect.name != "postgresql":
+            started = time.perf_counter()
+            await index.refresh(db)
+            results["index_build_s"] = round(time.perf_counter() - started, 2)
+            results["index_terms"] = len(index.postings)
+
+        for name, query in QUERIES.items():
+            hits = await service.search(**query)  # Warm up
+            started = time.perf_counter()
+            for _ in range(repeat):
+                await service.search(**query)
+            results[f"{name}_ms"] = round((time.perf_counter() - started) / repeat * 1000, 2)
+            results[f"{name}_hits"] = len(hits)
+
+    print(results)
+    await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=200000, help="Synthetic questions to seed")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.questions, args.repeat))
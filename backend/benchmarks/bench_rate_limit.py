@@ -0,0 +1,96 @@
+"""
+Rate limiter overhead benchmark
+
+Calls RateLimitMiddleware in front of an ASGI app that does nothing and
+reports the added time per request in microseconds, for anonymous (client
+IP) and authenticated (bearer token) callers, for a request that is
+rejected, and for an unlimited path. Uses the memory backend, plus Redis
+when --redis-url is given.
+
+Usage:
+    python -m benchmarks.bench_rate_limit --requests 50000
+    python -m benchmarks.bench_rate_limit --redis-url redis://localhost:6379/0
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.core.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimitMiddleware,
+    RateLimiter,
+    RedisRateLimitBackend,
+)
+from app.core.security import create_access_token
+
+# High enough that nothing is limited in the allowed scenarios
+UNLIMITED = 10 ** 9
+
+
+async def noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+def make_scope(path: str, token: str = None, client: str = "10.0.0.1") -> dict:
+    headers = [(b"host", b"bench"), (b"user-agent", b"bench"), (b"accept", b"*/*")]
+    if token:
+        headers.append((b"authorization", f"Bearer {token}".encode()))
+    return {"type": "http", "method": "GET", "path": path, "headers": headers, "client": (client, 1234)}
+
+
+async def per_request_us(app, scope: dict, requests: int) -> float:
+    """Average time of one call to app in microseconds"""
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(scope, receive, send)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+async def measure(backend, requests: int) -> dict:
+    api_path = f"{settings.API_V1_STR}/users/me"
+    token = create_access_token({"sub": "1"})
+    allowing = RateLimitMiddleware(noop_app, RateLimiter(backend, per_minute=UNLIMITED, rules={}))
+    rejecting = RateLimitMiddleware(noop_app, RateLimiter(backend, per_minute=1, rules={}))
+
+    # Use up the single token of the rejecting bucket
+    await rejecting(make_scope(api_path, client="10.0.0.2"), receive, send)
+
+    baseline = await per_request_us(noop_app, make_scope(api_path), requests)
+    results = {
+        "anonymous": await per_request_us(allowing, make_scope(api_path), requests),
+        "authenticated": await per_request_us(allowing, make_scope(api_path, token), requests),
+        "rejected": await per_request_us(rejecting, make_scope(api_path, client="10.0.0.2"), requests),
+        "unlimited_path": await per_request_us(allowing, make_scope("/health"), requests),
+    }
+    return {
+        "baseline_us": round(baseline, 2),
+        **{f"{name}_overhead_us": round(us - baseline, 2) for name, us in results.items()},
+    }
+
+
+async def main(requests: int, redis_url: str = None) -> None:
+    print({"backend": "memory", "requests": requests, **await measure(MemoryRateLimitBackend(), requests)})
+    if redis_url:
+        backend = RedisRateLimitBackend(redis_url, prefix="tutorlms:bench:ratelimit")
+        print({"backend": "redis", "requests": requests, **await measure(backend, requests)})
+        await backend.client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50000, help="Requests per scenario")
+    parser.add_argument("--redis-url", default=None, help="Also measure the Redis backend")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.redis_url))
@@ -0,0 +1,112 @@
+"""
+Response serialization benchmark
+
+Measures per-row cost of turning query results into a JSON list response
+for each response schema, three ways:
+
+- default: ORM object -> model_validate -> jsonable_encoder -> json.dumps,
+  as FastAPI's default response path does
+- validated: row tuples through the cached RowSerializer validator and
+  pydantic's JSON serializer
+- rows: row tuples zipped with field names and encoded by orjson (the
+  FAST_JSON_RESPONSES path)
+
+Add a schema to SCHEMAS to cover new list endpoints.
+
+Usage:
+    python -m benchmarks.bench_serialization --rows 1000
+"""
+
+import argparse
+import json
+import timeit
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core import serialization
+from app.core.serialization import get_row_serializer
+from app.models.question import Question, QuestionType, DifficultyLevel, Subject
+from app.models.test_session import TestSession, SessionType, SessionStatus
+from app.models.user import User, UserRole
+from app.schemas.question import QuestionResponse
+from app.schemas.test_session import TestSessionResponse
+from app.schemas.user import UserResponse
+
+NOW = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+
+def user_values(i: int) -> dict:
+    return {
+        "id": i, "email": f"student{i}@example.com", "first_name": "Ada", "last_name": "Lovelace",
+        "role": UserRole.STUDENT, "is_active": True, "is_verified": True,
+        "created_at": NOW, "updated_at": NOW, "last_login": NOW,
+    }
+
+
+def question_values(i: int) -> dict:
+    return {
+        "id": i, "external_id": f"q-{i}", "question_type": QuestionType.MULTIPLE_CHOICE,
+        "difficulty_level": DifficultyLevel.MEDIUM, "subject": Subject.MATH, "topic": "linear equations",
+        "content": {
+            "question_text": "If 3x + 5 = 20, what is x?",
+            "choices": [{"label": label, "text": str(n)} for label, n in zip("ABCD", range(3, 7))],
+            "correct_answer": "C",
+            "explanation": "Subtract 5 and divide by 3.",
+        },
+        "tags": ["algebra", "linear"], "estimated_time": 75,
+        "irt_discrimination": 1.1, "irt_difficulty": 0.2, "irt_guessing": 0.2,
+        "is_active": True, "created_by": 1, "created_at": NOW, "updated_at": NOW,
+    }
+
+
+def session_values(i: int) -> dict:
+    return {
+        "id": i, "user_id": i % 500, "session_type": SessionType.FULL_TEST, "status": SessionStatus.COMPLETED,
+        "configuration": {"sections": ["reading", "math"]}, "started_at": NOW, "completed_at": NOW,
+        "time_limit": 134, "time_spent": 7200, "total_questions": 98, "answered_questions": 98,
+        "correct_answers": 71, "total_score": 1340, "section_scores": {"reading": 660, "math": 680},
+        "current_question_index": 98,
+    }
+
+
+# Schema name -> (response schema, model, sample values)
+SCHEMAS = {
+    "UserResponse": (UserResponse, User, user_values),
+    "QuestionResponse": (QuestionResponse, Question, question_values),
+    "TestSessionResponse": (TestSessionResponse, TestSession, session_values),
+}
+
+
+def per_row_us(func, rows: int, number: int) -> float:
+    """Average wall time of func per row in microseconds"""
+    return timeit.timeit(func, number=number) / number / rows * 1e6
+
+
+def main(rows: int, number: int) -> None:
+    print({"json_backend": "orjson" if serialization.orjson else "json"})
+    for name, (schema, model, values) in SCHEMAS.items():
+        serializer = get_row_serializer(schema)
+        samples = [values(i) for i in range(rows)]
+        objects = [model(**sample) for sample in samples]
+        tuples = [tuple(sample[field] for field in serializer.fields) for sample in samples]
+
+        def default():
+            return json.dumps(jsonable_encoder([schema.model_validate(obj) for obj in objects])).encode()
+
+        print({
+            "schema": name,
+            "rows": rows,
+            "default_us": round(per_row_us(default, rows, number), 2),
+            "validated_us": round(per_row_us(lambda: serializer.dumps(tuples, validate=True), rows, number), 2),
+            "rows_us": round(per_row_us(lambda: serializer.dumps(tuples), rows, number), 2),
+        })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per response")
+    parser.add_argument("--number", type=int, default=20, help="Responses serialized per measurement")
+    args = parser.parse_args()
+
+    main(args.rows, args.number)
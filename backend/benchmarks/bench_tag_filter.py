@@ -0,0 +1,143 @@
+"""
+Tag filter benchmark
+
+Times selecting questions by tag containment ("hard algebra questions tagged
+linear-equations") with QuestionRepository.get_by_tags on a synthetic
+question bank in the configured database (DATABASE_URL).
+
+On PostgreSQL the same tags are also copied into two scratch tables, one with
+a json column (before: tags are parsed on every scan and can't be indexed)
+and one with a jsonb column and a GIN index (after), and the bare
+containment query is timed on both.
+
+Usage:
+    DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_tag_filter --questions 100000
+    DATABASE_URL=sqlite+aiosqlite:///bench.db python -m benchmarks.bench_tag_filter
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal, engine, init_db, close_db
+from app.models.question import DifficultyLevel, QuestionType, Subject
+from app.repositories.question_repository import QuestionRepository
+
+TOPICS = ["algebra", "geometry", "statistics", "functions", "grammar", "vocabulary", "inference"]
+TAGS = [f"skill-{i}" for i in range(200)]
+TARGET_TAG = "linear-equations"
+EXTERNAL_PREFIX = "bench-tags-"
+
+
+async def seed(questions: int) -> None:
+    """Upsert the synthetic question bank (idempotent across runs)"""
+    rng = random.Random(42)
+    rows = []
+    for i in range(questions):
+        tags = rng.sample(TAGS, rng.randint(1, 4))
+        if rng.random() < 0.02:
+            tags.append(TARGET_TAG)
+        rows.append({
+            "external_id": f"{EXTERNAL_PREFIX}{i}",
+            "created_by": None,
+            "content": {"question_text": f"Question {i}", "correct_answer": "B", "choices": ["A", "B", "C", "D"]},
+            "question_type": QuestionType.MULTIPLE_CHOICE,
+            "difficulty_level": rng.choice(list(DifficultyLevel)),
+            "subject": Subject.MATH,
+            "topic": rng.choice(TOPICS),
+            "tags": tags,
+            "estimated_time": 60,
+            "irt_discrimination": None,
+            "irt_difficulty": None,
+            "irt_guessing": None,
+            "is_active": True,
+        })
+
+    async with AsyncSessionLocal() as db:
+        repo = QuestionRepository(db)
+        for start in range(0, len(rows), 1000):
+            await repo.upsert_by_external_id(rows[start:start + 1000])
+        await db.commit()
+
+
+async def per_query_ms(run, repeat: int) -> tuple[float, int]:
+    """Average time of one awaited run() in milliseconds, and its row count"""
+    rows = await run()  # Warm up caches and the statement cache
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await run()
+    return (time.perf_counter() - started) / repeat * 1000, len(rows)
+
+
+async def measure_repository(repeat: int) -> dict:
+    async with AsyncSessionLocal() as db:
+        repo = QuestionRepository(db)
+        tagged_ms, tagged = await per_query_ms(lambda: repo.get_by_tags([TARGET_TAG], limit=10 ** 6), repeat)
+        narrowed_ms, narrowed = await per_query_ms(
+            lambda: repo.get_by_tags(
+                [TARGET_TAG], difficulty_level=DifficultyLevel.HARD, topic="algebra", limit=10 ** 6
+            ),
+            repeat
+        )
+    return {
+        "get_by_tags_ms": round(tagged_ms, 2),
+        "get_by_tags_rows": tagged,
+        "hard_algebra_ms": round(narrowed_ms, 2),
+        "hard_algebra_rows": narrowed,
+    }
+
+
+async def measure_json_vs_jsonb(repeat: int) -> dict:
+    """Time the bare containment query on json and on GIN-indexed jsonb copies of the tags"""
+    target = json.dumps([TARGET_TAG])
+    async with engine.connect() as conn:
+        for name, column_type in (("bench_tags_json", "json"), ("bench_tags_jsonb", "jsonb")):
+            await conn.execute(text(f"CREATE TEMPORARY TABLE {name} (id integer PRIMARY KEY, tags {column_type})"))
+            await conn.execute(text(
+                f"INSERT INTO {name} SELECT id, tags::{column_type} FROM questions WHERE external_id LIKE :prefix"
+            ), {"prefix": f"{EXTERNAL_PREFIX}%"})
+        await conn.execute(text("CREATE INDEX ON bench_tags_jsonb USING gin (tags)"))
+        await conn.execute(text("ANALYZE bench_tags_json"))
+        await conn.execute(text("ANALYZE bench_tags_jsonb"))
+
+        async def select(query: str):
+            return (await conn.execute(text(query), {"tags": target})).all()
+
+        before_ms, rows = await per_query_ms(
+            lambda: select("SELECT id FROM bench_tags_json WHERE tags::jsonb @> CAST(:tags AS jsonb)"), repeat
+        )
+        after_ms, _ = await per_query_ms(
+            lambda: select("SELECT id FROM bench_tags_jsonb WHERE tags @> CAST(:tags AS jsonb)"), repeat
+        )
+        await conn.rollback()
+
+    return {
+        "json_scan_ms": round(before_ms, 2),
+        "jsonb_gin_ms": round(after_ms, 2),
+        "speedup": round(before_ms / after_ms, 1) if after_ms else None,
+        "rows": rows,
+    }
+
+
+async def main(questions: int, repeat: int) -> None:
+    await init_db()
+    await seed(questions)
+
+    print({"dialect": engine.dialect.name, "questions": questions, **await measure_repository(repeat)})
+    if engine.dialect.name == "postgresql":
+        print(await measure_json_vs_jsonb(repeat))
+
+    await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=50000, help="Synthetic questions to seed")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    args = parser.parse_args()
+
+    asyncio.run(main(args.questions, args.repeat))
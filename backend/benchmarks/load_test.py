@@ -0,0 +1,337 @@
+"""
+In-process API load test
+
+Seeds the configured database (DATABASE_URL) with users, questions, test
+sessions and answers, then drives app.main:app in-process through httpx with
+a fixed number of concurrent clients per scenario:
+
+- login_storm: POST /auth/login with random users' credentials
+- profile_polling: GET /users/me with random users' tokens
+- admin_listing: GET /users/ walking pages by cursor as an admin
+- answer_submission: POST /test-sessions/{id}/answers/batch for random users'
+  active sessions
+
+Throughput and p50/p95/p99 latency per scenario are written to a JSON file
+tagged with the current commit, so runs can be compared across commits.
+The application lifespan runs, so background tasks behave as in production.
+Strict ORM loading is on unless ORM_STRICT_LOADING says otherwise, so
+implicit relationship loads fail and suspected N+1 queries are logged.
+
+Seeding refuses to touch a database that already has users unless --reset
+is given, which drops and recreates all tables.
+
+Usage:
+    DATABASE_URL=sqlite+aiosqlite:///load.db python -m benchmarks.load_test --reset
+    python -m benchmarks.load_test --reset --concurrency 50 --duration 30 --scenarios profile_polling,admin_listing
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import func, insert, select
+
+# Must be set before the settings are loaded; tables come from create_all, not migrations
+os.environ.setdefault("ORM_STRICT_LOADING", "true")
+os.environ.setdefault("DB_SCHEMA_CHECK", "false")
+# Measure the application, not the per-user rate limit
+os.environ.setdefault("RATE_LIMIT_BACKEND", "none")
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, Base, engine
+from app.core.security import create_access_token, get_password_hash
+from app.main import app
+from app.models.answer import Answer
+from app.models.question import Question, QuestionType, DifficultyLevel, Subject
+from app.models.test_session import TestSession, SessionType, SessionStatus
+from app.models.user import User, UserRole
+from benchmarks.bench_login_storm import percentile
+
+PASSWORD = "load-test-password"
+ADMIN_EMAIL = "load-admin@example.com"
+
+# Rows per executemany INSERT while seeding
+SEED_CHUNK_SIZE = 5000
+
+SCENARIOS = ("login_storm", "profile_polling", "admin_listing", "answer_submission")
+
+
+async def insert_rows(model, rows: list[dict]) -> None:
+    async with AsyncSessionLocal() as db:
+        for start in range(0, len(rows), SEED_CHUNK_SIZE):
+            await db.execute(insert(model), rows[start:start + SEED_CHUNK_SIZE])
+        await db.commit()
+
+
+async def seed(users: int, questions: int, sessions_per_user: int, answers_per_session: int, reset: bool) -> dict:
+    """Create the tables and seed them; returns what the scenarios need"""
+    async with engine.begin() as conn:
+        if reset:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSessionLocal() as db:
+        if await db.scalar(select(func.count(User.id))):
+            raise SystemExit("Database already has users; pass --reset to drop and recreate all tables")
+
+    rng = random.Random(42)
+    hashed_password = get_password_hash(PASSWORD)
+
+    await insert_rows(User, [
+        {"email": ADMIN_EMAIL, "hashed_password": hashed_password, "role": UserRole.ADMIN, "is_verified": True}
+    ] + [
+        {
+            "email": f"student{i}@example.com",
+            "hashed_password": hashed_password,
+            "first_name": "Student",
+            "last_name": str(i),
+            "role": UserRole.STUDENT,
+            "is_verified": True,
+        }
+        for i in range(users)
+    ])
+
+    subjects = list(Subject)
+    difficulties = list(DifficultyLevel)
+    await insert_rows(Question, [
+        {
+            "external_id": f"load-{i}",
+            "content": {
+                "question_text": f"Question {i}",
+                "choices": [{"label": label, "text": label.lower()} for label in "ABCD"],
+                "correct_answer": "ABCD"[i % 4],
+            },
+            "question_type": QuestionType.MULTIPLE_CHOICE,
+            "difficulty_level": difficulties[i % len(difficulties)],
+            "subject": subjects[i % len(subjects)],
+            "topic": f"topic-{i % 40}",
+            "tags": [f"skill-{i % 25}"],
+            "estimated_time": 60,
+            "is_active": True,
+        }
+        for i in range(questions)
+    ])
+
+    async with AsyncSessionLocal() as db:
+        emails = dict((await db.execute(select(User.id, User.email).where(User.role == UserRole.STUDENT))).all())
+        question_ids = (await db.scalars(select(Question.id).order_by(Question.id))).all()
+
+    # The last session of each user stays active for answer submission
+    session_rows = []
+    for user_id in emails:
+        for n in range(sessions_per_user):
+            active = n == sessions_per_user - 1
+            session_rows.append({
+                "user_id": user_id,
+                "session_type": SessionType.PRACTICE,
+                "status": SessionStatus.ACTIVE if active else SessionStatus.COMPLETED,
+                "total_questions": answers_per_session,
+                "answered_questions": 0 if active else answers_per_session,
+                "total_score": None if active else rng.randint(400, 1600),
+            })
+    await insert_rows(TestSession, session_rows)
+
+    async with AsyncSessionLocal() as db:
+        sessions = (await db.execute(select(TestSession.id, TestSession.user_id, TestSession.status))).all()
+
+    answer_rows = []
+    active_sessions = {}
+    for session_id, user_id, status in sessions:
+        if status == SessionStatus.ACTIVE:
+            active_sessions[user_id] = session_id
+            continue
+        for question_id in rng.sample(question_ids, min(answers_per_session, len(question_ids))):
+            is_correct = rng.random() < 0.6
+            answer_rows.append({
+                "user_id": user_id,
+                "test_session_id": session_id,
+                "question_id": question_id,
+                "user_answer": {"choice": "A"},
+                "is_correct": is_correct,
+                "time_spent": rng.randint(20, 120),
+                "points_earned": int(is_correct),
+            })
+    await insert_rows(Answer, answer_rows)
+
+    return {
+        "emails": emails,
+        "question_ids": list(question_ids),
+        "active_sessions": active_sessions,
+        "volumes": {
+            "users": len(emails),
+            "questions": len(question_ids),
+            "sessions": len(sessions),
+            "answers": len(answer_rows),
+        },
+    }
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    """Summarize request latencies (ms) for one scenario"""
+    if not latencies:
+        return {"requests": 0, "errors": errors}
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2),
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, make_request, concurrency: int, duration: float) -> dict:
+    """Run closed-loop clients issuing make_request() until the duration elapses"""
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id: int) -> None:
+        nonlocal errors
+        rng = random.Random(worker_id)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            response = await make_request(client, rng)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+def build_scenarios(data: dict, batch_size: int) -> dict:
+    """Create a request function per scenario"""
+    emails = data["emails"]
+    user_ids = list(emails)
+    question_ids = data["question_ids"]
+    active_sessions = data["active_sessions"]
+    tokens = {user_id: f"Bearer {create_access_token({'sub': str(user_id)})}" for user_id in user_ids}
+    admin_token = f"Bearer {create_access_token({'sub': str(data['admin_id'])})}"
+    cursors = {}
+
+    async def login_storm(client, rng):
+        user_id = rng.choice(user_ids)
+        return await client.post(
+            "/api/v1/auth/login",
+            json={"email": emails[user_id], "password": PASSWORD}
+        )
+
+    async def profile_polling(client, rng):
+        return await client.get("/api/v1/users/me", headers={"Authorization": tokens[rng.choice(user_ids)]})
+
+    async def admin_listing(client, rng):
+        # Each worker walks the user list page by page, wrapping at the end
+        params = {"limit": 100}
+        if cursors.get(id(rng)):
+            params["cursor"] = cursors[id(rng)]
+        response = await client.get("/api/v1/users/", params=params, headers={"Authorization": admin_token})
+        cursors[id(rng)] = response.headers.get("x-next-cursor")
+        return response
+
+    async def answer_submission(client, rng):
+        user_id = rng.choice(user_ids)
+        answers = [
+            {"question_id": question_id, "user_answer": {"choice": rng.choice("ABCD")}, "time_spent": rng.randint(20, 120)}
+            for question_id in rng.sample(question_ids, batch_size)
+        ]
+        return await client.post(
+            f"/api/v1/test-sessions/{active_sessions[user_id]}/answers/batch",
+            json={"answers": answers},
+            headers={"Authorization": tokens[user_id]}
+        )
+
+    return {
+        "login_storm": login_storm,
+        "profile_polling": profile_polling,
+        "admin_listing": admin_listing,
+        "answer_submission": answer_submission,
+    }
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def main(args: argparse.Namespace) -> None:
+    # Keep logging and SQL echo (DEBUG) out of the measurements; warnings such as suspected N+1 queries still show
+    logging.getLogger().setLevel(logging.WARNING)
+    engine.sync_engine.echo = False
+    scenarios = args.scenarios.split(",")
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+
+    started = time.perf_counter()
+    data = await seed(args.users, args.questions, args.sessions_per_user, args.answers_per_session, args.reset)
+    async with AsyncSessionLocal() as db:
+        data["admin_id"] = await db.scalar(select(User.id).where(User.email == ADMIN_EMAIL))
+    seed_seconds = time.perf_counter() - started
+    print({"seeded": data["volumes"], "seed_s": round(seed_seconds, 2)})
+
+    requests = build_scenarios(data, args.batch_size)
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=None) as client:
+            for name in scenarios:
+                results[name] = await run_scenario(client, requests[name], args.concurrency, args.duration)
+                print({"scenario": name, **results[name]})
+
+    report = {
+        "commit": current_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "settings": {
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "batch_size": args.batch_size,
+            "cache_backend": settings.CACHE_BACKEND,
+            "session_state_backend": settings.SESSION_STATE_BACKEND,
+            "fast_json_responses": settings.FAST_JSON_RESPONSES,
+            "orm_strict_loading": settings.ORM_STRICT_LOADING,
+            "rate_limit_backend": settings.RATE_LIMIT_BACKEND,
+        },
+        "seed": {**data["volumes"], "seed_s": round(seed_seconds, 2)},
+        "scenarios": results,
+    }
+    with open(args.output, "w") as fp:
+        json.dump(report, fp, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000, help="Students to seed")
+    parser.add_argument("--questions", type=int, default=2000, help="Questions to seed")
+    parser.add_argument("--sessions-per-user", type=int, default=3, help="Test sessions per student (last one active)")
+    parser.add_argument("--answers-per-session", type=int, default=20, help="Answers per completed session")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenarios to run")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients per scenario")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per scenario")
+    parser.add_argument("--batch-size", type=int, default=5, help="Answers per submission")
+    parser.add_argument("--output", default="load_test_results.json", help="JSON report path")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables before seeding")
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
@@ -0,0 +1 @@
+"""Operational commands for the TutorLMS backend"""
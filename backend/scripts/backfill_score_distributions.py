@@ -0,0 +1,29 @@
+"""
+Rebuild the score distributions used for percentile ranking from completed test sessions
+
+Usage:
+    python -m scripts.backfill_score_distributions
+"""
+
+import asyncio
+import logging
+import time
+
+from app.core.database import AsyncSessionLocal, close_db
+from app.repositories.score_distribution_repository import ScoreDistributionRepository
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        buckets = await ScoreDistributionRepository(db).rebuild_all()
+    await close_db()
+    logger.info(f"Rebuilt {buckets} score distribution buckets in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,29 @@
+"""
+Rebuild the per-user statistics rollup from answers and test sessions
+
+Usage:
+    python -m scripts.backfill_user_stats
+"""
+
+import asyncio
+import logging
+import time
+
+from app.core.database import AsyncSessionLocal, close_db
+from app.repositories.user_stats_repository import UserStatsRepository
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        users = await UserStatsRepository(db).rebuild_all()
+    await close_db()
+    logger.info(f"Rebuilt statistics for {users} users in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
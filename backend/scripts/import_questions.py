@@ -0,0 +1,67 @@
+"""
+Import a question bank file (JSON array, JSONL or CSV) into the questions table
+
+Questions are upserted on external_id, so re-running an import updates the
+questions in place. Rejected records are written as JSON lines next to the
+input file unless --rejects is given.
+
+Usage:
+    python -m scripts.import_questions questions.jsonl
+    python -m scripts.import_questions bank.csv --workers 4 --rejects rejected.jsonl
+"""
+
+import argparse
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, close_db
+from app.services.question_import import IMPORT_WORKERS, ImportFormat, QuestionImporter, detect_format
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def log_progress(report: dict) -> None:
+    rate = report["processed"] / report["elapsed_seconds"] if report["elapsed_seconds"] else 0.0
+    logger.info(
+        f"{report['processed']} records: {report['upserted']} upserted, "
+        f"{report['rejected']} rejected ({rate:,.0f} records/s)"
+    )
+
+
+async def main(path: str, import_format: ImportFormat, rejects_path: str, batch_size: int, workers: int) -> None:
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as fp, open(rejects_path, "w", encoding="utf-8") as rejects:
+            async with AsyncSessionLocal() as db:
+                importer = QuestionImporter(
+                    db, batch_size=batch_size, executor=executor, workers=workers,
+                    rejects_file=rejects, progress=log_progress
+                )
+                report = await importer.run(fp, import_format)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    await close_db()
+
+    logger.info(
+        f"Imported {report['upserted']} questions in {report['elapsed_seconds']:.2f}s; "
+        f"{report['rejected']} rejected (see {rejects_path})"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="Question bank file")
+    parser.add_argument("--format", choices=[f.value for f in ImportFormat], help="File format (default: from extension)")
+    parser.add_argument("--rejects", help="Rejected records output (default: <path>.rejected.jsonl)")
+    parser.add_argument("--batch-size", type=int, default=settings.QUESTION_IMPORT_BATCH_SIZE, help="Records per upsert")
+    parser.add_argument("--workers", type=int, default=IMPORT_WORKERS, help="Validation processes")
+    args = parser.parse_args()
+
+    import_format = ImportFormat(args.format) if args.format else detect_format(args.path)
+    rejects_path = args.rejects or f"{args.path}.rejected.jsonl"
+    asyncio.run(main(args.path, import_format, rejects_path, args.batch_size, args.workers))